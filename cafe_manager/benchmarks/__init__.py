@@ -0,0 +1,15 @@
+"""
+Бенчмарки горячих путей Cafe Manager.
+
+Запуск из каталога проекта (рядом с `manage.py`):
+
+    python -m benchmarks.bench_order_update [--json]
+    python -m benchmarks.bench_hot_paths [--orders 5000] [--output FILE]
+    python -m benchmarks.bench_status [--repeat 200]
+    python -m benchmarks.bench_serialization [--page 500] [--items 5]
+    python -m benchmarks.bench_async_reads [--concurrency 1,16,64]
+    python -m benchmarks.bench_export [--orders 2000,20000]
+    python -m benchmarks.compare base.json new.json
+
+Каждый бенчмарк создает временную тестовую базу, поэтому рабочие данные не затрагиваются.
+"""
@@ -0,0 +1,98 @@
+"""
+Бенчмарк асинхронных чтений: запросов в секунду при высокой конкурентности.
+
+Сравнивает синхронные `OrderViewSet`/`RevenueAPIView`/аналитику с асинхронными
+представлениями `/api/async/...`. Запросы выполняются через ASGI-обработчик Django
+(`AsyncClient`) конкурентно, не больше `--concurrency` одновременно: синхронные
+представления при этом уходят в пул потоков, асинхронные работают в event loop.
+
+    python -m benchmarks.bench_async_reads [--orders 5000] [--requests 400] [--concurrency 1,16,64] [--json]
+
+Это оценка внутри одного процесса без сети; для итоговых цифр проект запускают под
+`uvicorn cafe_manager.asgi:application --workers N` и нагружают внешним генератором (например, `hey`).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.harness import report, setup_django, test_database
+
+SCENARIOS: list[tuple[str, str, str]] = [
+    ("order_list", "/api/orders/", "/api/async/orders/"),
+    ("order_list_filtered", "/api/orders/?status=paid&table=1-10", "/api/async/orders/?status=paid&table=1-10"),
+    ("order_detail", "/api/orders/{id}/", "/api/async/orders/{id}/"),
+    ("revenue", "/api/revenue/", "/api/async/revenue/"),
+    ("analytics_revenue", "/api/analytics/revenue/?bucket=day", "/api/async/analytics/revenue/?bucket=day"),
+]
+
+
+async def run_load(client, url: str, order_ids: list[int], total: int, concurrency: int) -> dict:
+    """Выполняет `total` запросов, не больше `concurrency` одновременно; возвращает rps и задержки."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url.format(id=order_ids[index % len(order_ids)]))
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise AssertionError(f"{url}: {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }
+
+
+async def run_all(args: argparse.Namespace, levels: list[int]) -> list[dict]:
+    from asgiref.sync import sync_to_async
+    from django.core.cache import cache
+    from django.test import AsyncClient
+
+    from orders.models import Order
+
+    client = AsyncClient()
+    order_ids = await sync_to_async(lambda: list(Order.objects.values_list('id', flat=True)[:1000]))()
+    results: list[dict] = []
+    for name, sync_url, async_url in SCENARIOS:
+        if not name.startswith(args.only):
+            continue
+        for concurrency in levels:
+            for variant, url in (("sync", sync_url), ("async", async_url)):
+                await cache.aclear()
+                stats = await run_load(client, url, order_ids, args.requests, concurrency)
+                results.append({"benchmark": name, "variant": variant, "concurrency": concurrency, **stats})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="Вывести результаты в JSON")
+    parser.add_argument("--output", help="Сохранить результаты (с хэшем коммита) в JSON-файл для `benchmarks.compare`")
+    parser.add_argument("--orders", type=int, default=5000, help="Сколько заказов сгенерировать перед замером")
+    parser.add_argument("--requests", type=int, default=400, help="Запросов на сценарий и уровень конкурентности")
+    parser.add_argument("--concurrency", default="1,16,64", help="Уровни конкурентности через запятую")
+    parser.add_argument("--only", default="", help="Запускать только сценарии с этим префиксом")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    setup_django()
+    from django.core.management import call_command
+
+    with test_database():
+        call_command('seed_orders', orders=args.orders, seed=42, verbosity=0)
+        results = asyncio.run(run_all(args, levels))
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
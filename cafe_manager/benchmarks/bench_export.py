@@ -0,0 +1,69 @@
+"""
+Бенчмарк потоковой выгрузки заказов (`GET /api/orders/export/`).
+
+Для каждого формата и объема данных замеряются строк в секунду и пиковая память
+Python (`tracemalloc`) при чтении всего ответа. Пиковая память не должна расти
+вместе с числом заказов — это и проверяет запуск на нескольких объемах.
+
+    python -m benchmarks.bench_export [--orders 2000,20000] [--repeat 3] [--json] [--output FILE]
+"""
+import argparse
+import tracemalloc
+from datetime import timedelta
+
+from benchmarks.harness import add_common_arguments, measure, report, setup_django, test_database
+
+
+def consume(client, url: str) -> int:
+    """Читает потоковый ответ целиком; возвращает число байт."""
+    response = client.get(url)
+    if response.status_code != 200:
+        raise AssertionError(f"{url}: {response.status_code}")
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_arguments(parser, repeat=3)
+    parser.add_argument("--orders", default="2000,20000", help="Объемы данных (заказов) через запятую")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.test import Client
+    from django.utils import timezone
+
+    from orders.analytics import MAX_RANGE_DAYS
+    from orders.models import Order, OrderItem
+
+    client = Client()
+    today = timezone.localdate()
+    url = f"/api/orders/export/?format={{}}&from={today - timedelta(days=MAX_RANGE_DAYS - 1)}&to={today}"
+    results: list[dict] = []
+    with test_database():
+        seeded = 0
+        for total in sorted(int(value) for value in args.orders.split(",")):
+            # Объемы накапливаются: досеиваем только недостающие заказы (seed_orders создает их за последние --days дней)
+            call_command('seed_orders', orders=total - seeded, seed=total, days=700, verbosity=0)
+            seeded = total
+            rows = OrderItem.objects.count() + Order.objects.filter(items__isnull=True).count()
+            for export_format in ("csv", "ndjson"):
+                stats = measure(lambda: consume(client, url.format(export_format)), repeat=args.repeat)
+                # Память — отдельным запуском: tracemalloc сильно замедляет выполнение
+                tracemalloc.start()
+                consume(client, url.format(export_format))
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.append({
+                    "benchmark": "export",
+                    "variant": export_format,
+                    "orders": total,
+                    **stats,
+                    "rows_per_sec": round(rows / stats["mean_ms"] * 1000),
+                    "peak_mib": round(peak / 2 ** 20, 2),
+                })
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Бенчмарк горячих путей: веб-страницы заказов и все действия `OrderViewSet`.
+
+Перед замером база заполняется командой `seed_orders` (воспроизводимо, `--seed`).
+Каждый сценарий выполняется через тестовый HTTP-клиент (полный цикл Django:
+маршрутизация, представление, шаблон/сериализатор), для каждого считаются
+пропускная способность, p50/p95 и число SQL-запросов.
+
+Чтения по умолчанию замеряются "холодными" (кэш очищается перед каждым
+запуском, вне замера); `--warm` оставляет кэш включенным.
+
+    python -m benchmarks.bench_hot_paths [--orders 5000] [--warm] [--only api_] [--json] [--output FILE]
+"""
+import argparse
+import random
+from collections.abc import Callable
+
+from benchmarks.harness import add_common_arguments, measure, report, setup_django, test_database
+
+ITEMS: list[dict] = [
+    {"name": "Капучино", "price": "4.50", "quantity": 2},
+    {"name": "Сырники", "price": "6.50", "quantity": 1},
+    {"name": "Борщ", "price": "7.50", "quantity": 1},
+]
+
+
+def expect(response, status_code: int):
+    """Проверяет код ответа: бенчмарк ошибочного пути бесполезен."""
+    if response.status_code != status_code:
+        raise AssertionError(f"{response.request['PATH_INFO']}: {response.status_code}, ожидался {status_code}")
+    return response
+
+
+def order_form(items: list[dict], table_number: int = 7, status: str = 'pending', ids: list[int] | None = None) -> dict:
+    """Данные формы заказа с формсетом блюд (как их отправляет браузер)."""
+    data = {
+        'table_number': table_number,
+        'status': status,
+        'items-TOTAL_FORMS': str(len(items)),
+        'items-INITIAL_FORMS': str(len(ids or [])),
+        'items-MIN_NUM_FORMS': '0',
+        'items-MAX_NUM_FORMS': '1000',
+    }
+    for index, item in enumerate(items):
+        for key, value in item.items():
+            data[f'items-{index}-{key}'] = value
+        if ids and index < len(ids):
+            data[f'items-{index}-id'] = ids[index]
+    return data
+
+
+def build_scenarios(rng: random.Random, warm: bool) -> list[tuple[str, Callable, Callable | None]]:
+    """Сценарии `(название, функция, подготовка)`; подготовка в замер не входит."""
+    from django.core.cache import cache
+    from django.test import Client
+    from rest_framework.test import APIClient
+
+    from orders.models import Order, OrderItem
+
+    web, api = Client(), APIClient()
+    order_ids: list[int] = list(Order.objects.values_list('id', flat=True))
+
+    def read_setup(*args) -> Callable[[], tuple]:
+        def setup() -> tuple:
+            if not warm:
+                cache.clear()
+            return tuple(arg() if callable(arg) else arg for arg in args)
+        return setup
+
+    def fresh_order() -> tuple[Order, list[int]]:
+        order = Order.objects.create(table_number=rng.randint(1, 30))
+        items = OrderItem.objects.bulk_create(OrderItem(order=order, **item) for item in ITEMS)
+        return order, [item.id for item in items]
+
+    def random_id() -> int:
+        return rng.choice(order_ids)
+
+    return [
+        ("web_list", lambda: expect(web.get('/orders/'), 200), read_setup()),
+        ("web_list_paid", lambda: expect(web.get('/orders/?status=paid'), 200), read_setup()),
+        ("web_list_table", lambda: expect(web.get('/orders/?q=5'), 200), read_setup()),
+        ("web_create", lambda: expect(web.post('/orders/create/', order_form(ITEMS)), 302), None),
+        ("web_update",
+         lambda order, ids: expect(web.post(f'/orders/{order.id}/update/', order_form(
+             [{**item, "quantity": 3} for item in ITEMS], status='ready', ids=ids)), 302),
+         fresh_order),
+        ("web_revenue", lambda: expect(web.get('/orders/revenue/'), 200), read_setup()),
+        ("api_list", lambda: expect(api.get('/api/orders/'), 200), read_setup()),
+        ("api_list_filtered", lambda: expect(api.get('/api/orders/?status=paid&table=1-10'), 200), read_setup()),
+        ("api_retrieve", lambda pk: expect(api.get(f'/api/orders/{pk}/'), 200), read_setup(random_id)),
+        ("api_create",
+         lambda: expect(api.post('/api/orders/', {"table_number": 7, "items": ITEMS}, format='json'), 201), None),
+        ("api_bulk_create",
+         lambda: expect(api.post('/api/orders/bulk/', [{"table_number": t, "items": ITEMS} for t in range(1, 21)],
+                                 format='json'), 201),
+         None),
+        ("api_update",
+         lambda order, ids: expect(api.put(f'/api/orders/{order.id}/', {
+             "table_number": 9, "status": "ready",
+             "items": [{"id": item_id, "quantity": 3} for item_id in ids[:2]] + [ITEMS[0]],
+         }, format='json'), 200),
+         fresh_order),
+        ("api_partial_update",
+         lambda order, ids: expect(api.patch(f'/api/orders/{order.id}/', {
+             "status": "paid", "items": [{"id": ids[0], "quantity": 4}],
+         }, format='json'), 200),
+         fresh_order),
+        ("api_destroy", lambda order, ids: expect(api.delete(f'/api/orders/{order.id}/'), 204), fresh_order),
+        ("api_revenue", lambda: expect(api.get('/api/revenue/'), 200), read_setup()),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_arguments(parser)
+    parser.add_argument("--orders", type=int, default=5000, help="Сколько заказов сгенерировать перед замером")
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора данных")
+    parser.add_argument("--warm", action="store_true", help="Не очищать кэш перед чтениями")
+    parser.add_argument("--only", default="", help="Запускать только сценарии с этим префиксом")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    results: list[dict] = []
+    with test_database():
+        call_command('seed_orders', orders=args.orders, seed=args.seed, verbosity=0)
+        rng = random.Random(args.seed)
+        for name, fn, setup in build_scenarios(rng, args.warm):
+            if not name.startswith(args.only):
+                continue
+            stats = measure(fn, repeat=args.repeat, setup=setup)
+            results.append({"benchmark": name, "orders": args.orders, "cache": "warm" if args.warm else "cold", **stats})
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
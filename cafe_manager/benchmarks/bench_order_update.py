@@ -0,0 +1,77 @@
+"""
+Бенчмарк обновления заказа: число round trips к БД на один `PATCH` блюд.
+
+Сравнивает прежний построчный алгоритм (`save()`/`create()` на каждое блюдо,
+затем `calculate_total()`) с текущим `OrderSerializer.update`, который применяет
+разницу через `bulk_update` + `bulk_create` + `DELETE`.
+
+    python -m benchmarks.bench_order_update [--json] [--output FILE] [--repeat 20]
+"""
+import argparse
+
+from benchmarks.harness import add_common_arguments, measure, report, setup_django, test_database
+
+ITEM_COUNTS: list[int] = [5, 20, 50]
+
+
+def legacy_update(order, items_data: list[dict]) -> None:
+    """Прежняя реализация `OrderSerializer.update` для блюд (по одному запросу на блюдо)."""
+    from orders.models import OrderItem
+
+    existing_items = {item.id: item for item in order.items.all()}
+    for item_data in items_data:
+        item_id = item_data.get("id")
+        if item_id:
+            item = existing_items[item_id]
+            for key, val in item_data.items():
+                if key != "id":
+                    setattr(item, key, val)
+            item.save()
+        else:
+            OrderItem.objects.create(order=order, **item_data)
+    order.total_price = sum(item.price * item.quantity for item in order.items.all())
+    order.save()
+
+
+def serializer_update(order, items_data: list[dict]) -> None:
+    """Текущая реализация: `OrderSerializer(partial=True).save()`."""
+    from orders.serializers import OrderSerializer
+
+    serializer = OrderSerializer(order, data={"items": items_data}, partial=True)
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def make_setup(items_count: int):
+    """Готовит свежий заказ с `items_count` блюдами и PATCH, меняющий все блюда и добавляющий одно."""
+    from orders.models import Order, OrderItem
+
+    def setup() -> tuple:
+        order = Order.objects.create(table_number=1)
+        items = OrderItem.objects.bulk_create(
+            OrderItem(order=order, name=f"Блюдо {i}", price=10, quantity=1) for i in range(items_count)
+        )
+        items_data = [{"id": item.id, "quantity": 2} for item in items]
+        items_data.append({"name": "Кофе", "price": 5, "quantity": 1})
+        return order, items_data
+
+    return setup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    setup_django()
+    results: list[dict] = []
+    with test_database():
+        for items_count in ITEM_COUNTS:
+            for name, fn in (("per-item (legacy)", legacy_update), ("set-based diff", serializer_update)):
+                stats = measure(fn, repeat=args.repeat, setup=make_setup(items_count))
+                results.append({"benchmark": "order_update", "variant": name, "items": items_count, **stats})
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
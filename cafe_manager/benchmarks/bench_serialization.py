@@ -0,0 +1,70 @@
+"""
+Бенчмарк чтения страницы заказов: сборка данных и JSON-рендеринг.
+
+Сравнивает на одной странице (`--page` заказов по `--items` блюд):
+
+- `OrderSerializer` + `JSONRenderer` — прежний путь `GET /api/orders/` (модели, `prefetch_related`, поля DRF);
+- `representation` + `JSONRenderer` — строки `.values()` без сериализатора (`orders.representation`);
+- `representation` + `FastJSONRenderer` — то же с кодированием через `orjson` (если установлен).
+
+Время включает запросы к БД; `orders_per_sec` — заказов страницы в секунду.
+
+    python -m benchmarks.bench_serialization [--page 500] [--items 5] [--json] [--output FILE]
+"""
+import argparse
+
+from benchmarks.harness import add_common_arguments, measure, report, setup_django, test_database
+
+
+def seed(page: int, items: int) -> None:
+    """Заполняет базу `page` заказами по `items` блюд."""
+    from orders.models import Order, OrderItem
+
+    orders = Order.objects.bulk_create(Order(table_number=i % 30 + 1, total_price=10 * items) for i in range(page))
+    OrderItem.objects.bulk_create(
+        (OrderItem(order=order, name=f"Блюдо {i}", price=10, quantity=1) for order in orders for i in range(items)),
+        batch_size=5000,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_arguments(parser)
+    parser.add_argument("--page", type=int, default=500, help="Заказов на странице")
+    parser.add_argument("--items", type=int, default=5, help="Блюд в заказе")
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from orders import renderers, representation
+    from orders.models import Order
+    from orders.serializers import OrderSerializer
+
+    queryset = Order.objects.order_by('-id')[:args.page]
+
+    def serializer_drf() -> None:
+        JSONRenderer().render(OrderSerializer(queryset.prefetch_related('items'), many=True).data)
+
+    def values_drf() -> None:
+        JSONRenderer().render(representation.with_items(representation.order_rows(queryset)))
+
+    def values_orjson() -> None:
+        renderers.FastJSONRenderer().render(representation.with_items(representation.order_rows(queryset)))
+
+    variants = [("OrderSerializer + JSONRenderer", serializer_drf), ("values() + JSONRenderer", values_drf)]
+    if renderers.orjson is not None:
+        variants.append(("values() + orjson", values_orjson))
+
+    results: list[dict] = []
+    with test_database():
+        seed(args.page, args.items)
+        for name, fn in variants:
+            stats = measure(fn, repeat=args.repeat)
+            stats["orders_per_sec"] = round(args.page * stats["ops_per_sec"])
+            results.append({"benchmark": "order_page", "variant": name, "orders": args.page, "items": args.items, **stats})
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
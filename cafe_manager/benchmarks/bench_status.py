@@ -0,0 +1,60 @@
+"""
+Бенчмарк смены статуса заказа `pending` → `ready` через API.
+
+Сравнивает `PATCH /api/orders/{id}/` (загрузка заказа, вложенный `OrderSerializer`,
+`save()`, сериализация всех блюд в ответе) с `POST /api/orders/{id}/status/`
+(один условный `UPDATE` и минимальный ответ). Замеряется полный цикл запроса
+через тестовый клиент DRF, включая middleware.
+
+    python -m benchmarks.bench_status [--json] [--output FILE] [--repeat 200]
+"""
+import argparse
+
+from benchmarks.harness import add_common_arguments, measure, report, setup_django, test_database
+
+ITEM_COUNTS: list[int] = [3, 20]
+
+
+def make_setup(items_count: int):
+    """Готовит свежий заказ `pending` с `items_count` блюдами."""
+    from orders.models import Order, OrderItem
+
+    def setup() -> tuple:
+        order = Order.objects.create(table_number=1)
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, name=f"Блюдо {i}", price=10, quantity=1) for i in range(items_count)
+        )
+        return (order.id,)
+
+    return setup
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_common_arguments(parser, repeat=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+
+    def patch(order_id: int) -> None:
+        response = client.patch(f"/api/orders/{order_id}/", {"status": "ready"}, format="json")
+        assert response.status_code == 200, response.content
+
+    def transition(order_id: int) -> None:
+        response = client.post(f"/api/orders/{order_id}/status/", {"status": "ready"}, format="json")
+        assert response.status_code == 200, response.content
+
+    results: list[dict] = []
+    with test_database():
+        for items_count in ITEM_COUNTS:
+            for name, fn in (("PATCH /orders/{id}/", patch), ("POST /orders/{id}/status/", transition)):
+                stats = measure(fn, repeat=args.repeat, setup=make_setup(items_count))
+                results.append({"benchmark": "order_status", "variant": name, "items": items_count, **stats})
+    report(results, as_json=args.json, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
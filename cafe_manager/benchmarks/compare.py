@@ -0,0 +1,69 @@
+"""
+Сравнение результатов бенчмарков двух коммитов.
+
+    python -m benchmarks.bench_hot_paths --output base.json     # на базовом коммите
+    python -m benchmarks.bench_hot_paths --output new.json      # на новом коммите
+    python -m benchmarks.compare base.json new.json [--threshold 10]
+
+Сценарии сопоставляются по всем нечисловым полям (`benchmark`, `variant`, ...).
+Регрессия — рост p50 больше чем на `--threshold` процентов или рост числа
+SQL-запросов; при регрессиях команда завершается с кодом 1 (для CI).
+"""
+import argparse
+import json
+import sys
+
+METRICS: tuple[str, ...] = ("runs", "requests", "queries", "p50_ms", "p95_ms", "mean_ms", "ops_per_sec", "rps")
+
+
+def load(path: str) -> tuple[str | None, dict[tuple, dict]]:
+    """Читает файл `--output` (или список из `--json`) и индексирует сценарии по ключу."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    commit, results = (data.get("commit"), data["results"]) if isinstance(data, dict) else (None, data)
+    return commit, {
+        tuple((key, value) for key, value in row.items() if key not in METRICS): row for row in results
+    }
+
+
+def compare(base: dict[tuple, dict], new: dict[tuple, dict], threshold: float) -> tuple[list[dict], int]:
+    """Строки сравнения и число регрессий."""
+    rows: list[dict] = []
+    regressions = 0
+    for key, current in new.items():
+        previous = base.get(key)
+        if previous is None:
+            continue
+        change = (current["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100 if previous["p50_ms"] else 0.0
+        regressed = change > threshold or current.get("queries", 0) > previous.get("queries", 0)
+        regressions += regressed
+        rows.append({
+            "scenario": " ".join(str(value) for _, value in key),
+            "p50_ms": f"{previous['p50_ms']} → {current['p50_ms']}",
+            "change": f"{change:+.1f}%",
+            "queries": f"{previous.get('queries', '-')} → {current.get('queries', '-')}",
+            "status": "REGRESSION" if regressed else "ok",
+        })
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="Результаты базового коммита")
+    parser.add_argument("new", help="Результаты нового коммита")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Допустимый рост p50, %%")
+    args = parser.parse_args()
+
+    from benchmarks.harness import report
+
+    base_commit, base = load(args.base)
+    new_commit, new = load(args.new)
+    rows, regressions = compare(base, new, args.threshold)
+    print(f"{base_commit or args.base} → {new_commit or args.new}")
+    if rows:
+        report(rows)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import django
+
+
+def setup_django() -> None:
+    """Инициализирует Django с настройками проекта (или из `DJANGO_SETTINGS_MODULE`)."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cafe_manager.settings')
+    django.setup()
+
+
+@contextmanager
+def test_database() -> Iterator[None]:
+    """Создает временную тестовую базу на время бенчмарка и удаляет ее после."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn: Callable[..., Any], repeat: int = 20, setup: Callable[[], tuple] | None = None) -> dict:
+    """
+    🔹 Запускает `fn` `repeat` раз и возвращает статистику.
+
+    - `setup` (необязательно) готовит аргументы для каждого запуска и в замер не входит
+    - `queries` — медианное число SQL-запросов (round trips) за один запуск
+    - `p50_ms` / `p95_ms` / `mean_ms` — время одного запуска в миллисекундах
+    - `ops_per_sec` — пропускная способность (запусков в секунду, по среднему времени)
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings: list[float] = []
+    queries: list[int] = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            fn(*args)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(ctx.captured_queries))
+
+    timings.sort()
+    return {
+        "runs": repeat,
+        "queries": int(statistics.median(queries)),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "ops_per_sec": round(1000 / statistics.fmean(timings), 1),
+    }
+
+
+def add_common_arguments(parser: argparse.ArgumentParser, repeat: int = 20) -> None:
+    """Добавляет общие аргументы бенчмарков: `--json`, `--output`, `--repeat`."""
+    parser.add_argument("--json", action="store_true", help="Вывести результаты в JSON")
+    parser.add_argument("--output", help="Сохранить результаты (с хэшем коммита) в JSON-файл для `benchmarks.compare`")
+    parser.add_argument("--repeat", type=int, default=repeat, help="Число запусков на сценарий")
+
+
+def git_commit() -> str | None:
+    """Хэш текущего коммита (если бенчмарк запущен из git-репозитория)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: list[dict], as_json: bool = False, output: str | None = None) -> None:
+    """
+    Печатает результаты таблицей или (с `--json`) одной строкой JSON для сравнения между коммитами.
+
+    С `output` результаты дополнительно сохраняются в файл вместе с хэшем коммита.
+    """
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump({"commit": git_commit(), "results": results}, file, ensure_ascii=False, indent=2)
+    if as_json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+    columns = list(dict.fromkeys(col for row in results for col in row))
+    widths = {col: max(len(col), *(len(str(row.get(col, ""))) for row in results)) for col in columns}
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    for row in results:
+        print("  ".join(str(row.get(col, "")).ljust(widths[col]) for col in columns))
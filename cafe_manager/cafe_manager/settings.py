@@ -46,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'orders.middleware.RequestMetricsMiddleware',  # первым: метрики SQL и времени всего запроса
+    'orders.middleware.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,6 +76,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'cafe_manager.wsgi.application'
+ASGI_APPLICATION = 'cafe_manager.asgi.application'
 
 
 # Database
@@ -87,9 +90,122 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Постоянные соединения с проверкой пригодности перед переиспользованием.
+        # Под ASGI соединения не переиспользуются между запросами — там лучше DB_CONN_MAX_AGE=0.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Реплика для отчетных чтений (списки, выручка, аналитика, выгрузки) — orders.db_router.
+# Для тестов маршрутизации достаточно второй локальной базы: DB_REPLICA_HOST=localhost DB_REPLICA_NAME=...
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        # Отдельная тестовая база: тесты роутера пишут разные данные в обе базы
+        'TEST': {'NAME': f"test_{os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME'])}_replica"},
+    }
+
+DATABASE_ROUTERS = ['orders.db_router.PrimaryReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+# Сколько секунд после записи клиент читает из основной базы (задержка репликации).
+REPLICA_STICKY_SECONDS = 10
+# На сколько секунд реплика исключается из маршрутизации после ошибки подключения.
+REPLICA_RETRY_SECONDS = 30
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Несколько процессов (gunicorn/uvicorn workers) должны делить один кэш, иначе инвалидация
+# по сигналам доходит только до процесса, который записал заказ: REDIS_URL=redis://localhost:6379/0.
+# Без REDIS_URL — локальный кэш процесса (runserver, тесты), см. orders.cache.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': 'cafe-manager',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'cafe-manager',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Время жизни закэшированных списков, заказов и выручки (сек.); инвалидация — по сигналам.
+ORDERS_CACHE_TIMEOUT = 300
+# То же для локального кэша процесса: инвалидация из других процессов до него не доходит.
+ORDERS_CACHE_LOCAL_TIMEOUT = 5
+
+# Как часто (сек.) процесс сверяет снимок меню с версией меню в БД (orders.menu).
+MENU_VERSION_CHECK_SECONDS = 5
+
+
+# Поток событий заказов (/api/events/): размер буфера для догоняющих клиентов,
+# предел очереди одного клиента и интервал heartbeat (сек.).
+ORDERS_EVENTS_BUFFER = 1000
+ORDERS_EVENTS_MAX_PENDING = 1000
+ORDERS_EVENTS_HEARTBEAT = 15
+
+# Через сколько дней после оплаты заказ переносится в архив (`manage.py archive_orders`)
+ORDERS_ARCHIVE_AFTER_DAYS = 30
+
+# Синхронизация планшетов (GET /api/orders/changes/):
+# сколько дней хранятся отметки об удалении заказов (более старый курсор → полная синхронизация)
+ORDERS_TOMBSTONE_DAYS = 30
+# Насколько курсор отступает назад от текущего времени, чтобы не пропустить изменения
+# транзакций, которые закоммитились позже (повторно присланные заказы клиент просто перезаписывает)
+ORDERS_CHANGES_OVERLAP_SECONDS = 5
+
+# Схема OpenAPI (/api/swagger.json, /api/swagger.yaml): собирается `manage.py build_api_schema`
+# и хранится в репозитории; отдается с ETag и кэшируется клиентами на API_SCHEMA_MAX_AGE секунд
+API_SCHEMA_FILE = BASE_DIR / 'orders' / 'openapi' / 'schema.json'
+API_SCHEMA_MAX_AGE = 24 * 60 * 60
+
+# Swagger UI и Redoc загружают собранную схему, а не строят ее на каждый запрос
+SWAGGER_SETTINGS = {'SPEC_URL': 'schema-json'}
+REDOC_SETTINGS = {'SPEC_URL': 'schema-json'}
+
+
+# Метрики запросов (orders.middleware.RequestMetricsMiddleware)
+# Порог медленного запроса (мс): такие запросы логируются с самыми тяжелыми SQL.
+REQUEST_SLOW_MS = int(os.getenv('REQUEST_SLOW_MS', 500))
+# Сколько раз должен повториться один SQL за запрос, чтобы считаться дублем (N+1).
+REQUEST_DUPLICATE_QUERY_THRESHOLD = 5
+REQUEST_SLOW_SQL_LIMIT = 10
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# Метрики запросов пишутся в `orders.requests` одной JSON-строкой на запрос.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '{asctime} {levelname} {name}: {message}', 'style': '{'},
+        'structured': {'format': '{message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+        'requests': {'class': 'logging.StreamHandler', 'formatter': 'structured'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'django': {'handlers': ['console'], 'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO'), 'propagate': False},
+        'orders': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'orders.requests': {'handlers': ['requests'], 'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'), 'propagate': False},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -125,6 +241,14 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Смены кафе: код смены и час ее начала (по TIME_ZONE), по возрастанию.
+# Смена длится до начала следующей; выручка агрегируется по дням и сменам.
+CAFE_SHIFTS = [
+    ('morning', 0),
+    ('evening', 15),
+]
+
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
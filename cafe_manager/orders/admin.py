@@ -1,5 +1,19 @@
-from django.contrib import admin
-from .models import Order, OrderItem
+from django.contrib import admin, messages
+from . import search, transitions
+from .models import MenuItem, Order, OrderItem
+from .pagination import EstimatedCountPaginator
+
+
+class OrderItemInline(admin.TabularInline):
+    """Блюда заказа на странице заказа (одним запросом вместе с блюдами меню)"""
+    model = OrderItem
+    fields = ("menu_item", "name", "price", "quantity")
+    readonly_fields = ("menu_item",)
+    extra = 0
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("menu_item")
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -8,12 +22,62 @@ class OrderAdmin(admin.ModelAdmin):
     list_filter = ("status",)
     search_fields = ("table_number",)
     ordering = ("-id",)
-    inlines = []
+    inlines = [OrderItemInline]
+    actions = ["mark_ready", "mark_paid"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Без второго `COUNT(*)` по всей таблице при поиске и фильтрах
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по номеру стола или диапазону (`5`, `5-10`) по индексу, без `icontains` по тексту."""
+        if not search_term:
+            return queryset, False
+        try:
+            return search.filter_by_table(queryset, search_term), False
+        except ValueError:
+            return queryset.none(), False
+
+    def change_status(self, request, queryset, status: str) -> None:
+        """Переводит выбранные заказы в `status` одним `UPDATE` (`transitions.change_status_many`)."""
+        changed = transitions.change_status_many(queryset, status)
+        previous = transitions.TRANSITIONS[status]
+        if changed:
+            self.message_user(request, f"Статус «{status}» установлен заказам: {len(changed)}.", messages.SUCCESS)
+        else:
+            self.message_user(request, f"Среди выбранных нет заказов в статусе «{previous}».", messages.WARNING)
+
+    @admin.action(description="Отметить готовыми (pending → ready)")
+    def mark_ready(self, request, queryset) -> None:
+        self.change_status(request, queryset, 'ready')
+
+    @admin.action(description="Отметить оплаченными (ready → paid)")
+    def mark_paid(self, request, queryset) -> None:
+        self.change_status(request, queryset, 'paid')
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     """Админка для блюд в заказе"""
     list_display = ("id", "order", "name", "price", "quantity")
-    search_fields = ("name",)
+    list_select_related = ("order",)
+    raw_id_fields = ("order",)  # Вместо `<select>` со всеми заказами
+    autocomplete_fields = ("menu_item",)
+    search_fields = ("name_search",)
     ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет блюда по началу названия в нормализованной колонке `name_search` (по индексу)."""
+        if not search_term:
+            return queryset, False
+        return queryset.filter(name_search__startswith=search.normalize_dish_name(search_term)), False
 
+
+
+@admin.register(MenuItem)
+class MenuItemAdmin(admin.ModelAdmin):
+    """Админка для меню (изменения сразу увеличивают версию снимка меню)"""
+    list_display = ("id", "name", "price", "is_active")
+    list_editable = ("price", "is_active")
+    list_filter = ("is_active",)
+    search_fields = ("name",)
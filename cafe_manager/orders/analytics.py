@@ -0,0 +1,213 @@
+"""
+Аналитика выручки и блюд.
+
+Все показатели считаются сгруппированными агрегатами на стороне БД
+(`GROUP BY` по усеченному времени оплаты, столу или названию блюда) —
+объекты `Order`/`OrderItem` в Python не загружаются, поэтому время ответа
+зависит от числа корзин, а не от числа заказов в диапазоне.
+
+Оплаченные заказы со временем переносятся в архив (`orders.archive`), поэтому
+каждый показатель считается по рабочим и архивным таблицам (`SOURCES`),
+а сгруппированные строки складываются по ключу.
+"""
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Count, DecimalField, F, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+# 🔹 Доступные размеры корзин времени
+BUCKETS: dict[str, type] = {
+    'hour': TruncHour,
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+DEFAULT_RANGE_DAYS: int = 7
+MAX_RANGE_DAYS: int = 731  # Не больше двух лет за запрос
+
+# 🔹 Таблицы заказов и блюд, по которым строятся отчеты: рабочие и архивные
+SOURCES: tuple[tuple[type, type], ...] = (
+    (Order, OrderItem),
+    (ArchivedOrder, ArchivedOrderItem),
+)
+
+MONEY: DecimalField = DecimalField(max_digits=14, decimal_places=2)
+
+
+def parse_range(params) -> tuple[datetime, datetime]:
+    """
+    🔹 Читает диапазон `from`/`to` (YYYY-MM-DD, включительно) из query-параметров.
+
+    Возвращает полуинтервал `[начало from, начало дня после to)` в текущей временной зоне.
+    По умолчанию — последние `DEFAULT_RANGE_DAYS` дней.
+    """
+    today = timezone.localdate()
+    try:
+        end_day: date = date.fromisoformat(params['to']) if params.get('to') else today
+        start_day: date = (
+            date.fromisoformat(params['from']) if params.get('from')
+            else end_day - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        )
+    except ValueError:
+        raise serializers.ValidationError({"from": "Ожидаются даты в формате YYYY-MM-DD."})
+    if start_day > end_day:
+        raise serializers.ValidationError({"from": "Начало диапазона позже конца."})
+    if (end_day - start_day).days >= MAX_RANGE_DAYS:
+        raise serializers.ValidationError({"from": f"Диапазон не может превышать {MAX_RANGE_DAYS} дней."})
+
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(start_day, time.min, tzinfo=tz)
+    end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+
+def paid_orders(start: datetime, end: datetime, model: type[Order | ArchivedOrder] = Order) -> QuerySet:
+    """Оплаченные заказы с временем оплаты в `[start, end)` (покрыто индексом по `paid_at`)."""
+    return model.objects.filter(status='paid', paid_at__gte=start, paid_at__lt=end)
+
+
+def paid_items(start: datetime, end: datetime, model: type[OrderItem | ArchivedOrderItem] = OrderItem) -> QuerySet:
+    """Блюда оплаченных заказов с временем оплаты в `[start, end)`."""
+    return model.objects.filter(order__status='paid', order__paid_at__gte=start, order__paid_at__lt=end)
+
+
+def parse_bucket(params) -> str:
+    """Читает размер корзины `bucket` (по умолчанию `hour`)."""
+    bucket: str = params.get('bucket', 'hour')
+    if bucket not in BUCKETS:
+        raise serializers.ValidationError({"bucket": f"Допустимые значения: {', '.join(BUCKETS)}."})
+    return bucket
+
+
+def parse_limit(params, max_limit: int, default: int = 10) -> int:
+    """Читает размер топа `limit` (от 1 до `max_limit`)."""
+    try:
+        limit = int(params.get('limit', default))
+    except ValueError:
+        raise serializers.ValidationError({"limit": "Ожидается целое число."})
+    if not 1 <= limit <= max_limit:
+        raise serializers.ValidationError({"limit": f"Допустимо от 1 до {max_limit}."})
+    return limit
+
+
+@dataclass(frozen=True)
+class Report:
+    """
+    Отчет: независимые сгруппированные запросы и функция, собирающая из их строк результат.
+
+    - `run()` — выполняет запросы по очереди (синхронные представления)
+    - `arun()` — выполняет запросы конкурентно через асинхронный ORM (`orders.async_views`)
+    """
+
+    querysets: list[QuerySet]
+    combine: Callable[[list[list[dict]]], list[dict]]
+
+    def run(self) -> list[dict]:
+        return self.combine([list(queryset) for queryset in self.querysets])
+
+    async def arun(self) -> list[dict]:
+        rows = await asyncio.gather(*(_alist(queryset) for queryset in self.querysets))
+        return self.combine(list(rows))
+
+
+async def _alist(queryset: QuerySet) -> list[dict]:
+    return [row async for row in queryset]
+
+
+def _merge(groups: Iterable[Iterable[dict]], key: str) -> dict:
+    """Складывает сгруппированные строки рабочих и архивных таблиц по ключу `key`."""
+    merged: dict = {}
+    for rows in groups:
+        for row in rows:
+            current = merged.setdefault(row[key], dict.fromkeys(row, 0) | {key: row[key]})
+            for field, value in row.items():
+                if field != key:
+                    current[field] += value
+    return merged
+
+
+def revenue_by_bucket_report(start: datetime, end: datetime, bucket: str) -> Report:
+    """
+    🔹 Выручка, число заказов и проданных блюд по корзинам времени.
+
+    По два сгруппированных запроса (заказы и блюда) к рабочим и архивным таблицам,
+    объединенные по ключу корзины.
+    """
+    trunc = BUCKETS[bucket]
+    orders = [
+        paid_orders(start, end, model)
+        .annotate(bucket=trunc('paid_at'))
+        .values('bucket')
+        .annotate(revenue=Sum('total_price'), orders_count=Count('id'))
+        .order_by()
+        for model, _ in SOURCES
+    ]
+    items = [
+        paid_items(start, end, model)
+        .annotate(bucket=trunc('order__paid_at'))
+        .values('bucket')
+        .annotate(items_count=Sum('quantity'))
+        .order_by()
+        for _, model in SOURCES
+    ]
+
+    def combine(rows: list[list[dict]]) -> list[dict]:
+        order_rows = _merge(rows[:len(orders)], 'bucket')
+        item_rows = _merge(rows[len(orders):], 'bucket')
+        return [
+            {**order_rows[key], 'items_count': item_rows.get(key, {}).get('items_count', 0)}
+            for key in sorted(order_rows)
+        ]
+
+    return Report(orders + items, combine)
+
+
+def revenue_by_table_report(start: datetime, end: datetime) -> Report:
+    """🔹 Выручка и число заказов по столам (по убыванию выручки)."""
+    querysets = [
+        paid_orders(start, end, model)
+        .values('table_number')
+        .annotate(revenue=Sum('total_price'), orders_count=Count('id'))
+        .order_by()
+        for model, _ in SOURCES
+    ]
+    return Report(querysets, lambda rows: sorted(
+        _merge(rows, 'table_number').values(), key=lambda row: (-row['revenue'], row['table_number'])
+    ))
+
+
+def top_dishes_report(start: datetime, end: datetime, limit: int) -> Report:
+    """🔹 Топ-N блюд по проданному количеству (с выручкой по каждому блюду)."""
+    querysets = [
+        paid_items(start, end, model)
+        .values('name')
+        .annotate(quantity_sold=Sum('quantity'), revenue=Sum(F('price') * F('quantity'), output_field=MONEY))
+        .order_by()
+        for _, model in SOURCES
+    ]
+    return Report(querysets, lambda rows: sorted(
+        _merge(rows, 'name').values(), key=lambda row: (-row['quantity_sold'], row['name'])
+    )[:limit])
+
+
+def revenue_by_bucket(start: datetime, end: datetime, bucket: str) -> list[dict]:
+    """Выполняет отчет `revenue_by_bucket_report`."""
+    return revenue_by_bucket_report(start, end, bucket).run()
+
+
+def revenue_by_table(start: datetime, end: datetime) -> list[dict]:
+    """Выполняет отчет `revenue_by_table_report`."""
+    return revenue_by_table_report(start, end).run()
+
+
+def top_dishes(start: datetime, end: datetime, limit: int) -> list[dict]:
+    """Выполняет отчет `top_dishes_report`."""
+    return top_dishes_report(start, end, limit).run()
@@ -1,56 +1,59 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api_views import OrderViewSet
+from . import async_views
+from .event_views import order_event_stream
+from .export_views import order_export
+from .schema import API_INFO
+from .schema_views import schema_json, schema_yaml
+from .api_views import (
+    CacheStatsAPIView,
+    DishAnalyticsAPIView,
+    MenuAPIView,
+    OrderViewSet,
+    RevenueAnalyticsAPIView,
+    RevenueAPIView,
+    TableAnalyticsAPIView,
+)
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework.renderers import JSONRenderer
-from drf_yasg.renderers import SwaggerJSONRenderer, SwaggerYAMLRenderer
-from rest_framework.views import APIView
 
-# Конфигурация Swagger
+# Конфигурация Swagger: страницы UI загружают собранную схему (`SPEC_URL` → `schema-json`)
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Cafe Manager API",
-        default_version='v1',
-        description="API для управления заказами в кафе",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="support@cafe.com"),
-        license=openapi.License(name="BSD License"),
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
 )
 
-# Классы для отображения схемы API в разных форматах
-class SchemaJsonView(APIView):
-    renderer_classes = [SwaggerJSONRenderer, JSONRenderer]
-
-    def get(self, request, *args, **kwargs):
-        return schema_view.without_ui(cache_timeout=0)(request, *args, **kwargs)
-
-class SchemaYamlView(APIView):
-    renderer_classes = [SwaggerYAMLRenderer]
-
-    def get(self, request, *args, **kwargs):
-        return schema_view.without_ui(cache_timeout=0)(request, *args, **kwargs)
-
 # Роутер для API
 router = DefaultRouter()
 router.register(r'orders', OrderViewSet)
 
 urlpatterns = [
+    path('orders/export/', order_export, name='order-export'),  # До роутера: иначе `export` примет за ID
     path('', include(router.urls)),
+    path('menu/', MenuAPIView.as_view(), name='api-menu'),
+    path('revenue/', RevenueAPIView.as_view(), name='api-revenue'),
+    path('analytics/revenue/', RevenueAnalyticsAPIView.as_view(), name='analytics-revenue'),
+    path('analytics/tables/', TableAnalyticsAPIView.as_view(), name='analytics-tables'),
+    path('analytics/dishes/', DishAnalyticsAPIView.as_view(), name='analytics-dishes'),
+    path('cache/stats/', CacheStatsAPIView.as_view(), name='cache-stats'),
+    path('events/', order_event_stream, name='order-events'),
+
+    # Асинхронные чтения (ASGI)
+    path('async/orders/', async_views.order_list, name='async-order-list'),
+    path('async/orders/<int:pk>/', async_views.order_detail, name='async-order-detail'),
+    path('async/revenue/', async_views.revenue, name='async-revenue'),
+    path('async/analytics/revenue/', async_views.revenue_analytics, name='async-analytics-revenue'),
+    path('async/analytics/tables/', async_views.table_analytics, name='async-analytics-tables'),
+    path('async/analytics/dishes/', async_views.dish_analytics, name='async-analytics-dishes'),
 
     # Swagger UI
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('swagger.yaml', schema_view.without_ui(cache_timeout=0), name='schema-yaml'),
-
 
     # Redoc UI
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 
-    # JSON/YAML схема API
-    path('swagger.json', SchemaJsonView.as_view(), name='schema-json'),
-    path('swagger.yaml', SchemaYamlView.as_view(), name='schema-yaml'),
+    # JSON/YAML схема API (собрана `manage.py build_api_schema`, см. `orders.schema`)
+    path('swagger.json', schema_json, name='schema-json'),
+    path('swagger.yaml', schema_yaml, name='schema-yaml'),
 ]
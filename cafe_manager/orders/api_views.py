@@ -1,24 +1,377 @@
+import hashlib
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable
 from typing import Any
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.http import Http404
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
-from .models import Order
-from .serializers import OrderSerializer
+from rest_framework.views import APIView
+from . import analytics, cache, changes, menu, representation, search, transitions
+from .db_router import ReplicaReadMixin, read_from_replica
+from .models import Order, RevenueRollup
+from .pagination import OrderCursorPagination
+from .renderers import FastJSONRenderer
+from .serializers import OrderSerializer, RevenueRollupSerializer
+
+# 🔹 Параметры фильтрации списка заказов (`GET /api/orders/`)
+ORDER_LIST_PARAMETERS: list[openapi.Parameter] = [
+    openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=[c[0] for c in Order.STATUS_CHOICES], description="Статус заказа"),
+    openapi.Parameter('table', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Номер стола (`5`) или диапазон (`5-10`)"),
+    openapi.Parameter('dish', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Начало названия блюда (без учета регистра)"),
+    openapi.Parameter('id_min', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Минимальный ID заказа (включительно)"),
+    openapi.Parameter('id_max', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Максимальный ID заказа (включительно)"),
+    openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Размер страницы (по умолчанию 50, максимум 500)"),
+]
+
+def filter_orders(queryset: QuerySet[Order], params) -> QuerySet[Order]:
+    """
+    🔹 Фильтры списка заказов API (`status`, `table`, `dish`, `id_min`, `id_max`).
+
+    Общие для `OrderViewSet` и асинхронного списка (`orders.async_views`);
+    некорректные значения → `ValidationError` (`400`).
+    """
+    status_filter: str | None = params.get('status')
+    if status_filter:
+        if status_filter not in dict(Order.STATUS_CHOICES):
+            raise serializers.ValidationError({"status": f"Неизвестный статус: {status_filter}."})
+        queryset = queryset.filter(status=status_filter)
+
+    table: str | None = params.get('table')
+    if table:
+        try:
+            queryset = search.filter_by_table(queryset, table)
+        except ValueError:
+            raise serializers.ValidationError({"table": "Ожидается номер стола или диапазон, например 5 или 5-10."})
+
+    dish: str | None = params.get('dish')
+    if dish:
+        queryset = search.filter_by_dish(queryset, dish)
+
+    id_min = _int_param(params, 'id_min')
+    if id_min is not None:
+        queryset = queryset.filter(id__gte=id_min)
+
+    id_max = _int_param(params, 'id_max')
+    if id_max is not None:
+        queryset = queryset.filter(id__lte=id_max)
+
+    return queryset
+
+
+def _int_param(params, name: str) -> int | None:
+    """Читает целочисленный query-параметр, отвечая `400` на некорректное значение."""
+    value: str | None = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise serializers.ValidationError({name: "Ожидается целое число."})
+
+
+MAX_ORDER_VERSION: int = 2_147_483_647  # Верхняя граница `Order.version` (integer в PostgreSQL)
+
+
+def order_etag(order_id: int, version: int) -> str:
+    """🔹 Сильный `ETag` заказа: меняется вместе с `Order.version` при любом изменении заказа или его блюд."""
+    return f'"{order_id}.{version}"'
+
+
+def _etag_listed(header: str | None, etag: str) -> bool:
+    """Есть ли `etag` в заголовке `If-None-Match` (слабое сравнение, как требует RFC 9110)."""
+    if not header:
+        return False
+    tags = parse_etags(header)
+    return '*' in tags or etag.removeprefix('W/') in (tag.removeprefix('W/') for tag in tags)
+
 
 class OrderViewSet(viewsets.ModelViewSet):
     """
     API для управления заказами:
     - ✅ Создание заказа (`POST /api/orders/`)
-    - 🔍 Получение списка заказов (`GET /api/orders/`)
+    - 📦 Массовое создание заказов (`POST /api/orders/bulk/`)
+    - 🔁 Изменения для синхронизации планшетов (`GET /api/orders/changes/?since=`)
+    - 🔍 Получение списка заказов (`GET /api/orders/?status=&table=&dish=&id_min=&id_max=&cursor=`)
     - 📝 Полное обновление (`PUT /api/orders/{id}/`)
     - 🔄 Частичное обновление (`PATCH /api/orders/{id}/`)
+    - 🚦 Смена статуса `pending` → `ready` → `paid` (`POST /api/orders/{id}/status/`)
     - ❌ Удаление заказа (`DELETE /api/orders/{id}/`)
+
+    Ответы заказа и страницы списка содержат `ETag`: с `If-None-Match` неизмененные данные
+    отвечают `304` без сериализации блюд, а `If-Match` в PUT/PATCH отклоняет устаревшую правку (`412`).
+    Список и карточка читаются без сериализатора (`orders.representation`) и кодируются `orjson`.
     """
 
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = OrderCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    bulk_create_limit: int = 1000  # Максимум заказов в одном запросе `POST /api/orders/bulk/`
+
+    def get_queryset(self) -> QuerySet[Order]:
+        """
+        🔹 Для списка применяет фильтры, покрытые индексами `(status, id)`, `(table_number, id)`
+        и `OrderItem.name_search`.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = self.filter_queryset_by_params(queryset)
+        return queryset
+
+    def filter_queryset_by_params(self, queryset: QuerySet[Order]) -> QuerySet[Order]:
+        """Применяет фильтры `status`, `table`, `dish`, `id_min`, `id_max` из query-параметров."""
+        return filter_orders(queryset, self.request.query_params)
+
+    @swagger_auto_schema(
+        operation_description="🔍 Список заказов с курсорной пагинацией и фильтрами.",
+        manual_parameters=ORDER_LIST_PARAMETERS,
+    )
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        🔍 Возвращает страницу заказов (новые сверху):
+        - 📌 `GET /api/orders/?status=paid&table=5&id_min=100&id_max=200`
+        - ➡️ Следующая страница — по ссылке `next` (курсор), без OFFSET
+        - 📖 Читается с реплики БД, если она настроена (`orders.db_router`)
+        - ⚡ `ETag` страницы — по ID и версиям ее заказов; при совпадении с `If-None-Match` → `304`
+          (блюда не загружаются и не сериализуются)
+        - ⚡ Страница — строками `.values()`, блюда — одним запросом, без `OrderSerializer`
+        """
+        with read_from_replica():
+            page = self.paginate_queryset(representation.order_rows(self.filter_queryset(self.get_queryset())))
+            etag = self.page_etag(page)
+            if _etag_listed(request.headers.get('If-None-Match'), etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            response = self.get_paginated_response(representation.with_items(page))
+        response['ETag'] = etag
+        return response
+
+    def page_etag(self, page: Iterable[dict]) -> str:
+        """Сильный `ETag` страницы списка: версии заказов страницы и ссылки на соседние страницы."""
+        digest = hashlib.sha1()
+        for row in page:
+            digest.update(f'{row["id"]}.{row["version"]};'.encode())
+        digest.update(f'{self.paginator.get_next_link()}|{self.paginator.get_previous_link()}'.encode())
+        return f'"{digest.hexdigest()}"'
+
+    @swagger_auto_schema(
+        operation_description="📦 Массовое создание заказов (например, после восстановления связи у кассы). "
+                              "Невалидные заказы возвращаются в `errors`, остальные создаются одной транзакцией.",
+        request_body=OrderSerializer(many=True),
+        responses={201: "Все заказы созданы", 207: "Часть заказов отклонена", 400: "Ни один заказ не создан"},
+    )
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        📦 Создает много заказов за один запрос:
+        - ✅ Каждый заказ валидируется отдельно, ошибки возвращаются по индексу
+        - ✅ Валидные заказы и их блюда пишутся через `bulk_create` в одной транзакции
+        - 📌 `POST /api/orders/bulk/`
+        """
+        if not isinstance(request.data, list):
+            raise serializers.ValidationError({"non_field_errors": "Ожидается список заказов."})
+        if len(request.data) > self.bulk_create_limit:
+            raise serializers.ValidationError(
+                {"non_field_errors": f"Не более {self.bulk_create_limit} заказов за один запрос."}
+            )
+
+        valid: list[tuple[int, dict]] = []
+        errors: list[dict] = []
+        for index, payload in enumerate(request.data):
+            serializer = self.get_serializer(data=payload)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
+
+        orders = OrderSerializer.bulk_create([data for _, data in valid])
+        created = [
+            {"index": index, "id": order.id, "total_price": order.total_price}
+            for (index, _), order in zip(valid, orders)
+        ]
+
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"created": created, "errors": errors}, status=response_status)
+
+    @swagger_auto_schema(
+        operation_description="🔁 Заказы, созданные, измененные или удаленные после курсора `since` "
+                              "(без курсора — все текущие заказы). Следующий запрос — с `cursor` из ответа; "
+                              "при `has_more` запросить сразу еще раз. `410` — курсор устарел, нужна полная синхронизация.",
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Курсор из предыдущего ответа"),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Размер порции (по умолчанию 50, максимум 500)"),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        🔁 Порция изменений для синхронизации планшетов:
+        - ✅ `orders` — созданные и измененные заказы с блюдами, `deleted` — ID удаленных
+        - ✅ Объем ответа зависит от числа изменений после курсора, а не от истории
+        - 📌 `GET /api/orders/changes/?since=<cursor>`
+        """
+        try:
+            page = changes.changes_since(request.query_params.get('since'), self.paginator.get_page_size(request))
+        except changes.CursorExpired:
+            return Response(
+                {"detail": "Курсор устарел, выполните полную синхронизацию (запрос без since)."},
+                status=status.HTTP_410_GONE,
+            )
+        return Response({
+            "orders": self.get_serializer(page.orders, many=True).data,
+            "deleted": page.deleted,
+            "cursor": page.cursor,
+            "has_more": page.has_more,
+        })
+
+    @swagger_auto_schema(
+        operation_description="🚦 Смена статуса заказа: `pending` → `ready` → `paid`. Один условный `UPDATE` "
+                              "без загрузки блюд; в ответе только статус и новая версия.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={"status": openapi.Schema(type=openapi.TYPE_STRING, enum=[*transitions.TRANSITIONS])},
+            required=["status"],
+            example={"status": "ready"},
+        ),
+        responses={200: "Статус изменен", 400: "Недопустимый статус", 404: "Заказ не найден",
+                   409: "Заказ в другом статусе (в ответе `current_status`)"},
+    )
+    @action(detail=True, methods=['post'], url_path='status', url_name='status')
+    def change_status(self, request: Request, pk: str | None = None) -> Response:
+        """
+        🚦 Переводит заказ в следующий статус:
+        - ✅ `UPDATE ... WHERE id = ? AND status = ?` — параллельный переход не пройдет дважды
+        - ✅ Обновляет `paid_at`, сводку выручки, `version`; событие `order.status_changed`
+        - 📌 `POST /api/orders/{id}/status/` с `{"status": "ready"}`
+        """
+        order_id = _int_param({'id': pk}, 'id')
+        new_status = request.data.get('status') if isinstance(request.data, dict) else None
+        if not isinstance(new_status, str):
+            raise serializers.ValidationError({"status": "Ожидается объект со строкой `status`."})
+        try:
+            change = transitions.change_status(order_id, new_status)
+        except Order.DoesNotExist:
+            return Response({"detail": "Не найдено."}, status=status.HTTP_404_NOT_FOUND)
+        except transitions.TransitionError as exc:
+            if exc.current is None:
+                raise serializers.ValidationError({"status": str(exc)})
+            return Response(
+                {"detail": str(exc), "current_status": exc.current}, status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            {
+                "id": change.order_id,
+                "status": change.status,
+                "previous_status": change.previous_status,
+                "paid_at": change.paid_at,
+                "version": change.version,
+            },
+            headers={'ETag': order_etag(change.order_id, change.version)},
+        )
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        🔍 Возвращает заказ с блюдами:
+        - ⚡ Ответ кэшируется по ID заказа и сбрасывается при изменении заказа или его блюд
+        - ⚡ С `If-None-Match` версия сверяется одним запросом по первичному ключу → `304` без блюд
+        - ⚡ Собирается из строк `.values()` без `OrderSerializer` (`orders.representation`)
+        - 📌 С локальным кэшем процесса запись из кэша отдается, только если ее версия совпадает с БД
+        - 📌 `GET /api/orders/{id}/`
+        """
+        try:
+            order_id = int(kwargs['pk'])
+        except ValueError:
+            raise Http404
+        is_fresh = None
+        if request.headers.get('If-None-Match') or cache.process_local():
+            version = Order.objects.filter(pk=order_id).values_list('version', flat=True).first()
+            if version is None:
+                raise Http404
+            etag = order_etag(order_id, version)
+            if _etag_listed(request.headers.get('If-None-Match'), etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            if cache.process_local():
+                is_fresh = cache.same_version(version)
+        data = cache.get_or_build(
+            'detail', cache.detail_key(order_id), lambda: self.build_detail(order_id), is_fresh=is_fresh
+        )
+        response = Response(data)
+        if data.get('version') is not None:
+            response['ETag'] = order_etag(data['id'], data['version'])
+        return response
+
+    @staticmethod
+    def build_detail(order_id: int) -> dict:
+        """Представление заказа для кэша карточки (`404`, если заказа нет)."""
+        data = representation.order_detail(order_id)
+        if data is None:
+            raise Http404
+        return data
+
+    def update(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        📝 Обновляет заказ (PUT и PATCH) с оптимистичной блокировкой по `If-Match`:
+        - ✅ Версия проверяется и строка занимается одним условным `UPDATE ... WHERE id = ? AND version = ?`
+          (без `SELECT ... FOR UPDATE`)
+        - ⚠️ Версия не совпала (заказ изменил кто-то другой) → `412`, нужно перечитать заказ
+        - 📌 Без `If-Match` (или с `If-Match: *`) — прежнее поведение, последняя запись побеждает
+        """
+        if_match = request.headers.get('If-Match')
+        if not if_match:
+            response = super().update(request, *args, **kwargs)
+            response['ETag'] = order_etag(response.data['id'], response.data['version'])
+            return response
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=kwargs.pop('partial', False))
+        serializer.is_valid(raise_exception=True)
+        tags = parse_etags(if_match)
+        with transaction.atomic():
+            if '*' not in tags:
+                versions = [version for tag in tags if (version := self.etag_version(tag, instance.pk)) is not None]
+                claimed = Order.objects.filter(pk=instance.pk, version__in=versions).update(version=F('version'))
+                if not claimed:
+                    return Response(
+                        {"detail": "Заказ изменился после чтения (ETag устарел). Получите заказ заново."},
+                        status=status.HTTP_412_PRECONDITION_FAILED,
+                    )
+                # Строка занята условным `UPDATE` до конца транзакции, версия в БД совпала с ожидаемой
+                instance.version = versions[0] if len(versions) == 1 else (
+                    Order.objects.filter(pk=instance.pk).values_list('version', flat=True).get()
+                )
+                serializer.context['row_locked'] = True
+            self.perform_update(serializer)
+        instance._prefetched_objects_cache = {}
+        return Response(serializer.data, headers={'ETag': order_etag(instance.pk, instance.version)})
+
+    @staticmethod
+    def etag_version(tag: str, order_id: int) -> int | None:
+        """
+        Версия из `ETag` заказа `"<id>.<version>"`.
+
+        `None` — тег другого заказа, чужого формата или с версией вне диапазона колонки
+        (такой тег не совпадет ни с одной версией → `412`, а не ошибка БД).
+        """
+        prefix, _, version = tag.strip('"').partition('.')
+        if prefix != str(order_id) or not (version.isascii() and version.isdigit()):
+            return None
+        value = int(version)
+        return value if value <= MAX_ORDER_VERSION else None
 
     @swagger_auto_schema(
         operation_description="🔄 Частичное обновление заказа. В `items` **обязательно** передавать `id` блюда.",
@@ -57,3 +410,145 @@ class OrderViewSet(viewsets.ModelViewSet):
         - 📌 `PATCH /api/orders/{id}/`
         """
         return super().partial_update(request, *args, **kwargs)
+
+
+class RevenueAPIView(ReplicaReadMixin, APIView):
+    """
+    💰 Выручка по сменам за день (`GET /api/revenue/?date=YYYY-MM-DD`).
+
+    Читает предварительно агрегированную сводку `RevenueRollup` — не более одной строки на смену.
+    """
+
+    @swagger_auto_schema(
+        operation_description="💰 Выручка по сменам за день (по умолчанию — сегодня).",
+        manual_parameters=[
+            openapi.Parameter('date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, description="День (YYYY-MM-DD)"),
+        ],
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        day, current_shift = self.parse_day(request.query_params)
+        rollups = RevenueRollup.objects.filter(day=day).order_by('shift')
+        return Response(self.summary(day, current_shift, RevenueRollupSerializer(rollups, many=True).data))
+
+    @staticmethod
+    def parse_day(params) -> tuple[date, str | None]:
+        """Читает день `date` (по умолчанию сегодня) и возвращает его вместе с текущей сменой (только для сегодня)."""
+        today, current_shift = RevenueRollup.bucket_for(timezone.now())
+        value: str | None = params.get('date')
+        try:
+            day: date = date.fromisoformat(value) if value else today
+        except ValueError:
+            raise serializers.ValidationError({"date": "Ожидается дата в формате YYYY-MM-DD."})
+        return day, current_shift if day == today else None
+
+    @staticmethod
+    def summary(day: date, current_shift: str | None, shifts: list[dict]) -> dict:
+        """Ответ: смены за день и итоги по ним."""
+        return {
+            "date": day,
+            "current_shift": current_shift,
+            "total": sum(row['revenue'] for row in shifts),
+            "orders_count": sum(row['orders_count'] for row in shifts),
+            "shifts": shifts,
+        }
+
+
+# 🔹 Общие параметры аналитики
+ANALYTICS_RANGE_PARAMETERS: list[openapi.Parameter] = [
+    openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, description="Начало диапазона (YYYY-MM-DD, по умолчанию — 7 дней назад)"),
+    openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, description="Конец диапазона включительно (YYYY-MM-DD, по умолчанию — сегодня)"),
+]
+
+
+class AnalyticsAPIView(ReplicaReadMixin, APIView, metaclass=ABCMeta):
+    """
+    Базовый класс аналитики: разбирает диапазон `from`/`to` и оборачивает результат.
+
+    Абстрактный: каждый отчет определяет `compute`, без него класс не создать.
+    """
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        start, end = analytics.parse_range(request.query_params)
+        return Response({"from": start, "to": end, **self.compute(request, start, end)})
+
+    @abstractmethod
+    def compute(self, request: Request, start: datetime, end: datetime) -> dict:
+        """Данные отчета за `[start, end)`; добавляются в ответ рядом с `from`/`to`."""
+
+
+class RevenueAnalyticsAPIView(AnalyticsAPIView):
+    """📈 Выручка, заказы и проданные блюда по корзинам времени (`GET /api/analytics/revenue/`)."""
+
+    @swagger_auto_schema(
+        operation_description="📈 Выручка, число заказов и проданных блюд по часам/дням/неделям/месяцам.",
+        manual_parameters=ANALYTICS_RANGE_PARAMETERS + [
+            openapi.Parameter('bucket', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=list(analytics.BUCKETS), description="Размер корзины (по умолчанию `hour`)"),
+        ],
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    def compute(self, request: Request, start: datetime, end: datetime) -> dict:
+        bucket = analytics.parse_bucket(request.query_params)
+        return {"bucket": bucket, "results": analytics.revenue_by_bucket(start, end, bucket)}
+
+
+class TableAnalyticsAPIView(AnalyticsAPIView):
+    """🍽 Выручка по столам (`GET /api/analytics/tables/`)."""
+
+    @swagger_auto_schema(
+        operation_description="🍽 Выручка и число оплаченных заказов по столам.",
+        manual_parameters=ANALYTICS_RANGE_PARAMETERS,
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    def compute(self, request: Request, start: datetime, end: datetime) -> dict:
+        return {"results": analytics.revenue_by_table(start, end)}
+
+
+class DishAnalyticsAPIView(AnalyticsAPIView):
+    """🏆 Самые продаваемые блюда (`GET /api/analytics/dishes/`)."""
+
+    max_limit: int = 100
+
+    @swagger_auto_schema(
+        operation_description="🏆 Топ-N блюд по проданному количеству.",
+        manual_parameters=ANALYTICS_RANGE_PARAMETERS + [
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description="Сколько блюд вернуть (по умолчанию 10, максимум 100)"),
+        ],
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().get(request, *args, **kwargs)
+
+    def compute(self, request: Request, start: datetime, end: datetime) -> dict:
+        limit = analytics.parse_limit(request.query_params, self.max_limit)
+        return {"results": analytics.top_dishes(start, end, limit)}
+
+
+class CacheStatsAPIView(APIView):
+    """📊 Счетчики попаданий/промахов кэша заказов в текущем процессе (`GET /api/cache/stats/`)."""
+
+    @swagger_auto_schema(operation_description="📊 Попадания и промахи кэша по пространствам имен (`list`, `detail`, `revenue`).")
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(cache.stats())
+
+
+class MenuAPIView(APIView):
+    """
+    🍽 Активное меню (`GET /api/menu/`).
+
+    Отдается готовый снимок меню из памяти процесса с `ETag` по версии меню:
+    клиент с актуальной версией (`If-None-Match`) получает `304 Not Modified`.
+    """
+
+    @swagger_auto_schema(operation_description="🍽 Активное меню: `id`, `name`, `price`. Поддерживает `If-None-Match` → `304`.")
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        snapshot = menu.get_snapshot()
+        if snapshot.etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"version": snapshot.version, "results": snapshot.payload})
+        response['ETag'] = snapshot.etag
+        response['Cache-Control'] = 'no-cache'
+        return response
@@ -11,3 +11,7 @@ class OrdersConfig(AppConfig):
 
     default_auto_field: str = 'django.db.models.BigAutoField'
     name: str = 'orders'
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов моделей заказов и системные проверки."""
+        from . import checks, signals  # noqa: F401
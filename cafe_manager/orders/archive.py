@@ -0,0 +1,90 @@
+"""
+Перенос оплаченных заказов в архив.
+
+Рабочие таблицы (`Order`, `OrderItem`) должны содержать только текущие
+заказы: список, фильтры и проверки сумм не должны читать всю историю.
+Оплаченные заказы старше заданного возраста переносятся вместе с блюдами
+в `ArchivedOrder`/`ArchivedOrderItem` пакетами — каждый пакет в своей
+транзакции, поэтому блокировки короткие, а прерванный перенос можно
+просто запустить заново.
+
+Сводка выручки (`RevenueRollup`) при переносе не меняется: архивные заказы
+остаются в выручке, а отчеты `orders.analytics` читают обе таблицы.
+"""
+from collections.abc import Iterator
+from datetime import datetime
+
+from django.db import connections, models, router, transaction
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, OrderTombstone
+from .signals import order_changed
+
+ORDER_FIELDS: tuple[str, ...] = ('id', 'table_number', 'total_price', 'status', 'created_at', 'paid_at')
+ITEM_FIELDS: tuple[str, ...] = ('id', 'order_id', 'menu_item_id', 'name', 'price', 'quantity')
+
+
+def archivable_orders(cutoff: datetime):
+    """Оплаченные заказы с временем оплаты раньше `cutoff`."""
+    return Order.objects.filter(status='paid', paid_at__lt=cutoff)
+
+
+def archive_batch(cutoff: datetime, batch_size: int) -> list[int]:
+    """
+    🔹 Переносит в архив один пакет (до `batch_size` заказов) в одной транзакции.
+
+    - ✅ Заказы блокируются (`SELECT ... FOR UPDATE SKIP LOCKED`) — занятые параллельной правкой пропускаются
+    - ✅ Заказы и блюда копируются двумя `bulk_create` и удаляются двумя `DELETE` без сигналов
+      (иначе `post_delete` вычел бы заказы из сводки выручки)
+    - ✅ Для синхронизации планшетов создаются отметки об удалении (`OrderTombstone`)
+
+    Возвращает ID перенесенных заказов (пустой список — переносить больше нечего).
+    """
+    with transaction.atomic():
+        ids = list(
+            archivable_orders(cutoff).select_for_update(skip_locked=True)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder(**row) for row in Order.objects.filter(id__in=ids).values(*ORDER_FIELDS)]
+        )
+        ArchivedOrderItem.objects.bulk_create(
+            [ArchivedOrderItem(**row) for row in OrderItem.objects.filter(order_id__in=ids).values(*ITEM_FIELDS)],
+            batch_size=1000,
+        )
+        _delete_rows(OrderItem, 'order', ids)
+        _delete_rows(Order, 'id', ids)
+        # Для планшетов перенесенный заказ пропадает из рабочего списка, как удаленный
+        OrderTombstone.objects.bulk_create([OrderTombstone(order_id=order_id) for order_id in ids], ignore_conflicts=True)
+    order_changed.send(sender=Order, order_ids=ids, statuses={'paid'}, action='archived', status='paid')
+    return ids
+
+
+def _delete_rows(model: type[models.Model], field: str, ids: list[int]) -> None:
+    """
+    `DELETE FROM <таблица> WHERE <колонка field> IN (...)` одним запросом.
+
+    📌 Обычный SQL вместо `QuerySet.delete()`: без `pre_delete`/`post_delete` и без
+    чтения строк перед удалением (каскад блюд уже выполнен явно).
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    column = model._meta.get_field(field).column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({', '.join(['%s'] * len(ids))})",
+            ids,
+        )
+
+
+def archive_paid_orders(cutoff: datetime, batch_size: int = 1000) -> Iterator[list[int]]:
+    """🔹 Переносит в архив все оплаченные до `cutoff` заказы, отдавая ID каждого пакета."""
+    while ids := archive_batch(cutoff, batch_size):
+        yield ids
+
+
+def prune_tombstones(cutoff: datetime) -> int:
+    """🔹 Удаляет отметки об удалении заказов старше `cutoff`; возвращает их число."""
+    deleted, _ = OrderTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,146 @@
+"""
+Асинхронные представления чтения для ASGI (`/api/async/...`).
+
+Под ASGI синхронное представление занимает поток из пула на все время запроса,
+поэтому число одновременных запросов ограничено размером пула. Эти представления
+выполняются в event loop и обращаются к БД через асинхронный ORM Django;
+независимые запросы (например, рабочие и архивные таблицы в аналитике)
+запускаются конкурентно через `asyncio.gather`.
+
+Ответы совпадают с синхронными `OrderViewSet`, `RevenueAPIView` и аналитикой,
+кроме пагинации списка: вместо курсора DRF используется keyset-курсор `?after=<id>`
+/ `?before=<id>` (как у веб-списка заказов). Списки, выручка и аналитика читаются
+с реплики БД, если она настроена (`orders.db_router`).
+"""
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from django.db.models import aprefetch_related_objects
+from django.http import Http404, HttpRequest, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import analytics, cache
+from .api_views import DishAnalyticsAPIView, RevenueAPIView, filter_orders
+from .db_router import replica_reads
+from .models import Order, RevenueRollup
+from .pagination import OrderCursorPagination, apaginate_by_id
+from .serializers import OrderSerializer, RevenueRollupSerializer
+
+
+def _json(data: Any, status: int = 200) -> JsonResponse:
+    """JSON-ответ тем же кодировщиком, что и у DRF (Decimal, даты)."""
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False, json_dumps_params={'ensure_ascii': False})
+
+
+def async_api_view(view: Callable[..., Awaitable[JsonResponse]]) -> Callable[..., Awaitable[JsonResponse]]:
+    """🔹 Только `GET`; ошибки валидации → `400`, отсутствующий объект → `404` (в формате DRF)."""
+    @require_GET
+    @functools.wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        try:
+            return await view(request, *args, **kwargs)
+        except serializers.ValidationError as exc:
+            return _json(exc.detail, status=400)
+        except Http404:
+            return _json({"detail": "Не найдено."}, status=404)
+    return wrapper
+
+
+def _page_size(request: HttpRequest) -> int:
+    """Размер страницы из `?page_size=` с теми же ограничениями, что у `OrderCursorPagination`."""
+    try:
+        size = int(request.GET[OrderCursorPagination.page_size_query_param])
+    except (KeyError, ValueError):
+        return OrderCursorPagination.page_size
+    return min(size, OrderCursorPagination.max_page_size) if size > 0 else OrderCursorPagination.page_size
+
+
+def _page_url(request: HttpRequest, **cursor: int | None) -> str | None:
+    """Ссылка на соседнюю страницу с курсором `after`/`before` (или `None`, если страницы нет)."""
+    name, value = next(iter(cursor.items()))
+    if value is None:
+        return None
+    query = request.GET.copy()
+    query.pop('after', None)
+    query.pop('before', None)
+    query[name] = value
+    return request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+
+
+@async_api_view
+@replica_reads
+async def order_list(request: HttpRequest) -> JsonResponse:
+    """
+    🔍 Страница заказов (`GET /api/async/orders/`): фильтры как у `GET /api/orders/`.
+
+    Два запроса: страница заказов (`LIMIT page_size + 1`) и блюда этих заказов.
+    """
+    queryset = filter_orders(Order.objects.all(), request.GET)
+    page = await apaginate_by_id(queryset, _page_size(request), request.GET.get('after'), request.GET.get('before'))
+    await aprefetch_related_objects(page.object_list, 'items')
+    return _json({
+        "next": _page_url(request, after=page.next_cursor),
+        "previous": _page_url(request, before=page.previous_cursor),
+        "results": OrderSerializer(page.object_list, many=True).data,
+    })
+
+
+@async_api_view
+async def order_detail(request: HttpRequest, pk: int) -> JsonResponse:
+    """🔍 Заказ с блюдами (`GET /api/async/orders/{id}/`); общий кэш с `OrderViewSet.retrieve`."""
+    async def build() -> dict:
+        try:
+            order = await Order.objects.prefetch_related('items').aget(pk=pk)
+        except Order.DoesNotExist:
+            raise Http404
+        return OrderSerializer(order).data
+
+    is_fresh = None
+    if cache.process_local():
+        # Локальный кэш не видит инвалидацию из других процессов — сверяем версию заказа
+        version = await Order.objects.filter(pk=pk).values_list('version', flat=True).afirst()
+        if version is None:
+            raise Http404
+        is_fresh = cache.same_version(version)
+    return _json(await cache.aget_or_build('detail', cache.detail_key(pk), build, is_fresh=is_fresh))
+
+
+@async_api_view
+@replica_reads
+async def revenue(request: HttpRequest) -> JsonResponse:
+    """💰 Выручка по сменам за день (`GET /api/async/revenue/?date=YYYY-MM-DD`)."""
+    day, current_shift = RevenueAPIView.parse_day(request.GET)
+    rollups = [rollup async for rollup in RevenueRollup.objects.filter(day=day).order_by('shift')]
+    return _json(RevenueAPIView.summary(day, current_shift, RevenueRollupSerializer(rollups, many=True).data))
+
+
+@async_api_view
+@replica_reads
+async def revenue_analytics(request: HttpRequest) -> JsonResponse:
+    """📈 Выручка по корзинам времени (`GET /api/async/analytics/revenue/`), четыре запроса конкурентно."""
+    start, end = analytics.parse_range(request.GET)
+    bucket = analytics.parse_bucket(request.GET)
+    results = await analytics.revenue_by_bucket_report(start, end, bucket).arun()
+    return _json({"from": start, "to": end, "bucket": bucket, "results": results})
+
+
+@async_api_view
+@replica_reads
+async def table_analytics(request: HttpRequest) -> JsonResponse:
+    """🍽 Выручка по столам (`GET /api/async/analytics/tables/`)."""
+    start, end = analytics.parse_range(request.GET)
+    results = await analytics.revenue_by_table_report(start, end).arun()
+    return _json({"from": start, "to": end, "results": results})
+
+
+@async_api_view
+@replica_reads
+async def dish_analytics(request: HttpRequest) -> JsonResponse:
+    """🏆 Самые продаваемые блюда (`GET /api/async/analytics/dishes/`)."""
+    start, end = analytics.parse_range(request.GET)
+    limit = analytics.parse_limit(request.GET, DishAnalyticsAPIView.max_limit)
+    results = await analytics.top_dishes_report(start, end, limit).arun()
+    return _json({"from": start, "to": end, "results": results})
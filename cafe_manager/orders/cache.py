@@ -0,0 +1,174 @@
+"""
+Кэш чтения заказов поверх Django cache framework.
+
+Кэшируются:
+- 📜 страницы списка заказов (`OrderListView`) — ключ по фильтрам и курсору страницы;
+- 🔍 заказ целиком (`OrderViewSet.retrieve`) — ключ по ID заказа;
+- 💰 выручка за день (`RevenueView`) — ключ по дню и смене.
+
+Инвалидация точечная и идет через сигнал `orders.signals.order_changed`:
+запись заказа удаляется по ID, а страницы списка и выручка "устаревают" через
+счетчики поколений (`generation`): при изменении заказа со статусом `paid`
+увеличиваются поколения списков `status=paid` и "все статусы", остальные
+фильтры остаются в кэше.
+
+📌 Инвалидация видна всем процессам только при общем бэкенде кэша (Redis, `REDIS_URL`).
+С локальным кэшем процесса (`LocMemCache`, один процесс `runserver` и тесты) записи
+живут не дольше `ORDERS_CACHE_LOCAL_TIMEOUT` секунд, а карточка заказа сверяется с его
+версией в БД перед отдачей.
+"""
+import hashlib
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+KEY_PREFIX: str = 'orders'
+ALL_STATUSES: str = '*'
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+
+
+def process_local() -> bool:
+    """Кэш виден только текущему процессу: инвалидация из других процессов до него не дойдет."""
+    return isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def _timeout() -> int:
+    if process_local():
+        return getattr(settings, 'ORDERS_CACHE_LOCAL_TIMEOUT', 5)
+    return getattr(settings, 'ORDERS_CACHE_TIMEOUT', 300)
+
+
+def _count(namespace: str, outcome: str) -> None:
+    """Увеличивает счетчик попаданий/промахов пространства имен."""
+    with _stats_lock:
+        counters = _stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    """🔹 Счетчики попаданий/промахов по пространствам имен (в рамках процесса) для мониторинга."""
+    with _stats_lock:
+        return {
+            namespace: {
+                **counters,
+                'hit_ratio': round(counters['hits'] / total, 4) if (total := counters['hits'] + counters['misses']) else None,
+            }
+            for namespace, counters in _stats.items()
+        }
+
+
+def reset_stats() -> None:
+    """Обнуляет счетчики попаданий/промахов."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def generation(name: str) -> int:
+    """
+    Текущее поколение группы ключей `name` (страницы списка по статусу, выручка).
+
+    Если счетчик вытеснен из кэша, он начинается заново с текущего времени в мс,
+    чтобы не совпасть со старым поколением и не "воскресить" устаревшие ключи.
+    """
+    key = f'{KEY_PREFIX}:gen:{name}'
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, time.time_ns() // 1_000_000, timeout=None)
+        value = cache.get(key, 0)
+    return value
+
+
+def bump_generation(name: str) -> None:
+    """Делает устаревшими все ключи группы `name`, увеличивая ее поколение."""
+    key = f'{KEY_PREFIX}:gen:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns() // 1_000_000, timeout=None)
+
+
+def get_or_build(
+    namespace: str, key: str, builder: Callable[[], Any], is_fresh: Callable[[Any], bool] | None = None
+) -> Any:
+    """
+    🔹 Возвращает значение из кэша или строит его через `builder` и сохраняет.
+
+    `is_fresh` — дополнительная проверка найденного значения (например, по версии в БД);
+    не прошедшее ее значение строится заново.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING and (is_fresh is None or is_fresh(value)):
+        _count(namespace, 'hits')
+        return value
+    _count(namespace, 'misses')
+    value = builder()
+    cache.set(key, value, timeout=_timeout())
+    return value
+
+
+async def aget_or_build(
+    namespace: str, key: str, builder: Callable[[], Awaitable[Any]], is_fresh: Callable[[Any], bool] | None = None
+) -> Any:
+    """🔹 Асинхронный вариант `get_or_build` (асинхронный API кэша и асинхронный `builder`)."""
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING and (is_fresh is None or is_fresh(value)):
+        _count(namespace, 'hits')
+        return value
+    _count(namespace, 'misses')
+    value = await builder()
+    await cache.aset(key, value, timeout=_timeout())
+    return value
+
+
+def same_version(version: int) -> Callable[[dict], bool]:
+    """Проверка `is_fresh` для карточки заказа: запись из кэша той же версии, что и в БД."""
+    return lambda cached: cached.get('version') == version
+
+
+def list_key(params: dict[str, str]) -> str:
+    """Ключ страницы списка заказов: поколение статуса + хэш фильтров и курсора."""
+    status = params.get('status') or ALL_STATUSES
+    digest = hashlib.md5(urlencode(sorted(params.items())).encode()).hexdigest()
+    return f'{KEY_PREFIX}:list:{status}:{generation(f"list:{status}")}:{digest}'
+
+
+def detail_key(order_id: int) -> str:
+    """Ключ заказа (`OrderViewSet.retrieve`)."""
+    return f'{KEY_PREFIX}:detail:{order_id}'
+
+
+def revenue_key(*parts: Any) -> str:
+    """Ключ выручки (день/смена) с текущим поколением выручки."""
+    return f'{KEY_PREFIX}:revenue:{generation("revenue")}:' + ':'.join(str(part) for part in parts)
+
+
+def invalidate_orders(order_ids: Iterable[int], statuses: Iterable[str] | None = None) -> None:
+    """
+    🔹 Инвалидирует кэш после изменения заказов.
+
+    - `order_ids` — удаляются записи этих заказов
+    - `statuses` — статусы заказов до и после изменения; `None`, если неизвестны
+      (тогда устаревают страницы списка всех статусов и выручка)
+    """
+    from .models import Order
+
+    cache.delete_many([detail_key(order_id) for order_id in order_ids])
+    affected = set(statuses) if statuses is not None else {code for code, _ in Order.STATUS_CHOICES}
+    for status in affected | {ALL_STATUSES}:
+        bump_generation(f'list:{status}')
+    if statuses is None or 'paid' in affected:
+        invalidate_revenue()
+
+
+def invalidate_revenue() -> None:
+    """Делает устаревшими все закэшированные значения выручки."""
+    bump_generation('revenue')
@@ -0,0 +1,110 @@
+"""
+Синхронизация планшетов официантов по курсору изменений (`GET /api/orders/changes/`).
+
+Каждое изменение заказа или его блюд сдвигает `Order.updated_at`, а удаление (и перенос
+в архив) оставляет отметку `OrderTombstone`. Курсор — это пара `(время, ID)`; ответ
+содержит только заказы и отметки после курсора в порядке `(updated_at, id)` по
+индексам, поэтому объем синхронизации пропорционален активности, а не истории.
+
+- 📌 Время изменения записывается до коммита транзакции, поэтому, догнав текущее
+  время, курсор отступает на `ORDERS_CHANGES_OVERLAP_SECONDS`: изменения, закоммиченные
+  с опозданием, придут при следующем опросе (недавние заказы могут прийти повторно).
+- ⚠️ Читается только основная база: реплика может отставать дольше, чем этот отступ.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Order, OrderTombstone
+
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class CursorExpired(Exception):
+    """Курсор старше срока хранения отметок об удалении — нужна полная синхронизация."""
+
+
+@dataclass
+class ChangesPage:
+    """
+    Порция изменений.
+
+    Атрибуты:
+    - 🔹 `orders` (list[Order]) — созданные и измененные заказы (с предзагруженными блюдами).
+    - 🔹 `deleted` (list[int]) — ID удаленных (или перенесенных в архив) заказов.
+    - 🔹 `cursor` (str) — курсор для следующего запроса.
+    - 🔹 `has_more` (bool) — изменений больше, чем поместилось в порцию; запросить сразу еще раз.
+    """
+
+    orders: list[Order] = field(default_factory=list)
+    deleted: list[int] = field(default_factory=list)
+    cursor: str = ''
+    has_more: bool = False
+
+
+def encode_cursor(moment: datetime, order_id: int) -> str:
+    """Курсор `<микросекунды с 1970 года>_<id>` (без потери точности на float)."""
+    delta = moment - EPOCH
+    return f"{(delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds}_{order_id}"
+
+
+def decode_cursor(value: str) -> tuple[datetime, int]:
+    """Разбирает курсор `encode_cursor`; некорректный курсор → `ValidationError` (`400`)."""
+    try:
+        micros, order_id = (int(part) for part in value.split('_'))
+        return EPOCH + timedelta(microseconds=micros), order_id
+    except (ValueError, OverflowError):
+        raise serializers.ValidationError({"since": "Некорректный курсор."})
+
+
+def changes_since(cursor: str | None, limit: int) -> ChangesPage:
+    """
+    🔹 Изменения заказов после курсора (без курсора — все текущие заказы, начальная загрузка).
+
+    Заказы и отметки об удалении читаются двумя запросами по `(время, id) > курсор`
+    с `LIMIT limit + 1` и сливаются в один поток по времени; блюда выбранных заказов —
+    третьим запросом.
+    """
+    started = timezone.now()
+    since = decode_cursor(cursor) if cursor else (EPOCH, 0)
+    if cursor and since[0] < started - timedelta(days=getattr(settings, 'ORDERS_TOMBSTONE_DAYS', 30)):
+        raise CursorExpired
+
+    moment, last_id = since
+    orders = list(
+        Order.objects.filter(Q(updated_at__gt=moment) | Q(updated_at=moment, id__gt=last_id))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    stream: list[tuple[datetime, int, Order | None]] = [(order.updated_at, order.id, order) for order in orders]
+    if cursor:
+        # При начальной загрузке удаленные заказы клиенту неизвестны — отметки не нужны
+        stream += [
+            (deleted_at, order_id, None)
+            for order_id, deleted_at in (
+                OrderTombstone.objects.filter(Q(deleted_at__gt=moment) | Q(deleted_at=moment, order_id__gt=last_id))
+                .order_by('deleted_at', 'order_id').values_list('order_id', 'deleted_at')[:limit + 1]
+            )
+        ]
+    stream.sort(key=lambda entry: (entry[0], entry[1]))
+    has_more = len(stream) > limit
+    stream = stream[:limit]
+
+    changed = [entry[2] for entry in stream if entry[2] is not None]
+    prefetch_related_objects(changed, 'items')
+    page = ChangesPage(
+        orders=changed,
+        deleted=[entry[1] for entry in stream if entry[2] is None],
+        has_more=has_more,
+    )
+    if has_more:
+        page.cursor = encode_cursor(stream[-1][0], stream[-1][1])
+    else:
+        # Догнали текущее время: отступаем на окно запаздывающих коммитов (но не назад от курсора клиента)
+        overlap = (started - timedelta(seconds=getattr(settings, 'ORDERS_CHANGES_OVERLAP_SECONDS', 5)), 0)
+        page.cursor = encode_cursor(*max(since, overlap))
+    return page
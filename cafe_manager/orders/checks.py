@@ -0,0 +1,22 @@
+from django.core.checks import Tags, Warning, register
+
+from . import schema
+
+
+@register(Tags.urls)
+def api_schema_check(app_configs, **kwargs) -> list[Warning]:
+    """
+    🩺 Собранная схема OpenAPI (`API_SCHEMA_FILE`) совпадает со схемой текущих представлений API.
+
+    Выполняется при `manage.py check`, `runserver` и `migrate`; схема строится один раз на проверку.
+    """
+    if app_configs is not None and not any(config.name == 'orders' for config in app_configs):
+        return []
+    stored = schema.stored_schema()
+    if stored is None:
+        message = f"Файл схемы API {schema.schema_file()} не найден: схема будет строиться при первом запросе в каждом процессе."
+    elif stored != schema.generate_schema():
+        message = "Собранная схема API устарела: она не совпадает с текущими представлениями."
+    else:
+        return []
+    return [Warning(message, hint="Выполните `python manage.py build_api_schema`.", id='orders.W001')]
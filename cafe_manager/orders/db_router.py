@@ -0,0 +1,165 @@
+"""
+Маршрутизация чтений на реплику БД.
+
+Все записи идут в основную базу (`default`). На реплику (`settings.DATABASE_REPLICA_ALIAS`,
+если такой алиас есть в `DATABASES`) уходят только чтения, явно помеченные как
+отчетные: списки заказов, выручка, аналитика и выгрузки (`read_from_replica`,
+`ReplicaReadMixin`, `replica_reads`). Остальные чтения — например, заказ сразу
+после его изменения — читаются из основной базы.
+
+- 📌 Read-your-writes: после записи в запросе его чтения идут в основную базу, а
+  `ReplicaStickinessMiddleware` закрепляет клиента за основной базой еще на
+  `REPLICA_STICKY_SECONDS` (cookie), пока реплика догоняет изменения.
+- 🩺 Если реплика недоступна, чтения на `REPLICA_RETRY_SECONDS` возвращаются в основную базу.
+"""
+import functools
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoutingState:
+    """
+    Состояние маршрутизации одного запроса (или блока кода).
+
+    Атрибуты:
+    - 🔹 `replica_reads` (bool) — чтения можно отправлять на реплику.
+    - 🔹 `pinned` (bool) — клиент закреплен за основной базой (недавно писал).
+    - 🔹 `wrote` (bool) — в этом запросе уже была запись.
+    """
+
+    replica_reads: bool = False
+    pinned: bool = False
+    wrote: bool = False
+
+
+# Изменяемый объект в ContextVar: его видят и потоки `sync_to_async` асинхронных представлений
+_state: ContextVar[RoutingState | None] = ContextVar('orders_db_routing', default=None)
+_replica_down_until: float = 0.0
+
+
+def replica_alias() -> str | None:
+    """Алиас реплики, если она настроена (`settings.DATABASE_REPLICA_ALIAS` есть в `DATABASES`)."""
+    alias: str | None = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def replica_available(alias: str) -> bool:
+    """
+    🩺 Проверяет, что к реплике можно подключиться.
+
+    Постоянное соединение (`CONN_MAX_AGE`) переиспользуется, а его пригодность проверяет
+    Django (`CONN_HEALTH_CHECKS`) в начале запроса, поэтому проверка обычно бесплатна.
+    После ошибки подключения реплика не используется `REPLICA_RETRY_SECONDS` секунд.
+    """
+    global _replica_down_until
+    if time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except OperationalError:
+        _replica_down_until = time.monotonic() + getattr(settings, 'REPLICA_RETRY_SECONDS', 30)
+        logger.warning("Реплика %s недоступна, чтения идут в основную базу", alias, exc_info=True)
+        return False
+    return True
+
+
+@contextmanager
+def routing_state(pinned: bool = False) -> Iterator[RoutingState]:
+    """Новое состояние маршрутизации на время запроса (используется middleware)."""
+    state = RoutingState(pinned=pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def read_from_replica() -> Iterator[None]:
+    """🔹 Разрешает отправлять чтения внутри блока на реплику (отчеты, списки, выгрузки)."""
+    state = _state.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _state.set(state)
+    previous = state.replica_reads
+    state.replica_reads = True
+    try:
+        yield
+    finally:
+        state.replica_reads = previous
+        if token is not None:
+            _state.reset(token)
+
+
+def replica_reads(view: Callable) -> Callable:
+    """🔹 Декоратор представления (синхронного или асинхронного): чтения — с реплики."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with read_from_replica():
+                return await view(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with read_from_replica():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """
+    🔹 Миксин для представлений-классов (Django и DRF): чтения запроса — с реплики.
+
+    Ответ рендерится внутри блока, чтобы ленивые запросы шаблона тоже шли на реплику.
+    """
+
+    def dispatch(self, request, *args: Any, **kwargs: Any):
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)) and not getattr(response, 'is_rendered', True):
+                response.render()
+        return response
+
+
+class PrimaryReplicaRouter:
+    """
+    Роутер БД: записи — в основную базу, отчетные чтения — на реплику.
+
+    Подключается в `settings.DATABASE_ROUTERS`; без настроенной реплики все идет в `default`.
+    """
+
+    def db_for_read(self, model: type, **hints: Any) -> str | None:
+        state = _state.get()
+        if state is None or not state.replica_reads or state.pinned or state.wrote:
+            return None
+        alias = replica_alias()
+        if alias is None or not replica_available(alias):
+            return None
+        return alias
+
+    def db_for_write(self, model: type, **hints: Any) -> str:
+        state = _state.get()
+        if state is not None:
+            state.wrote = True  # Дальнейшие чтения запроса — из основной базы (read-your-writes)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool:
+        # Реплика содержит те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints: Any) -> bool | None:
+        return None
@@ -0,0 +1,46 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from django.conf import settings
+from django.http import HttpRequest, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .events import Event, broker
+
+
+async def _event_stream(since: str | None) -> AsyncIterator[str]:
+    """Отдает пропущенные события, затем живые события и периодические heartbeat-комментарии."""
+    subscription, missed = broker.subscribe(since)
+    heartbeat: float = getattr(settings, 'ORDERS_EVENTS_HEARTBEAT', 15)
+    try:
+        yield "retry: 3000\n\n"
+        for event in missed:
+            yield event.encode(broker.epoch)
+        while True:
+            try:
+                event: Event | None = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                # Клиент отстал и переполнил очередь — закрываем поток, он переподключится с курсором
+                return
+            yield event.encode(broker.epoch)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@require_GET
+async def order_event_stream(request: HttpRequest) -> StreamingHttpResponse:
+    """
+    📡 Поток событий заказов (`GET /api/events/`, Server-Sent Events).
+
+    - ✅ `order.created`, `order.updated`, `order.status_changed`, `order.deleted`
+    - 🔁 Переподключение: браузер сам передает `Last-Event-ID`, либо `?since=<id>`
+    - ⚠️ Нужен ASGI-сервер (`uvicorn cafe_manager.asgi:application`)
+    """
+    since: str | None = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    response = StreamingHttpResponse(_event_stream(since), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Не буферизовать поток в nginx
+    return response
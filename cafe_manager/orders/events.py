@@ -0,0 +1,154 @@
+"""
+Поток событий заказов для кухни и официантов (Server-Sent Events).
+
+События публикуются после коммита транзакции (по сигналу `order_changed`)
+и раздаются подписчикам внутри процесса. Последние события хранятся в
+кольцевом буфере, поэтому переподключившийся клиент передает ID последнего
+полученного события (`Last-Event-ID` / `?since=`) и получает только пропущенное.
+
+ID события имеет вид `<эпоха>-<номер>`: эпоха меняется при перезапуске процесса.
+Если клиент пришел с чужой эпохой или слишком старым номером, он получает
+событие `reset` и должен один раз перечитать список заказов.
+
+⚠️ Раздача идет внутри одного процесса: при нескольких воркерах каждый из них
+раздает только события, произошедшие в нем самом.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class Event:
+    """
+    Событие потока.
+
+    Атрибуты:
+    - 🔹 `seq` (int) — порядковый номер события в процессе.
+    - 🔹 `type` (str) — `order.created`, `order.updated`, `order.status_changed`, `order.deleted`, `order.archived`, `reset`.
+    - 🔹 `data` (dict) — полезная нагрузка (ID заказов, статусы).
+    """
+
+    seq: int
+    type: str
+    data: dict = field(default_factory=dict)
+
+    def encode(self, epoch: int) -> str:
+        """Кодирует событие в формат `text/event-stream`."""
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
+        return f"id: {epoch}-{self.seq}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """Подписка одного клиента: очередь событий в event loop его соединения."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=max_pending)
+        self.overflowed: bool = False
+
+    def deliver(self, event: Event) -> None:
+        """Кладет событие в очередь (вызывается в event loop подписчика)."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Клиент не успевает читать — закрываем поток, он переподключится с курсором
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class EventBroker:
+    """
+    🔹 Внутрипроцессный брокер событий: кольцевой буфер + раздача подписчикам.
+
+    `publish` потокобезопасен и может вызываться из синхронных представлений
+    (в том числе из потоков `sync_to_async` под ASGI).
+    """
+
+    def __init__(self, buffer_size: int = 1000, max_pending: int = 1000) -> None:
+        self.epoch: int = time.time_ns() // 1_000_000
+        self.max_pending = max_pending
+        self._buffer: deque[Event] = deque(maxlen=buffer_size)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
+
+    def publish(self, type: str, data: dict[str, Any]) -> Event:
+        """Добавляет событие в буфер и раздает его всем подписчикам."""
+        with self._lock:
+            event = Event(seq=next(self._seq), type=type, data=data)
+            self._buffer.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Event loop подписчика уже закрыт
+                self.unsubscribe(subscription)
+        return event
+
+    def subscribe(self, since: str | None = None) -> tuple[Subscription, list[Event]]:
+        """
+        Регистрирует подписчика в текущем event loop.
+
+        Возвращает подписку и события, пропущенные после курсора `since`
+        (или одно событие `reset`, если их уже нет в буфере).
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+            missed = self.replay(since)
+        return subscription, missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def replay(self, since: str | None) -> list[Event]:
+        """События после курсора `<эпоха>-<номер>` из буфера (или `[reset]`, если курсор устарел)."""
+        if not since:
+            return []
+        try:
+            epoch, seq = (int(part) for part in since.split('-', 1))
+        except ValueError:
+            latest = self._buffer[-1].seq if self._buffer else 0
+            return [Event(seq=latest, type='reset', data={'reason': 'invalid cursor'})]
+        buffer = list(self._buffer)
+        latest = buffer[-1].seq if buffer else 0
+        if epoch != self.epoch or (buffer and seq < buffer[0].seq - 1):
+            # ID reset-события — последнее событие: после перечитывания клиент продолжит с него
+            return [Event(seq=latest, type='reset', data={'reason': 'cursor expired'})]
+        return [event for event in buffer if event.seq > seq]
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscribers)
+
+
+broker = EventBroker(
+    buffer_size=getattr(settings, 'ORDERS_EVENTS_BUFFER', 1000),
+    max_pending=getattr(settings, 'ORDERS_EVENTS_MAX_PENDING', 1000),
+)
+
+
+def publish_order_change(order_ids: list[int], action: str, status: str | None = None,
+                         previous_status: str | None = None) -> None:
+    """🔹 Публикует событие изменения заказов (`order.<action>` или `order.status_changed`)."""
+    data: dict[str, Any] = {'order_ids': order_ids}
+    event_type = f'order.{action}'
+    if status is not None:
+        data['status'] = status
+    if action == 'updated' and previous_status is not None and previous_status != status:
+        event_type = 'order.status_changed'
+        data['previous_status'] = previous_status
+    broker.publish(event_type, data)
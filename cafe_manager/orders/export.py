@@ -0,0 +1,158 @@
+"""
+Потоковая выгрузка заказов с блюдами (CSV и NDJSON).
+
+Заказы и блюда читаются одним запросом `LEFT JOIN` по курсору
+(`QuerySet.iterator(chunk_size=...)`, на PostgreSQL — серверный курсор), кортежами
+`values_list` без создания моделей, и сразу превращаются в текст пакетами строк.
+Поэтому память не зависит от размера диапазона: в любой момент в процессе
+находится не больше одного пакета строк.
+
+Выгружаются рабочие и архивные заказы (`orders.archive`), созданные в диапазоне
+(без ограничения длины; без `from` — вся история до `to`): сначала архивные,
+затем рабочие, внутри — по возрастанию ID. Чтения идут с
+реплики БД, если она настроена (`orders.db_router`).
+"""
+import csv
+import io
+import json
+from collections.abc import Callable, Iterator
+from datetime import date, datetime, time, timedelta, tzinfo
+from itertools import chain, groupby, islice
+from operator import itemgetter
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from .db_router import read_from_replica
+from .models import ArchivedOrder, Order
+
+FORMATS: dict[str, str] = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# 🔹 Колонки CSV: одна строка на блюдо (заказ без блюд — одна строка с пустыми колонками блюда)
+COLUMNS: tuple[str, ...] = (
+    'order_id', 'table_number', 'status', 'total_price', 'created_at', 'paid_at',
+    'item_id', 'item_name', 'item_price', 'quantity',
+)
+FIELDS: tuple[str, ...] = (
+    'id', 'table_number', 'status', 'total_price', 'created_at', 'paid_at',
+    'items__id', 'items__name', 'items__price', 'items__quantity',
+)
+
+CHUNK_SIZE: int = 2000  # Строк за одно обращение к курсору БД и в одном куске ответа
+
+
+def parse_range(params) -> tuple[datetime | None, datetime]:
+    """
+    🔹 Читает диапазон выгрузки `from`/`to` (YYYY-MM-DD, включительно) из параметров.
+
+    В отличие от `analytics.parse_range` длина диапазона не ограничена: выгрузка идет
+    потоком. Без `from` начало открыто (`None` — вся история), без `to` — по сегодня.
+    """
+    try:
+        end_day: date = date.fromisoformat(params['to']) if params.get('to') else timezone.localdate()
+        start_day: date | None = date.fromisoformat(params['from']) if params.get('from') else None
+    except ValueError:
+        raise serializers.ValidationError({"from": "Ожидаются даты в формате YYYY-MM-DD."})
+    if start_day is not None and start_day > end_day:
+        raise serializers.ValidationError({"from": "Начало диапазона позже конца."})
+
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(start_day, time.min, tzinfo=tz) if start_day is not None else None
+    return start, datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=tz)
+
+
+def export_rows(start: datetime | None, end: datetime, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    🔹 Строки "заказ × блюдо" (в порядке `FIELDS`) для заказов, созданных в `[start, end)`
+    (`start=None` — без нижней границы).
+
+    База (реплика или основная) выбирается сразу при вызове, а строки читаются лениво —
+    уже во время отправки ответа, когда запрос и его состояние маршрутизации завершены.
+    """
+    bounds = {'created_at__lt': end} if start is None else {'created_at__gte': start, 'created_at__lt': end}
+    with read_from_replica():
+        querysets = [
+            queryset.using(queryset.db)
+            for queryset in (
+                model.objects.filter(**bounds)
+                .order_by('id', 'items__id')
+                .values_list(*FIELDS)
+                for model in (ArchivedOrder, Order)
+            )
+        ]
+    return chain.from_iterable(queryset.iterator(chunk_size=chunk_size) for queryset in querysets)
+
+
+def _timestamp(value: datetime | None, tz: tzinfo) -> str:
+    return value.astimezone(tz).isoformat() if value is not None else ''
+
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def stream_csv(rows: Iterator[tuple], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """📄 CSV с заголовком; каждый кусок — до `chunk_size` строк."""
+    tz = timezone.get_current_timezone()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    yield buffer.getvalue()
+    order_id, order_columns = None, ()
+    while batch := list(islice(rows, chunk_size)):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            if row[0] != order_id:
+                # Колонки заказа одинаковы для всех его блюд — форматируются один раз
+                order_id = row[0]
+                order_columns = (*row[:4], _timestamp(row[4], tz), _timestamp(row[5], tz))
+            writer.writerow((*order_columns, *(_text(value) for value in row[6:])))
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows: Iterator[tuple], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    📄 NDJSON: одна строка — один заказ с блюдами (как `GET /api/orders/{id}/` плюс `created_at`/`paid_at`).
+
+    Строки одного заказа идут подряд (сортировка по ID), поэтому заказ собирается
+    `groupby` без накопления; каждый кусок — до `chunk_size` заказов.
+    """
+    tz = timezone.get_current_timezone()
+    lines: list[str] = []
+    for order_id, group in groupby(rows, key=itemgetter(0)):
+        first = next(group)
+        items = [
+            {"id": row[6], "name": row[7], "price": str(row[8]), "quantity": row[9]}
+            for row in (first, *group) if row[6] is not None
+        ]
+        lines.append(json.dumps({
+            "id": order_id,
+            "table_number": first[1],
+            "status": first[2],
+            "total_price": str(first[3]),
+            "created_at": _timestamp(first[4], tz),
+            "paid_at": _timestamp(first[5], tz) or None,
+            "items": items,
+        }, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+STREAMS: dict[str, Callable[[Iterator[tuple], int], Iterator[str]]] = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
+
+
+def stream_export(
+    export_format: str, start: datetime | None, end: datetime, chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """🔹 Выгрузка в формате `csv` или `ndjson` (ключи `FORMATS`) кусками текста."""
+    return STREAMS[export_format](export_rows(start, end, chunk_size), chunk_size)
@@ -0,0 +1,55 @@
+from collections.abc import AsyncIterator, Iterator
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import serializers
+
+from . import export
+
+
+async def _async_chunks(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """
+    Отдает синхронный поток кусками под ASGI.
+
+    Синхронный итератор ASGI-обработчик Django сначала целиком собирает в список;
+    здесь каждый кусок читается отдельно в потоке ORM (`thread_sensitive`), где открыт курсор БД.
+    """
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+@require_GET
+def order_export(request: HttpRequest) -> HttpResponse:
+    """
+    📤 Выгрузка заказов с блюдами (`GET /api/orders/export/?format=csv|ndjson&from=&to=`).
+
+    - ✅ `from`/`to` — даты создания заказов (YYYY-MM-DD, включительно); длина диапазона
+      не ограничена, без `from` выгружается вся история до `to`
+    - ✅ Ответ передается потоком, память сервера не зависит от размера диапазона
+    """
+    export_format: str = request.GET.get('format', 'csv')
+    if export_format not in export.FORMATS:
+        return JsonResponse({"format": f"Допустимые значения: {', '.join(export.FORMATS)}."}, status=400)
+    try:
+        start, end = export.parse_range(request.GET)
+    except serializers.ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+
+    chunks = export.stream_export(export_format, start, end)
+    response = StreamingHttpResponse(
+        _async_chunks(chunks) if isinstance(request, ASGIRequest) else chunks,
+        content_type=export.FORMATS[export_format],
+    )
+    first = f'{start:%Y-%m-%d}' if start is not None else 'all'
+    response['Content-Disposition'] = (
+        f'attachment; filename="orders-{first}-{end - timedelta(days=1):%Y-%m-%d}.{export_format}"'
+    )
+    response['X-Accel-Buffering'] = 'no'
+    return response
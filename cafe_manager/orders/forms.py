@@ -17,9 +17,25 @@ class OrderForm(forms.ModelForm):
         fields: list[str] = ['table_number', 'status']
 
 
+class OrderItemForm(forms.ModelForm):
+    """
+    Форма одного блюда заказа (строка формсета или отдельная строка на странице заказа).
+
+    Поля формы:
+    - 🔹 `name` (str) — название блюда.
+    - 🔹 `price` (Decimal) — цена за единицу.
+    - 🔹 `quantity` (int) — количество.
+    """
+
+    class Meta:
+        model: type[OrderItem] = OrderItem
+        fields: list[str] = ['name', 'price', 'quantity']
+
+
 # ✅ Формсет для блюд, входящих в заказ
 OrderItemFormSet: type = inlineformset_factory(
     Order, OrderItem,
+    form=OrderItemForm,
     fields=['name', 'price', 'quantity'],
     extra=1,  # Отображаем 1 пустое поле для добавления нового блюда
     can_delete=True  # Галочка Delete для удаления отдельного блюда в заказе
@@ -0,0 +1,219 @@
+"""
+Массовый импорт заказов с блюдами из CSV или NDJSON (форматы `orders.export`).
+
+Файл читается потоком, заказы проверяются и загружаются пакетами: на пакет —
+два `bulk_create` (заказы, затем блюда) и обновление сводки выручки, все в одной
+транзакции. Сумма заказа считается при разборе, поэтому после вставки
+пересчитывать ничего не нужно. ID из файла не сохраняются: заказы получают новые ID.
+
+Ход импорта (`OrderImport`) обновляется в транзакции пакета: после сбоя повторный
+запуск с тем же источником пропускает уже загруженные заказы и продолжает с
+первого незагруженного.
+"""
+import csv
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import groupby
+from typing import IO, Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Order, OrderImport, OrderItem, RevenueRollup
+
+STATUSES: frozenset[str] = frozenset(code for code, _ in Order.STATUS_CHOICES)
+MAX_PRICE: Decimal = Decimal("10000")       # `OrderItem.price`: max_digits=6, decimal_places=2
+MAX_TOTAL: Decimal = Decimal("100000000")   # `Order.total_price`: max_digits=10, decimal_places=2
+
+
+class InvalidOrder(ValueError):
+    """Заказ из файла не прошел проверку; `line` — номер строки файла, где он начинается."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"строка {line}: {message}")
+        self.line = line
+
+
+@dataclass
+class Progress:
+    """
+    Итог одного загруженного пакета.
+
+    Атрибуты:
+    - 🔹 `orders` / `items` — сколько заказов и блюд вставлено.
+    - 🔹 `invalid` — некорректные заказы, пропущенные в пакете (`skip_invalid`).
+    - 🔹 `done` — сколько заказов файла обработано с начала импорта (для продолжения).
+    """
+
+    orders: int
+    items: int
+    done: int
+    invalid: list[InvalidOrder] = field(default_factory=list)
+
+
+def read_csv(file: IO[str]) -> Iterator[tuple[int, dict]]:
+    """
+    Заказы из CSV выгрузки: строки одного заказа идут подряд с одинаковым `order_id`.
+
+    Возвращает `(номер строки, заказ)`; блюда — в ключе `items`.
+    """
+    reader = csv.DictReader(file)
+    if 'order_id' not in (reader.fieldnames or ()):
+        raise InvalidOrder(1, "в заголовке CSV нет колонки order_id")
+    rows = ((reader.line_num, row) for row in reader)
+    for _, group in groupby(rows, key=lambda numbered: numbered[1].get('order_id')):
+        line, first = next(group)
+        items = [
+            {'name': row['item_name'], 'price': row.get('item_price'), 'quantity': row.get('quantity')}
+            for _, row in ((line, first), *group) if row.get('item_name')
+        ]
+        yield line, {**first, 'items': items}
+
+
+def read_ndjson(file: IO[str]) -> Iterator[tuple[int, dict]]:
+    """Заказы из NDJSON: один JSON-объект на строку, блюда — в списке `items`."""
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            yield line, json.loads(text)
+        except ValueError:
+            yield line, None  # `build_order` отклонит строку как некорректную
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def _money(value: Any, limit: Decimal) -> Decimal:
+    price = Decimal(str(value))
+    if not price.is_finite() or price < 0 or price >= limit or price.as_tuple().exponent < -2:
+        raise InvalidOperation
+    return price.quantize(Decimal("0.01"))
+
+
+def _timestamp(value: Any) -> datetime | None:
+    if value in (None, ''):
+        return None
+    moment = datetime.fromisoformat(str(value))
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def build_order(line: int, data: dict, now: datetime) -> tuple[Order, list[OrderItem]]:
+    """
+    🔹 Проверяет заказ из файла и строит несохраненные `Order` и `OrderItem` с готовой суммой.
+
+    - ✅ `table_number` — положительное целое; `status` — из `Order.STATUS_CHOICES` (по умолчанию `pending`)
+    - ✅ Блюда: непустое `name` (до 100 символов), `price` ≥ 0 с копейками, `quantity` ≥ 1
+    - ✅ `created_at` по умолчанию — время импорта; у оплаченного без `paid_at` — время создания
+
+    Некорректный заказ → `InvalidOrder`.
+    """
+    if not isinstance(data, dict):
+        raise InvalidOrder(line, "ожидается JSON-объект заказа")
+    try:
+        table_number = int(data.get('table_number'))
+    except (TypeError, ValueError):
+        raise InvalidOrder(line, "table_number должен быть целым числом")
+    if table_number < 1:
+        raise InvalidOrder(line, "table_number должен быть положительным")
+
+    status = data.get('status') or 'pending'
+    if status not in STATUSES:
+        raise InvalidOrder(line, f"неизвестный статус {status!r}")
+
+    try:
+        created_at = _timestamp(data.get('created_at')) or now
+        paid_at = _timestamp(data.get('paid_at'))
+    except ValueError:
+        raise InvalidOrder(line, "даты ожидаются в формате ISO 8601")
+    paid_at = (paid_at or created_at) if status == 'paid' else None
+
+    raw_items = data.get('items') or []
+    if not isinstance(raw_items, list):
+        raise InvalidOrder(line, "items должен быть списком")
+    items: list[OrderItem] = []
+    total = Decimal("0.00")
+    for position, raw in enumerate(raw_items, 1):
+        name = str(raw.get('name') or '').strip() if isinstance(raw, dict) else ''
+        if not name or len(name) > 100:
+            raise InvalidOrder(line, f"блюдо {position}: название обязательно (до 100 символов)")
+        try:
+            price = _money(raw.get('price'), MAX_PRICE)
+        except (InvalidOperation, ValueError):
+            raise InvalidOrder(line, f"блюдо {position}: некорректная цена {raw.get('price')!r}")
+        try:
+            quantity = int(raw['quantity']) if raw.get('quantity') not in (None, '') else 1
+        except (TypeError, ValueError):
+            quantity = 0
+        if quantity < 1:
+            raise InvalidOrder(line, f"блюдо {position}: количество должно быть положительным целым")
+        items.append(OrderItem(name=name, price=price, quantity=quantity))
+        total += price * quantity
+    if total >= MAX_TOTAL:
+        raise InvalidOrder(line, "сумма заказа слишком велика")
+
+    order = Order(table_number=table_number, status=status, total_price=total, created_at=created_at, paid_at=paid_at)
+    return order, items
+
+
+def load_batch(checkpoint: OrderImport, batch: list[tuple[Order, list[OrderItem]]], done: int) -> int:
+    """Вставляет пакет заказов с блюдами и сдвигает счетчик импорта в одной транзакции; возвращает число блюд."""
+    orders = [order for order, _ in batch]
+    items: list[OrderItem] = []
+    with transaction.atomic():
+        Order.objects.bulk_create(orders)
+        for order, order_items in batch:
+            for item in order_items:
+                item.order = order
+            items.extend(order_items)
+        OrderItem.objects.bulk_create(items, batch_size=5000)
+        RevenueRollup.record_orders(orders)
+        OrderImport.objects.filter(pk=checkpoint.pk).update(orders_done=done)
+    return len(items)
+
+
+def import_orders(file: IO[str], file_format: str, source: str, batch_size: int = 1000,
+                  skip_invalid: bool = False, restart: bool = False) -> Iterator[Progress]:
+    """
+    🔹 Импортирует заказы из открытого файла пакетами по `batch_size`; после каждого пакета — `Progress`.
+
+    - 🔁 Продолжает импорт источника `source` с места остановки (`restart=True` — начать заново);
+      повторный запуск по дописанному файлу (журнал кассы) загрузит только новые заказы
+    - ⚠️ Некорректный заказ прерывает импорт (`InvalidOrder`); уже загруженные пакеты остаются,
+      а после исправления файла импорт продолжится с пакета, где была ошибка.
+      С `skip_invalid=True` такие заказы пропускаются и возвращаются в `Progress.invalid`.
+    """
+    checkpoint, _ = OrderImport.objects.get_or_create(source=source)
+    if restart:
+        checkpoint.orders_done, checkpoint.started_at = 0, timezone.now()
+    checkpoint.finished_at = None
+    checkpoint.save()
+    done = skip = checkpoint.orders_done
+    now = timezone.now()
+
+    batch: list[tuple[Order, list[OrderItem]]] = []
+    invalid: list[InvalidOrder] = []
+    position = 0
+    for position, (line, data) in enumerate(READERS[file_format](file), 1):
+        if position <= skip:
+            continue
+        try:
+            batch.append(build_order(line, data, now))
+        except InvalidOrder as exc:
+            if not skip_invalid:
+                raise
+            invalid.append(exc)
+        if position - done >= batch_size:
+            items = load_batch(checkpoint, batch, position)
+            yield Progress(orders=len(batch), items=items, done=position, invalid=invalid)
+            batch, invalid, done = [], [], position
+    if position > done:
+        items = load_batch(checkpoint, batch, position)
+        yield Progress(orders=len(batch), items=items, done=position, invalid=invalid)
+    OrderImport.objects.filter(pk=checkpoint.pk).update(finished_at=timezone.now())
@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from orders.archive import archivable_orders, archive_paid_orders, prune_tombstones
+
+
+class Command(BaseCommand):
+    """
+    Переносит оплаченные заказы старше заданного возраста в архивные таблицы.
+
+    - 🗄 `python manage.py archive_orders` — заказы, оплаченные раньше `settings.ORDERS_ARCHIVE_AFTER_DAYS` дней назад
+    - 🔍 `python manage.py archive_orders --dry-run` — только показать, сколько заказов будет перенесено
+    - ⏰ Рассчитана на запуск по расписанию (cron): повторный запуск продолжает с того, что осталось
+    - 🧹 Заодно удаляет отметки об удалении заказов старше `settings.ORDERS_TOMBSTONE_DAYS` дней
+    """
+
+    help = "Переносит оплаченные заказы (с блюдами) старше заданного возраста в архив."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--older-than-days', type=int, default=getattr(settings, 'ORDERS_ARCHIVE_AFTER_DAYS', 30),
+            help="Переносить заказы, оплаченные раньше указанного числа дней назад",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help="Заказов в одной транзакции")
+        parser.add_argument('--dry-run', action='store_true', help="Ничего не переносить, только посчитать")
+
+    def handle(self, *args, older_than_days: int, batch_size: int, dry_run: bool = False, **options) -> None:
+        if older_than_days < 0 or batch_size < 1:
+            raise CommandError("--older-than-days не может быть отрицательным, --batch-size должен быть положительным.")
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+
+        if dry_run:
+            self.stdout.write(f"Будет перенесено заказов: {archivable_orders(cutoff).count()} (оплачены до {cutoff:%Y-%m-%d %H:%M}).")
+            return
+
+        archived = 0
+        for ids in archive_paid_orders(cutoff, batch_size):
+            archived += len(ids)
+            self.stdout.write(f"Перенесено заказов: {archived} (последний ID {ids[-1]})")
+
+        self.stdout.write(self.style.SUCCESS(f"Перенесено в архив заказов: {archived}."))
+
+        tombstone_days: int = getattr(settings, 'ORDERS_TOMBSTONE_DAYS', 30)
+        pruned = prune_tombstones(timezone.now() - timedelta(days=tombstone_days))
+        if pruned:
+            self.stdout.write(f"Удалено отметок об удалении заказов старше {tombstone_days} дн.: {pruned}.")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders import schema
+
+
+class Command(BaseCommand):
+    """
+    Собирает схему OpenAPI в файл `settings.API_SCHEMA_FILE`.
+
+    - 📘 Файл хранится в репозитории и отдается как `/api/swagger.json` и `/api/swagger.yaml`
+    - 🩺 `--check` только сравнивает файл с текущими представлениями (код выхода 1 при расхождении, для CI)
+    """
+
+    help = "Собирает схему OpenAPI в файл API_SCHEMA_FILE (или проверяет его актуальность с --check)."
+    requires_system_checks: list = []  # Проверка `orders.W001` построила бы схему лишний раз
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--check', action='store_true', help="Не записывать файл, а проверить, что он актуален")
+
+    def handle(self, *args, **options) -> None:
+        if options['check']:
+            if schema.stored_schema() != schema.generate_schema():
+                raise CommandError(
+                    f"Схема API в {schema.schema_file()} устарела, выполните `python manage.py build_api_schema`."
+                )
+            self.stdout.write(self.style.SUCCESS("Схема API актуальна."))
+            return
+        path = schema.write_schema()
+        self.stdout.write(self.style.SUCCESS(f"Схема API записана в {path}"))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import F, Max, Min
+
+from orders.models import Order, RevenueRollup
+from orders.signals import order_changed
+
+
+class Command(BaseCommand):
+    """
+    Проверяет согласованность `Order.total_price` с суммой блюд.
+
+    - 🔍 `python manage.py check_order_totals` — находит заказы с расхождением
+    - 🛠 `python manage.py check_order_totals --fix` — пересчитывает их сумму на стороне БД
+      (и поправляет сводку выручки для оплаченных заказов)
+    """
+
+    help = "Находит (и с --fix исправляет) заказы, у которых total_price не совпадает с суммой блюд."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--fix', action='store_true', help="Исправить найденные расхождения")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Размер диапазона ID на один запрос")
+
+    def handle(self, *args, fix: bool = False, batch_size: int = 5000, **options) -> None:
+        bounds = Order.objects.aggregate(low=Min('id'), high=Max('id'))
+        if bounds['low'] is None:
+            self.stdout.write("Заказов нет.")
+            return
+
+        drifted = 0
+        for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+            batch = (
+                Order.objects.filter(id__gte=start, id__lt=start + batch_size)
+                .annotate(items_total=Order.items_total())
+                .exclude(total_price=F('items_total'))
+                .values_list('id', 'total_price', 'items_total', 'status', 'paid_at')
+            )
+            ids: list[int] = []
+            for order_id, stored, actual, status, paid_at in batch:
+                self.stdout.write(f"Заказ {order_id}: сохранено {stored}, по блюдам {actual}")
+                ids.append(order_id)
+                if fix and status == 'paid' and paid_at is not None:
+                    RevenueRollup.record(paid_at, actual - stored)
+            if fix and ids:
+                Order.objects.filter(id__in=ids).update(total_price=Order.items_total(), **Order.change_marks())
+                order_changed.send(sender=Order, order_ids=ids, statuses=None, action='updated')
+            drifted += len(ids)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Расхождений не найдено."))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f"Исправлено заказов: {drifted}."))
+        else:
+            self.stdout.write(self.style.WARNING(f"Заказов с расхождением: {drifted}. Запустите с --fix для исправления."))
@@ -0,0 +1,59 @@
+import functools
+import time
+from collections.abc import Iterator
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework import serializers
+
+from orders import export
+
+
+class Command(BaseCommand):
+    """
+    Выгружает заказы с блюдами в CSV или NDJSON потоком (как `GET /api/orders/export/`).
+
+    - 📤 `python manage.py export_orders --from 2025-01-01 --to 2025-03-31 --output orders.csv`
+    - 📄 `python manage.py export_orders --format ndjson > orders.ndjson` — без `--output` данные идут в stdout
+    - ⚡ Память не зависит от размера диапазона; в конце выводится число строк и строк в секунду
+    """
+
+    help = "Потоковая выгрузка заказов с блюдами (CSV или NDJSON) за диапазон дат создания."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--format', choices=list(export.FORMATS), default='csv', help="Формат выгрузки")
+        parser.add_argument('--from', dest='start', help="Начало диапазона (YYYY-MM-DD, по умолчанию — вся история)")
+        parser.add_argument('--to', dest='end', help="Конец диапазона включительно (YYYY-MM-DD, по умолчанию — сегодня)")
+        parser.add_argument('--output', help="Файл для выгрузки (по умолчанию stdout)")
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE, help="Строк за одно чтение курсора")
+
+    def handle(self, *args, format: str, start: str | None, end: str | None, output: str | None,
+               chunk_size: int, **options) -> None:
+        if chunk_size < 1:
+            raise CommandError("--chunk-size должен быть положительным.")
+        try:
+            range_start, range_end = export.parse_range({'from': start, 'to': end})
+        except serializers.ValidationError as exc:
+            raise CommandError(exc.detail['from'])
+
+        exported = 0
+
+        def counted(rows: Iterator[tuple]) -> Iterator[tuple]:
+            nonlocal exported
+            for row in rows:
+                exported += 1
+                yield row
+
+        started = time.perf_counter()
+        rows = counted(export.export_rows(range_start, range_end, chunk_size))
+        with open(output, 'w', encoding='utf-8', newline='') if output else nullcontext() as file:
+            write = file.write if file else functools.partial(self.stdout.write, ending='')
+            for chunk in export.STREAMS[format](rows, chunk_size):
+                write(chunk)
+        elapsed = time.perf_counter() - started
+
+        if options['verbosity'] > 0:
+            # Сводка — в stderr, если данные идут в stdout
+            (self.stdout if output else self.stderr).write(
+                f"Выгружено строк: {exported} за {elapsed:.2f} с ({exported / elapsed if elapsed else 0:.0f} строк/с)."
+            )
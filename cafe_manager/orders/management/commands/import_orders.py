@@ -0,0 +1,66 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from orders import cache, export
+from orders.imports import InvalidOrder, import_orders
+
+
+class Command(BaseCommand):
+    """
+    Массовый импорт заказов с блюдами из CSV или NDJSON (формат `export_orders`).
+
+    - ⚡ Файл читается потоком; заказы проверяются и вставляются пакетами через `bulk_create`
+    - 🔁 После сбоя повторный запуск продолжает с первого незагруженного пакета (`--restart` — с начала)
+    - 📊 В конце выводится число заказов, блюд и вставленных записей в секунду
+
+    Пример: `python manage.py import_orders journal.ndjson --batch-size 2000`
+    """
+
+    help = "Импортирует заказы с блюдами из CSV или NDJSON пакетами, с продолжением после сбоя."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help="Файл CSV или NDJSON")
+        parser.add_argument('--format', choices=list(export.FORMATS), help="Формат файла (по умолчанию — по расширению)")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Заказов в одной транзакции")
+        parser.add_argument('--source', help="Имя импорта для продолжения (по умолчанию — абсолютный путь к файлу)")
+        parser.add_argument('--skip-invalid', action='store_true', help="Пропускать некорректные заказы, а не останавливаться")
+        parser.add_argument('--restart', action='store_true', help="Начать импорт этого источника заново")
+
+    def handle(self, *args, path: str, format: str | None, batch_size: int, source: str | None,
+               skip_invalid: bool = False, restart: bool = False, **options) -> None:
+        if batch_size < 1:
+            raise CommandError("--batch-size должен быть положительным.")
+        file_format = format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        source = source or os.path.abspath(path)
+
+        started = time.perf_counter()
+        orders = items = invalid = 0
+        try:
+            with open(path, encoding='utf-8', newline='') as file:
+                for progress in import_orders(file, file_format, source, batch_size, skip_invalid, restart):
+                    orders += progress.orders
+                    items += progress.items
+                    invalid += len(progress.invalid)
+                    for error in progress.invalid:
+                        self.stderr.write(f"Пропущен заказ: {error}")
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f"Обработано заказов файла: {progress.done}")
+        except OSError as exc:
+            raise CommandError(f"Не удалось прочитать файл: {exc}")
+        except InvalidOrder as exc:
+            raise CommandError(
+                f"Некорректный заказ, {exc}. Загружено заказов: {orders}; "
+                f"после исправления файла повторный запуск продолжит с места остановки."
+            )
+        finally:
+            if orders:
+                cache.invalidate_orders([], None)
+
+        elapsed = time.perf_counter() - started
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Импортировано заказов: {orders}, блюд: {items}, пропущено некорректных: {invalid} "
+                f"за {elapsed:.1f} с ({(orders + items) / elapsed if elapsed else 0:.0f} записей/с)."
+            ))
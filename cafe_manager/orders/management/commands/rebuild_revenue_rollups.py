@@ -0,0 +1,52 @@
+from decimal import Decimal
+from itertools import chain
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+
+from orders import cache
+from orders.models import ArchivedOrder, Order, RevenueRollup
+
+
+class Command(BaseCommand):
+    """
+    Перестраивает сводку выручки `RevenueRollup` по истории оплаченных заказов.
+
+    - 🕒 Оплаченным заказам без `paid_at` (созданным до появления поля) проставляется `created_at`
+    - 📊 Заказы (рабочие и архивные) группируются по часу оплаты в БД, часы раскладываются по сменам из `settings.CAFE_SHIFTS`
+    - 🔁 Сводка заменяется целиком в одной транзакции
+    """
+
+    help = "Перестраивает сводку выручки по дням и сменам из истории оплаченных заказов."
+
+    @staticmethod
+    def hourly(model: type[Order | ArchivedOrder]):
+        """Выручка и число оплаченных заказов таблицы `model` по часам оплаты."""
+        return (
+            model.objects.filter(status='paid')
+            .annotate(hour=TruncHour('paid_at'))
+            .values('hour')
+            .annotate(revenue=Sum('total_price'), orders=Count('id'))
+            .order_by()
+        )
+
+    def handle(self, *args, **options) -> None:
+        with transaction.atomic():
+            filled = Order.objects.filter(status='paid', paid_at__isnull=True).update(paid_at=F('created_at'))
+            if filled:
+                self.stdout.write(f"Проставлено paid_at для заказов: {filled}")
+
+            rollups: dict[tuple, RevenueRollup] = {}
+            for row in chain.from_iterable(self.hourly(model) for model in (Order, ArchivedOrder)):
+                day, shift = RevenueRollup.bucket_for(row['hour'])
+                rollup = rollups.setdefault((day, shift), RevenueRollup(day=day, shift=shift, revenue=Decimal("0.00")))
+                rollup.revenue += row['revenue']
+                rollup.orders_count += row['orders']
+
+            RevenueRollup.objects.all().delete()
+            RevenueRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+        cache.invalidate_revenue()
+
+        self.stdout.write(self.style.SUCCESS(f"Строк сводки выручки: {len(rollups)}."))
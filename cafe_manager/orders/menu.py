@@ -0,0 +1,105 @@
+"""
+Снимок меню в памяти процесса.
+
+Меню меняется редко, а читается на каждом заказе, поэтому каждый процесс
+держит у себя снимок активных блюд (`MenuSnapshot`). Актуальность снимка
+проверяется по версии меню в БД (`MenuVersion`, одна строка): версия
+увеличивается в транзакции сохранения/удаления `MenuItem`, поэтому она общая
+для всех процессов, как и `ETag` меню.
+
+- ⚡ Версия сверяется не чаще раза в `MENU_VERSION_CHECK_SECONDS` секунд (запрос по
+  первичному ключу), снимок перечитывается из БД только после ее смены
+- 📌 Процесс, изменивший меню, перечитывает снимок сразу; остальные — не позже
+  чем через `MENU_VERSION_CHECK_SECONDS` секунд
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_snapshot: 'MenuSnapshot | None' = None
+_checked_at: float = 0.0
+
+
+@dataclass(frozen=True)
+class MenuEntry:
+    """Блюдо из снимка меню."""
+
+    id: int
+    name: str
+    price: Decimal
+
+
+@dataclass(frozen=True)
+class MenuSnapshot:
+    """
+    Снимок активного меню.
+
+    Атрибуты:
+    - 🔹 `version` (int) — версия меню, по которой построен снимок.
+    - 🔹 `items` (dict) — блюда по ID.
+    - 🔹 `payload` (list) — готовое представление меню для `GET /api/menu/`.
+    """
+
+    version: int
+    items: dict[int, MenuEntry] = field(default_factory=dict)
+    payload: list[dict] = field(default_factory=list)
+
+    @property
+    def etag(self) -> str:
+        return f'"menu-{self.version}"'
+
+    def get(self, menu_item_id: int) -> MenuEntry | None:
+        return self.items.get(menu_item_id)
+
+
+def _load(version: int) -> MenuSnapshot:
+    """Читает активные блюда из БД одним запросом."""
+    from .models import MenuItem
+
+    rows = MenuItem.objects.filter(is_active=True).order_by('name').values_list('id', 'name', 'price')
+    items = {pk: MenuEntry(id=pk, name=name, price=price) for pk, name, price in rows}
+    payload = [{'id': entry.id, 'name': entry.name, 'price': str(entry.price)} for entry in items.values()]
+    return MenuSnapshot(version=version, items=items, payload=payload)
+
+
+def _check_interval() -> float:
+    return getattr(settings, 'MENU_VERSION_CHECK_SECONDS', 5)
+
+
+def get_snapshot() -> MenuSnapshot:
+    """🔹 Возвращает актуальный снимок меню, перечитывая его только при смене версии в БД."""
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < _check_interval():
+        return snapshot
+    from .models import MenuVersion
+
+    with _lock:
+        version = MenuVersion.current()
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = _load(version)
+        _checked_at = time.monotonic()
+        return _snapshot
+
+
+def invalidate_menu() -> None:
+    """
+    Увеличивает версию меню в БД (в текущей транзакции) и сбрасывает снимок процесса.
+
+    Остальные процессы увидят новую версию при следующей сверке.
+    """
+    from .models import MenuVersion
+
+    MenuVersion.bump()
+    reset_snapshot()
+
+
+def reset_snapshot() -> None:
+    """Сбрасывает снимок текущего процесса (он будет перечитан при следующем обращении)."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
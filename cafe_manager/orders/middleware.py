@@ -0,0 +1,228 @@
+"""
+Middleware заказов.
+
+Метрики запросов (`RequestMetricsMiddleware`): число SQL-запросов, время SQL и
+представления, повторяющиеся запросы.
+
+Метрики собираются оберткой `execute_wrappers` соединений (работает и без `DEBUG`,
+SQL не копируется в `connection.queries`). Соединения у каждого потока свои, а под
+ASGI представление выполняется не в потоке event loop, поэтому обертка читает
+счетчики текущего запроса из `ContextVar` (он переходит в `sync_to_async`) и
+подключается в том потоке, где работает ORM. Метрики отдаются заголовком `Server-Timing`
+(видно во вкладке Network браузера) и пишутся одной JSON-строкой в логгер
+`orders.requests`. Медленные запросы и запросы с повторяющимся SQL (признак N+1)
+логируются с уровнем `WARNING` вместе с самыми тяжелыми SQL-шаблонами.
+
+Настройки:
+- `REQUEST_SLOW_MS` — порог медленного запроса в мс (по умолчанию 500);
+- `REQUEST_DUPLICATE_QUERY_THRESHOLD` — сколько раз должен повториться один SQL,
+  чтобы считаться дублем (по умолчанию 5);
+- `REQUEST_SLOW_SQL_LIMIT` — сколько SQL-шаблонов попадает в лог (по умолчанию 10).
+
+Закрепление за основной базой после записи (`ReplicaStickinessMiddleware`) — см. `orders.db_router`.
+"""
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from . import db_router
+
+logger = logging.getLogger('orders.requests')
+
+_current_metrics: ContextVar['RequestMetrics | None'] = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Счетчики одного HTTP-запроса.
+
+    Атрибуты:
+    - 🔹 `queries` (int) — число SQL-запросов (round trips).
+    - 🔹 `sql_ms` (float) — суммарное время SQL в мс.
+    - 🔹 `statements` (dict) — SQL-шаблон (без параметров) → `[число выполнений, время в мс]`.
+    """
+
+    def __init__(self) -> None:
+        self.queries: int = 0
+        self.sql_ms: float = 0.0
+        self.statements: dict[str, list] = {}
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        """Обертка `execute_wrapper`: замеряет время одного SQL-запроса."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.sql_ms += elapsed
+            statement = self.statements.get(sql)
+            if statement is None:
+                self.statements[sql] = [1, elapsed]
+            else:
+                statement[0] += 1
+                statement[1] += elapsed
+
+    @contextmanager
+    def capture(self) -> Iterator['RequestMetrics']:
+        """
+        Считает SQL всех настроенных баз данных на время блока.
+
+        📌 Учитываются соединения текущего потока и потоков `sync_to_async`, где
+        вызвана `install_wrappers()` (ее вызывает `RequestMetricsMiddleware` под ASGI).
+        """
+        install_wrappers()
+        token = _current_metrics.set(self)
+        try:
+            yield self
+        finally:
+            _current_metrics.reset(token)
+
+    def duplicates(self, threshold: int) -> list[dict]:
+        """SQL-шаблоны, выполненные не меньше `threshold` раз (по убыванию числа выполнений)."""
+        return [
+            {'sql': sql, 'count': count, 'ms': round(ms, 2)}
+            for sql, (count, ms) in sorted(self.statements.items(), key=lambda row: -row[1][0])
+            if count >= threshold
+        ]
+
+    def slowest(self, limit: int) -> list[dict]:
+        """Самые тяжелые SQL-шаблоны по суммарному времени."""
+        return [
+            {'sql': sql, 'count': count, 'ms': round(ms, 2)}
+            for sql, (count, ms) in sorted(self.statements.items(), key=lambda row: -row[1][1])[:limit]
+        ]
+
+
+def _dispatch(execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+    """Обертка соединения: передает SQL счетчикам текущего запроса, если они есть."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_wrappers() -> None:
+    """Подключает `_dispatch` к соединениям текущего потока (один раз на соединение)."""
+    for alias in connections:
+        wrappers = connections[alias].execute_wrappers
+        if _dispatch not in wrappers:
+            # В начало списка: `connection.execute_wrapper()` снимает свои обертки с конца
+            wrappers.insert(0, _dispatch)
+
+
+class RequestMetricsMiddleware:
+    """
+    🔹 Middleware метрик запроса (`Server-Timing` + структурированный лог).
+
+    - `db` — число SQL-запросов и их суммарное время
+    - `view` — время обработки запроса (представление и все middleware после этого)
+
+    Должен стоять первым в `MIDDLEWARE`, чтобы учитывать работу остальных middleware.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        with metrics.capture():
+            response = self.get_response(request)
+        self.finish(request, response, metrics, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        # Синхронные представления и ORM запроса работают в потоке thread-sensitive `sync_to_async`
+        await sync_to_async(install_wrappers)()
+        with metrics.capture():
+            response = await self.get_response(request)
+        self.finish(request, response, metrics, (time.perf_counter() - started) * 1000)
+        return response
+
+    @staticmethod
+    def finish(request: HttpRequest, response: HttpResponse, metrics: RequestMetrics, view_ms: float) -> None:
+        """Добавляет `Server-Timing` и пишет запись в лог."""
+        response['Server-Timing'] = (
+            f'db;dur={metrics.sql_ms:.1f};desc="{metrics.queries} queries", view;dur={view_ms:.1f}'
+        )
+
+        duplicates = metrics.duplicates(getattr(settings, 'REQUEST_DUPLICATE_QUERY_THRESHOLD', 5))
+        slow = view_ms >= getattr(settings, 'REQUEST_SLOW_MS', 500)
+        level = logging.WARNING if slow or duplicates else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+
+        record: dict[str, Any] = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view_ms': round(view_ms, 2),
+            'sql_ms': round(metrics.sql_ms, 2),
+            'queries': metrics.queries,
+        }
+        if duplicates:
+            record['duplicates'] = duplicates
+        if slow:
+            record['slow'] = True
+            record['sql'] = metrics.slowest(getattr(settings, 'REQUEST_SLOW_SQL_LIMIT', 10))
+        logger.log(level, json.dumps(record, ensure_ascii=False))
+
+
+class ReplicaStickinessMiddleware:
+    """
+    🔹 Read-your-writes для реплики БД.
+
+    Если запрос что-то записал, клиент получает cookie `db_primary` на
+    `REPLICA_STICKY_SECONDS` секунд, и пока она есть, его отчетные чтения
+    идут в основную базу, а не на отстающую реплику.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+    cookie_name: str = 'db_primary'
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+        with db_router.routing_state(pinned=self.cookie_name in request.COOKIES) as state:
+            response = self.get_response(request)
+        return self.finish(response, state)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with db_router.routing_state(pinned=self.cookie_name in request.COOKIES) as state:
+            response = await self.get_response(request)
+        return self.finish(response, state)
+
+    def finish(self, response: HttpResponse, state: db_router.RoutingState) -> HttpResponse:
+        if state.wrote and db_router.replica_alias() is not None:
+            response.set_cookie(
+                self.cookie_name, '1', max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+        return response
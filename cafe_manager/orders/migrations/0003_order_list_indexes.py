@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_remove_order_items_alter_order_total_price_orderitem'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', '-id'], name='order_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['table_number', '-id'], name='order_table_id_idx'),
+        ),
+    ]
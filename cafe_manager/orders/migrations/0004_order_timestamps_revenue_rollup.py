@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:36
+
+import django.utils.timezone
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Создан'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='paid_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Оплачен'),
+        ),
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('shift', models.CharField(max_length=20, verbose_name='Смена')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Выручка')),
+                ('orders_count', models.IntegerField(default=0, verbose_name='Оплаченных заказов')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'shift'), name='revenue_rollup_day_shift_uniq')],
+            },
+        ),
+    ]
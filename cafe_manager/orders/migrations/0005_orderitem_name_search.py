@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:42
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_order_timestamps_revenue_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderitem',
+            name='name_search',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('name'), output_field=models.CharField(max_length=100), verbose_name='Название для поиска'),
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['name_search'], name='orderitem_name_search_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_orderitem_name_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Название блюда')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Цена')),
+                ('is_active', models.BooleanField(default=True, verbose_name='В меню')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='orderitem',
+            name='menu_item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='order_items', to='orders.menuitem', verbose_name='Блюдо меню'),
+        ),
+    ]
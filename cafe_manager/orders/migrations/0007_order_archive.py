@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_menu_item'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('table_number', models.IntegerField(verbose_name='Номер стола')),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Общая стоимость')),
+                ('status', models.CharField(choices=[('pending', 'В ожидании'), ('ready', 'Готово'), ('paid', 'Оплачено')], max_length=10, verbose_name='Статус')),
+                ('created_at', models.DateTimeField(verbose_name='Создан')),
+                ('paid_at', models.DateTimeField(db_index=True, verbose_name='Оплачен')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Перенесен в архив')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItem',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='Название блюда')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Цена')),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Количество')),
+                ('menu_item', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_items', to='orders.menuitem', verbose_name='Блюдо меню')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='orders.archivedorder')),
+            ],
+        ),
+    ]
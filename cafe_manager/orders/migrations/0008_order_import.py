@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True, verbose_name='Источник')),
+                ('orders_done', models.PositiveBigIntegerField(default=0, verbose_name='Обработано заказов')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Начат')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершен')),
+            ],
+        ),
+    ]
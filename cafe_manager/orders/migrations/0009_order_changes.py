@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:10
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def updated_from_created(apps, schema_editor):
+    """Существующие заказы считаем измененными в момент создания."""
+    Order = apps.get_model('orders', 'Order')
+    Order.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_order_import'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderTombstone',
+            fields=[
+                ('order_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID заказа')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Удален')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Изменен'),
+        ),
+        migrations.RunPython(updated_from_created, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['updated_at', 'id'], name='order_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ordertombstone',
+            index=models.Index(fields=['deleted_at', 'order_id'], name='tombstone_deleted_idx'),
+        ),
+    ]
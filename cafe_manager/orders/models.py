@@ -1,4 +1,10 @@
-from django.db import models
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Lower
+from django.utils import timezone
 from decimal import Decimal
 
 
@@ -10,6 +16,10 @@ class Order(models.Model):
     - 🔹 `table_number` (int) — номер стола, для которого оформлен заказ.
     - 🔹 `total_price` (Decimal) — общая стоимость заказа, пересчитывается автоматически.
     - 🔹 `status` (str) — статус заказа (`в ожидании`, `готово`, `оплачено`).
+    - 🔹 `created_at` (datetime) — время создания заказа.
+    - 🔹 `paid_at` (datetime | None) — время перехода в статус `оплачено`.
+    - 🔹 `updated_at` (datetime) — время последнего изменения заказа или его блюд (курсор синхронизации).
+    - 🔹 `version` (int) — номер версии, растет при каждом изменении заказа или его блюд (`ETag`).
     """
 
     STATUS_CHOICES: list[tuple[str, str]] = [
@@ -21,14 +31,173 @@ class Order(models.Model):
     table_number: models.IntegerField = models.IntegerField(verbose_name="Номер стола")
     total_price: models.DecimalField = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"), verbose_name="Общая стоимость")
     status: models.CharField = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="Статус заказа")
+    created_at: models.DateTimeField = models.DateTimeField(default=timezone.now, db_index=True, editable=False, verbose_name="Создан")
+    paid_at: models.DateTimeField = models.DateTimeField(null=True, blank=True, db_index=True, editable=False, verbose_name="Оплачен")
+    updated_at: models.DateTimeField = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Изменен")
+    version: models.PositiveIntegerField = models.PositiveIntegerField(default=1, editable=False, verbose_name="Версия")
+
+    class Meta:
+        indexes: list[models.Index] = [
+            models.Index(fields=['status', '-id'], name='order_status_id_idx'),
+            models.Index(fields=['table_number', '-id'], name='order_table_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='order_updated_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"Заказ {self.id} (Стол {self.table_number})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> 'Order':
+        """Запоминает статус и вклад заказа в выручку на момент загрузки (для инкрементальных сводок)."""
+        instance = super().from_db(db, field_names, values)
+        instance._remember_saved_state()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """Перечитывает заказ из БД и обновляет запомненные статус и вклад в выручку."""
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_saved_state()
+
+    def _remember_saved_state(self) -> None:
+        """Запоминает `status` и `revenue_share()` в том виде, в каком они сохранены в БД."""
+        if not self.get_deferred_fields() & {'status', 'total_price', 'paid_at'}:
+            self._saved_status = self.status
+            self._saved_revenue = self.revenue_share()
+
+    def revenue_share(self) -> tuple[datetime, Decimal] | None:
+        """Возвращает `(paid_at, total_price)` для оплаченного заказа, иначе `None`."""
+        if self.status == 'paid' and self.paid_at is not None:
+            return self.paid_at, Decimal(self.total_price)
+        return None
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Сохраняет заказ, проставляя `paid_at` при переходе в статус `оплачено` и `updated_at`,
+        и инкрементально обновляет сводку выручки (`RevenueRollup`).
+
+        📌 Версия увеличивается от загруженной: параллельные правки одного заказа должны
+        идти под блокировкой строки или условным `UPDATE` по версии (так делает API).
+        """
+        self.updated_at = timezone.now()
+        extra_fields: set[str] = {'updated_at'}
+        if not self._state.adding:
+            self.version += 1
+            extra_fields.add('version')
+        if (self.status == 'paid') != (self.paid_at is not None):
+            self.paid_at = timezone.now() if self.status == 'paid' else None
+            extra_fields.add('paid_at')
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *extra_fields}
+
+        previous = getattr(self, '_saved_revenue', None)
+        super().save(*args, **kwargs)
+        RevenueRollup.apply_change(previous, self.revenue_share())
+        self._remember_saved_state()
+
     def calculate_total(self) -> None:
-        """Пересчитывает сумму заказа на основе стоимости блюд."""
-        self.total_price = sum(item.price * item.quantity for item in self.items.all())
-        self.save()
+        """
+        Пересчитывает сумму заказа на стороне БД.
+
+        Выполняет `UPDATE ... SET total_price = (SELECT SUM(price * quantity) ...)`:
+        блюда не загружаются в Python, и записывается только `total_price`.
+        """
+        stored, actual, status, paid_at, version = (
+            Order.objects.filter(pk=self.pk)
+            .annotate(actual=Order.items_total())
+            .values_list('total_price', 'actual', 'status', 'paid_at', 'version')
+            .get()
+        )
+        Order.objects.filter(pk=self.pk).update(total_price=Order.items_total(), **Order.change_marks())
+        if status == 'paid' and paid_at is not None:
+            RevenueRollup.record(paid_at, actual - stored)
+        self.total_price = actual
+        self.version = version + 1
+        if hasattr(self, '_saved_revenue'):
+            self._remember_saved_state()
+
+    @staticmethod
+    def items_total() -> Coalesce:
+        """🔹 SQL-выражение суммы блюд заказа (`SUM(price * quantity)`, 0 для пустого заказа)."""
+        money = models.DecimalField(max_digits=10, decimal_places=2)
+        subtotal = (
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .values('order')
+            .annotate(total=Sum(F('price') * F('quantity'), output_field=money))
+            .values('total')
+        )
+        return Coalesce(Subquery(subtotal, output_field=money), Value(Decimal("0.00")), output_field=money)
+
+    @staticmethod
+    def change_marks() -> dict:
+        """🔹 Поля для `QuerySet.update()`, отмечающие изменение заказа: `updated_at` и `version + 1`."""
+        return {'updated_at': timezone.now(), 'version': F('version') + 1}
+
+    @staticmethod
+    def touch(order_ids: list[int]) -> None:
+        """🔹 Отмечает заказы измененными, например после правки блюда без изменения суммы."""
+        Order.objects.filter(pk__in=order_ids).update(**Order.change_marks())
+
+    @staticmethod
+    def adjust_total(order_id: int, delta: Decimal) -> None:
+        """🔹 Изменяет сумму заказа на `delta` атомарно в БД (`total_price = total_price + delta`) и отмечает изменение."""
+        if not delta:
+            Order.touch([order_id])
+            return
+        Order.objects.filter(pk=order_id).update(total_price=F('total_price') + delta, **Order.change_marks())
+        paid_at = Order.objects.filter(pk=order_id, status='paid').values_list('paid_at', flat=True).first()
+        if paid_at is not None:
+            RevenueRollup.record(paid_at, delta)
+
+
+class MenuItem(models.Model):
+    """
+    Блюдо из меню кафе.
+
+    Атрибуты:
+    - 🔹 `name` (str) — название блюда (уникальное).
+    - 🔹 `price` (Decimal) — текущая цена блюда.
+    - 🔹 `is_active` (bool) — доступно ли блюдо для заказа.
+    """
+
+    name: models.CharField = models.CharField(max_length=100, unique=True, verbose_name="Название блюда")
+    price: models.DecimalField = models.DecimalField(max_digits=6, decimal_places=2, verbose_name="Цена")
+    is_active: models.BooleanField = models.BooleanField(default=True, verbose_name="В меню")
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.price})"
+
+
+class MenuVersion(models.Model):
+    """
+    Версия меню — одна строка на всю базу, общая для всех процессов.
+
+    Увеличивается в той же транзакции, что и изменение `MenuItem`; процессы сверяют
+    с ней свой снимок меню (`orders.menu`), а `ETag` меню строится по ее значению.
+
+    Атрибуты:
+    - 🔹 `value` (int) — номер версии.
+    """
+
+    ROW_ID: int = 1
+
+    value: models.PositiveBigIntegerField = models.PositiveBigIntegerField(default=1, verbose_name="Версия меню")
+
+    def __str__(self) -> str:
+        return f"Меню v{self.value}"
+
+    @classmethod
+    def current(cls) -> int:
+        """🔹 Текущая версия одним запросом по первичному ключу (`0`, если строки еще нет)."""
+        return cls.objects.filter(pk=cls.ROW_ID).values_list('value', flat=True).first() or 0
+
+    @classmethod
+    def bump(cls) -> None:
+        """🔹 Увеличивает версию одним `UPDATE` (строка создается при первом изменении меню)."""
+        if not cls.objects.filter(pk=cls.ROW_ID).update(value=F('value') + 1):
+            cls.objects.bulk_create([cls(pk=cls.ROW_ID, value=1)], ignore_conflicts=True)
 
 
 class OrderItem(models.Model):
@@ -37,15 +206,288 @@ class OrderItem(models.Model):
 
     Атрибуты:
     - 🔹 `order` (ForeignKey) — ссылка на заказ, к которому относится блюдо.
-    - 🔹 `name` (str) — название блюда.
-    - 🔹 `price` (Decimal) — цена блюда за единицу.
+    - 🔹 `menu_item` (ForeignKey | None) — блюдо из меню (для позиций, введенных вручную, — `None`).
+    - 🔹 `name` (str) — название блюда на момент заказа.
+    - 🔹 `price` (Decimal) — цена блюда за единицу на момент заказа.
     - 🔹 `quantity` (int) — количество единиц блюда в заказе.
+    - 🔹 `name_search` (str) — `LOWER(name)`, вычисляется БД; индекс для поиска по префиксу.
     """
 
     order: models.ForeignKey = models.ForeignKey(Order, related_name="items", on_delete=models.CASCADE)
+    menu_item: models.ForeignKey = models.ForeignKey(MenuItem, related_name="order_items", null=True, blank=True, on_delete=models.SET_NULL, verbose_name="Блюдо меню")
+    name: models.CharField = models.CharField(max_length=100, verbose_name="Название блюда")
+    price: models.DecimalField = models.DecimalField(max_digits=6, decimal_places=2, verbose_name="Цена")
+    quantity: models.PositiveIntegerField = models.PositiveIntegerField(default=1, verbose_name="Количество")
+    name_search: models.GeneratedField = models.GeneratedField(
+        expression=Lower('name'),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+        verbose_name="Название для поиска",
+    )
+
+    class Meta:
+        indexes: list[models.Index] = [
+            # varchar_pattern_ops — чтобы `LIKE 'префикс%'` использовал индекс при любой локали PostgreSQL
+            models.Index(fields=['name_search'], name='orderitem_name_search_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} - {self.quantity} шт."
+
+    @classmethod
+    def from_db(cls, db, field_names, values) -> 'OrderItem':
+        """Запоминает загруженные из БД заказ и стоимость блюда для расчета разницы при сохранении."""
+        instance = super().from_db(db, field_names, values)
+        instance._saved_subtotal = instance._current_subtotal()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        """Перечитывает блюдо из БД и обновляет запомненную стоимость."""
+        super().refresh_from_db(*args, **kwargs)
+        self._saved_subtotal = self._current_subtotal()
+
+    def _current_subtotal(self) -> tuple[int, Decimal] | None:
+        """Возвращает `(order_id, price * quantity)` или `None`, если поля отложены (`defer`/`only`)."""
+        if self.get_deferred_fields() & {'order_id', 'price', 'quantity'}:
+            return None
+        return self.order_id, self.price * self.quantity
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Сохраняет блюдо и поддерживает `Order.total_price` инкрементально:
+        к сумме заказа прибавляется только разница стоимости блюда (`F()`-выражение).
+        """
+        previous = getattr(self, '_saved_subtotal', None)
+        # Блюдо не из БД, но с уже заданным ID (`OrderItem(id=...)`) может оказаться `UPDATE`
+        # существующей строки: ее прежняя стоимость тоже неизвестна
+        unknown_previous: bool = previous is None and (not self._state.adding or self.pk is not None)
+        super().save(*args, **kwargs)
+        current = self._current_subtotal()
+
+        if current is None or unknown_previous:
+            # Прежняя стоимость неизвестна — пересчитываем сумму заказа целиком (вместе со сводкой выручки)
+            Order(pk=self.order_id).calculate_total()
+        elif previous != current:
+            if previous is not None:
+                Order.adjust_total(previous[0], -previous[1])
+            Order.adjust_total(current[0], current[1])
+        else:
+            Order.touch([self.order_id])  # Изменились только название или ссылка на меню
+        self._saved_subtotal = current
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Удаляет блюдо и вычитает его стоимость из суммы заказа."""
+        subtotal = getattr(self, '_saved_subtotal', None) or self._current_subtotal()
+        result = super().delete(*args, **kwargs)
+        if subtotal is not None:
+            Order.adjust_total(subtotal[0], -subtotal[1])
+        else:
+            Order.touch([self.order_id])
+        return result
+
+
+class RevenueRollup(models.Model):
+    """
+    Предварительно агрегированная выручка по дням и сменам.
+
+    Строка обновляется инкрементально (`F()`-выражениями), когда заказ переходит
+    в статус `оплачено` или меняется сумма оплаченного заказа, поэтому выручка
+    за смену читается одной строкой, а не суммированием всех заказов.
+
+    Атрибуты:
+    - 🔹 `day` (date) — дата (по `TIME_ZONE`).
+    - 🔹 `shift` (str) — код смены из `settings.CAFE_SHIFTS`.
+    - 🔹 `revenue` (Decimal) — сумма оплаченных заказов.
+    - 🔹 `orders_count` (int) — количество оплаченных заказов.
+    """
+
+    day: models.DateField = models.DateField(verbose_name="День")
+    shift: models.CharField = models.CharField(max_length=20, verbose_name="Смена")
+    revenue: models.DecimalField = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), verbose_name="Выручка")
+    orders_count: models.IntegerField = models.IntegerField(default=0, verbose_name="Оплаченных заказов")
+
+    class Meta:
+        constraints: list[models.BaseConstraint] = [
+            models.UniqueConstraint(fields=['day', 'shift'], name='revenue_rollup_day_shift_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.shift}: {self.revenue}"
+
+    @staticmethod
+    def bucket_for(moment: datetime) -> tuple[date, str]:
+        """🔹 Определяет `(день, смена)` для момента времени по `settings.CAFE_SHIFTS`."""
+        local = timezone.localtime(moment)
+        shift = settings.CAFE_SHIFTS[0][0]
+        for code, start_hour in settings.CAFE_SHIFTS:
+            if local.hour >= start_hour:
+                shift = code
+        return local.date(), shift
+
+    @classmethod
+    def record(cls, moment: datetime, revenue: Decimal, orders: int = 0) -> None:
+        """🔹 Прибавляет выручку и число заказов к строке смены, в которую попадает `moment`."""
+        if not revenue and not orders:
+            return
+        cls._add(*cls.bucket_for(moment), revenue, orders)
+
+    @classmethod
+    def _add(cls, day: date, shift: str, revenue: Decimal, orders: int) -> None:
+        changes = {'revenue': F('revenue') + revenue, 'orders_count': F('orders_count') + orders}
+        if cls.objects.filter(day=day, shift=shift).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(day=day, shift=shift, revenue=revenue, orders_count=orders)
+        except IntegrityError:
+            # Строку смены параллельно создал другой запрос — прибавляем к ней
+            cls.objects.filter(day=day, shift=shift).update(**changes)
+
+    @classmethod
+    def record_orders(cls, orders: list[Order]) -> None:
+        """
+        🔹 Добавляет в сводку только что созданные оплаченные заказы.
+
+        Несколько смен (массовая загрузка за много дней) обновляются пакетно: строки
+        смен блокируются одним `SELECT ... FOR UPDATE`, затем один `bulk_update` и один
+        `bulk_create` — вместо `UPDATE` на каждую смену.
+        """
+        buckets: dict[tuple[date, str], list] = {}
+        for order in orders:
+            share = order.revenue_share()
+            if share is not None:
+                bucket = buckets.setdefault(cls.bucket_for(share[0]), [Decimal("0.00"), 0])
+                bucket[0] += share[1]
+                bucket[1] += 1
+        if len(buckets) <= 1:
+            for (day, shift), (revenue, count) in buckets.items():
+                cls._add(day, shift, revenue, count)
+            return
+
+        with transaction.atomic():
+            existing = {
+                (row.day, row.shift): row
+                for row in cls.objects.select_for_update().filter(day__in={day for day, _ in buckets})
+            }
+            changed: list[RevenueRollup] = []
+            created: list[RevenueRollup] = []
+            for (day, shift), (revenue, count) in buckets.items():
+                row = existing.get((day, shift))
+                if row is None:
+                    created.append(cls(day=day, shift=shift, revenue=revenue, orders_count=count))
+                    continue
+                row.revenue += revenue
+                row.orders_count += count
+                changed.append(row)
+            cls.objects.bulk_update(changed, ['revenue', 'orders_count'], batch_size=500)
+            try:
+                with transaction.atomic():
+                    cls.objects.bulk_create(created)
+            except IntegrityError:
+                # Часть строк смен параллельно создали другие запросы — прибавляем к ним по одной
+                for row in created:
+                    cls._add(row.day, row.shift, row.revenue, row.orders_count)
+
+    @classmethod
+    def apply_change(cls, previous: tuple[datetime, Decimal] | None, current: tuple[datetime, Decimal] | None) -> None:
+        """🔹 Переносит изменение вклада заказа в выручку (`Order.revenue_share`) в сводку."""
+        if previous == current:
+            return
+        if previous and current and cls.bucket_for(previous[0]) == cls.bucket_for(current[0]):
+            cls.record(current[0], current[1] - previous[1])
+            return
+        if previous:
+            cls.record(previous[0], -previous[1], orders=-1)
+        if current:
+            cls.record(current[0], current[1], orders=1)
+
+
+class ArchivedOrder(models.Model):
+    """
+    Архивный (оплаченный и закрытый) заказ.
+
+    Заказы переносятся сюда из `Order` командой `archive_orders` с тем же `id`,
+    чтобы рабочие таблицы содержали только текущие заказы. Отчеты
+    (`orders.analytics`) читают обе таблицы.
+
+    Атрибуты:
+    - 🔹 `table_number`, `total_price`, `status`, `created_at`, `paid_at` — как у `Order`.
+    - 🔹 `archived_at` (datetime) — время переноса в архив.
+    """
+
+    id: models.BigIntegerField = models.BigIntegerField(primary_key=True)
+    table_number: models.IntegerField = models.IntegerField(verbose_name="Номер стола")
+    total_price: models.DecimalField = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Общая стоимость")
+    status: models.CharField = models.CharField(max_length=10, choices=Order.STATUS_CHOICES, verbose_name="Статус")
+    created_at: models.DateTimeField = models.DateTimeField(verbose_name="Создан")
+    paid_at: models.DateTimeField = models.DateTimeField(db_index=True, verbose_name="Оплачен")
+    archived_at: models.DateTimeField = models.DateTimeField(default=timezone.now, verbose_name="Перенесен в архив")
+
+    def __str__(self) -> str:
+        return f"Архивный заказ {self.id} (Стол {self.table_number})"
+
+
+class ArchivedOrderItem(models.Model):
+    """
+    Блюдо архивного заказа (перенесено из `OrderItem` с тем же `id`).
+
+    Атрибуты:
+    - 🔹 `order` (ForeignKey) — архивный заказ.
+    - 🔹 `menu_item`, `name`, `price`, `quantity` — как у `OrderItem`.
+    """
+
+    id: models.BigIntegerField = models.BigIntegerField(primary_key=True)
+    order: models.ForeignKey = models.ForeignKey(ArchivedOrder, related_name="items", on_delete=models.CASCADE)
+    menu_item: models.ForeignKey = models.ForeignKey(MenuItem, related_name="archived_items", null=True, blank=True, on_delete=models.SET_NULL, verbose_name="Блюдо меню")
     name: models.CharField = models.CharField(max_length=100, verbose_name="Название блюда")
     price: models.DecimalField = models.DecimalField(max_digits=6, decimal_places=2, verbose_name="Цена")
     quantity: models.PositiveIntegerField = models.PositiveIntegerField(default=1, verbose_name="Количество")
 
     def __str__(self) -> str:
         return f"{self.name} - {self.quantity} шт."
+
+
+class OrderImport(models.Model):
+    """
+    Ход массового импорта заказов (`import_orders`) для продолжения после сбоя.
+
+    Счетчик обновляется в той же транзакции, что и вставка пакета, поэтому после
+    сбоя повторный запуск пропускает ровно те заказы файла, которые уже загружены.
+
+    Атрибуты:
+    - 🔹 `source` (str) — источник импорта (по умолчанию — абсолютный путь к файлу).
+    - 🔹 `orders_done` (int) — сколько заказов файла обработано (загружено или пропущено как некорректные).
+    - 🔹 `finished_at` (datetime) — время завершения (`None`, пока импорт не закончен).
+    """
+
+    source: models.CharField = models.CharField(max_length=255, unique=True, verbose_name="Источник")
+    orders_done: models.PositiveBigIntegerField = models.PositiveBigIntegerField(default=0, verbose_name="Обработано заказов")
+    started_at: models.DateTimeField = models.DateTimeField(default=timezone.now, verbose_name="Начат")
+    finished_at: models.DateTimeField = models.DateTimeField(null=True, blank=True, verbose_name="Завершен")
+
+    def __str__(self) -> str:
+        return f"Импорт {self.source}: {self.orders_done}"
+
+
+class OrderTombstone(models.Model):
+    """
+    Отметка об удалении заказа для синхронизации планшетов (`GET /api/orders/changes/`).
+
+    Создается при удалении заказа и при переносе в архив (заказ пропадает из рабочего
+    списка); старые отметки удаляет `archive_orders` через `ORDERS_TOMBSTONE_DAYS` дней.
+
+    Атрибуты:
+    - 🔹 `order_id` (int) — ID удаленного заказа.
+    - 🔹 `deleted_at` (datetime) — время удаления.
+    """
+
+    order_id: models.BigIntegerField = models.BigIntegerField(primary_key=True, verbose_name="ID заказа")
+    deleted_at: models.DateTimeField = models.DateTimeField(default=timezone.now, verbose_name="Удален")
+
+    class Meta:
+        indexes: list[models.Index] = [
+            models.Index(fields=['deleted_at', 'order_id'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f"Удаленный заказ {self.order_id}"
@@ -0,0 +1,155 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import Http404
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+@dataclass
+class KeysetPage:
+    """
+    Страница keyset-пагинации (по курсору `id`, без OFFSET).
+
+    Атрибуты:
+    - 🔹 `object_list` (list) — объекты текущей страницы (по убыванию `id`).
+    - 🔹 `next_cursor` (int | None) — значение `after` для следующей (более старой) страницы.
+    - 🔹 `previous_cursor` (int | None) — значение `before` для предыдущей (более новой) страницы.
+    """
+
+    object_list: list = field(default_factory=list)
+    next_cursor: int | None = None
+    previous_cursor: int | None = None
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+
+def _parse_cursor(value: str | None) -> int | None:
+    """Преобразует значение курсора из GET-параметра в `int` (или `None`)."""
+    if value in (None, ''):
+        return None
+    try:
+        cursor = int(value)
+    except (TypeError, ValueError):
+        raise Http404("Некорректный курсор страницы.")
+    if cursor < 0:
+        raise Http404("Некорректный курсор страницы.")
+    return cursor
+
+
+def paginate_by_id(queryset: QuerySet, page_size: int, after: str | None = None, before: str | None = None) -> KeysetPage:
+    """
+    🔹 Keyset-пагинация по `(-id)`.
+
+    - `after=<id>` → записи с `id < after` (следующая, более старая страница).
+    - `before=<id>` → записи с `id > before` (предыдущая, более новая страница).
+
+    Выполняет один запрос (`LIMIT page_size + 1`) независимо от размера таблицы:
+    лишняя строка лишь сообщает, есть ли еще страница в этом направлении.
+    """
+    after_id, before_id = _parse_cursor(after), _parse_cursor(before)
+    rows = list(_keyset_queryset(queryset, page_size, after_id, before_id))
+    return _keyset_page(rows, page_size, after_id, before_id)
+
+
+async def apaginate_by_id(queryset: QuerySet, page_size: int, after: str | None = None, before: str | None = None) -> KeysetPage:
+    """🔹 Асинхронный вариант `paginate_by_id` (для асинхронных представлений)."""
+    after_id, before_id = _parse_cursor(after), _parse_cursor(before)
+    rows = [row async for row in _keyset_queryset(queryset, page_size, after_id, before_id)]
+    return _keyset_page(rows, page_size, after_id, before_id)
+
+
+def _keyset_queryset(queryset: QuerySet, page_size: int, after_id: int | None, before_id: int | None) -> QuerySet:
+    """Запрос страницы: на одну строку больше `page_size`, чтобы узнать, есть ли следующая."""
+    if before_id is not None:
+        return queryset.filter(id__gt=before_id).order_by('id')[:page_size + 1]
+    if after_id is not None:
+        queryset = queryset.filter(id__lt=after_id)
+    return queryset.order_by('-id')[:page_size + 1]
+
+
+def _keyset_page(rows: list, page_size: int, after_id: int | None, before_id: int | None) -> KeysetPage:
+    """Собирает страницу и курсоры из строк, полученных `_keyset_queryset`."""
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before_id is not None:
+        rows.reverse()
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=rows[-1].id if rows else None,
+            previous_cursor=rows[0].id if rows and has_more else None,
+        )
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=rows[-1].id if rows and has_more else None,
+        previous_cursor=rows[0].id if rows and after_id is not None else None,
+    )
+
+
+class OrderCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация API заказов (`?cursor=...`).
+
+    - 🔹 Сортировка по `-id` (первичный ключ) — страница выбирается через `WHERE id < ...`, без OFFSET.
+    - 🔹 Размер страницы можно уменьшить/увеличить через `?page_size=` (не более `max_page_size`).
+    """
+
+    ordering: str = '-id'
+    page_size: int = 50
+    page_size_query_param: str = 'page_size'
+    max_page_size: int = 500
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор админки с приблизительным числом строк для больших таблиц.
+
+    - 🔹 Без фильтров на PostgreSQL число строк берется из статистики планировщика
+      (`pg_class.reltuples`, обновляется `ANALYZE`/autovacuum) вместо `COUNT(*)` по всей таблице.
+    - 🔹 Если оценка меньше `exact_below` (или статистики нет), а также для отфильтрованных
+      списков и других СУБД считается точный `COUNT(*)`.
+    """
+
+    exact_below: int = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        estimate = self.estimated_count()
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
+
+    def estimated_count(self) -> int | None:
+        """Оценка числа строк таблицы по статистике PostgreSQL (`None`, если оценка неприменима)."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or queryset.query.where or queryset.query.distinct:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
@@ -0,0 +1,40 @@
+"""
+Компактный JSON-рендерер API на `orjson` (зависимость из `requirements.txt`).
+
+`orjson` кодирует словари, списки, строки и числа в C, без `json.JSONEncoder`
+на каждый объект. Типы, которые он не знает (`Decimal`, ленивые строки, а также
+даты — их `orjson` пропускает к нам, чтобы формат совпал с DRF), передаются
+кодировщику DRF, поэтому ответ совпадает с ответом `JSONRenderer`.
+
+Если `orjson` не установлен (запасной вариант), для запросов с отступами (`; indent=4`) и при
+нестандартных `UNICODE_JSON`/`COMPACT_JSON` используется обычный `JSONRenderer`.
+"""
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - запасной вариант, если пакет не установлен
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """🔹 `JSONRenderer` с кодированием через `orjson`, если он установлен."""
+
+    def render(self, data: Any, accepted_media_type: str | None = None, renderer_context: dict | None = None) -> bytes:
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or data is None or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        content = orjson.dumps(
+            data,
+            default=_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            # Как JSONRenderer: U+2028/U+2029 экранируются, чтобы ответ оставался корректным JavaScript
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
@@ -0,0 +1,64 @@
+"""
+Быстрое представление заказов для чтения (список и карточка API).
+
+`OrderSerializer` на каждое поле каждой строки вызывает механизм полей DRF
+(`to_representation`, `get_attribute`, квантование `DecimalField`), и на больших
+страницах это основная часть времени CPU. Для чтения это не нужно: строки
+берутся из БД через `.values()` (без создания моделей) и сразу собираются в
+словари той же схемы, что у `OrderSerializer`:
+
+- 🔹 заказ — `id`, `table_number`, `status`, `total_price` (строкой, как `DecimalField`), `items`, `version`;
+- 🔹 блюдо — `id`, `menu_item`, `name`, `price` (`Decimal`, как `coerce_to_string=False`), `quantity`.
+
+Блюда страницы читаются одним запросом `WHERE order_id IN (...)`, как `prefetch_related`.
+Запись (создание, PUT/PATCH) по-прежнему идет через `OrderSerializer`.
+"""
+from collections.abc import Iterable
+
+from django.db.models import QuerySet
+
+from .models import Order, OrderItem
+
+ORDER_FIELDS: tuple[str, ...] = ('id', 'table_number', 'status', 'total_price', 'version')
+ITEM_FIELDS: tuple[str, ...] = ('order_id', 'id', 'menu_item_id', 'name', 'price', 'quantity')
+
+
+def order_rows(queryset: QuerySet[Order]) -> QuerySet:
+    """🔹 Заказы строками `.values()` с полями представления (для пагинации до загрузки блюд)."""
+    return queryset.values(*ORDER_FIELDS)
+
+
+def with_items(rows: Iterable[dict]) -> list[dict]:
+    """
+    🔹 Собирает представления заказов из строк `order_rows`, добавляя блюда одним запросом.
+
+    Порядок заказов сохраняется, блюда каждого заказа — по возрастанию ID.
+    """
+    orders = [
+        {
+            'id': row['id'],
+            'table_number': row['table_number'],
+            'status': row['status'],
+            'total_price': str(row['total_price']),
+            'items': [],
+            'version': row['version'],
+        }
+        for row in rows
+    ]
+    if not orders:
+        return orders
+    by_id = {order['id']: order['items'] for order in orders}
+    item_rows = (
+        OrderItem.objects.filter(order_id__in=list(by_id)).order_by('id').values_list(*ITEM_FIELDS)
+    )
+    for order_id, item_id, menu_item_id, name, price, quantity in item_rows:
+        by_id[order_id].append(
+            {'id': item_id, 'menu_item': menu_item_id, 'name': name, 'price': price, 'quantity': quantity}
+        )
+    return orders
+
+
+def order_detail(order_id: int) -> dict | None:
+    """🔹 Представление одного заказа (`None`, если его нет)."""
+    orders = with_items(order_rows(Order.objects.filter(pk=order_id)))
+    return orders[0] if orders else None
@@ -0,0 +1,93 @@
+"""
+Собранная заранее схема OpenAPI (`/api/swagger.json`, `/api/swagger.yaml`).
+
+drf-yasg строит схему, обходя все представления и сериализаторы API, — на
+каждый запрос это дорого, а схему постоянно запрашивают генераторы клиентов и
+проверки шлюза. Поэтому схема собирается командой `build_api_schema` в файл
+`settings.API_SCHEMA_FILE` (хранится в репозитории вместе с кодом) и отдается
+как есть:
+
+- ⚡ Файл читается один раз на процесс; YAML получается из того же JSON
+- 🏷 `ETag` — хэш содержимого схемы: `If-None-Match` → `304`, `Cache-Control` — на
+  `API_SCHEMA_MAX_AGE` секунд
+- 🩺 Проверка `orders.W001` (`manage.py check`, `runserver`, `migrate`) сравнивает файл
+  со схемой текущих представлений и предупреждает, если его забыли пересобрать
+- 📌 Если файла нет, схема собирается один раз при первом запросе и хранится в памяти
+"""
+import functools
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, yaml_sane_dump
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+API_INFO: openapi.Info = openapi.Info(
+    title="Cafe Manager API",
+    default_version='v1',
+    description="API для управления заказами в кафе",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="support@cafe.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    """
+    Схема, готовая к отдаче.
+
+    Атрибуты:
+    - 🔹 `json` / `yaml` (bytes) — содержимое в двух форматах.
+    - 🔹 `etag` (str) — сильный `ETag` (хэш JSON).
+    """
+
+    json: bytes
+    yaml: bytes
+    etag: str
+
+
+def schema_file() -> Path:
+    """Путь к файлу собранной схемы (`settings.API_SCHEMA_FILE`)."""
+    return Path(settings.API_SCHEMA_FILE)
+
+
+def generate_schema() -> bytes:
+    """🔹 Строит схему по текущим представлениям API (JSON с отступами, как в файле)."""
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[], pretty=True).encode(schema)
+
+
+def write_schema() -> Path:
+    """🔹 Собирает схему и записывает ее в `API_SCHEMA_FILE`; сбрасывает загруженную в процесс копию."""
+    path = schema_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(generate_schema())
+    load_schema.cache_clear()
+    return path
+
+
+def stored_schema() -> bytes | None:
+    """Содержимое файла схемы (`None`, если файла нет)."""
+    try:
+        return schema_file().read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+@functools.cache
+def load_schema() -> SchemaArtifact:
+    """🔹 Схема для отдачи: из файла, а если его нет — собранная сейчас (один раз на процесс)."""
+    content = stored_schema()
+    if content is None:
+        content = generate_schema()
+    document = json.loads(content, object_pairs_hook=OrderedDict)
+    return SchemaArtifact(
+        json=content,
+        yaml=yaml_sane_dump(document, binary=True),
+        etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+    )
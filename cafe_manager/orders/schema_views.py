@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+
+from . import schema
+
+
+def _schema_response(request: HttpRequest, content: bytes, content_type: str) -> HttpResponse:
+    """Ответ со схемой, `ETag` и `Cache-Control`; при совпадении `If-None-Match` → `304` с теми же заголовками."""
+    artifact = schema.load_schema()
+    response = HttpResponse(content, content_type=content_type)
+    response['ETag'] = artifact.etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'API_SCHEMA_MAX_AGE', 86400))
+    return get_conditional_response(request, etag=artifact.etag, response=response)
+
+
+@require_GET
+def schema_json(request: HttpRequest) -> HttpResponse:
+    """📘 Собранная схема OpenAPI в JSON (`GET /api/swagger.json`)."""
+    return _schema_response(request, schema.load_schema().json, 'application/json; charset=utf-8')
+
+
+@require_GET
+def schema_yaml(request: HttpRequest) -> HttpResponse:
+    """📘 Та же схема в YAML (`GET /api/swagger.yaml`); `ETag` общий с JSON."""
+    return _schema_response(request, schema.load_schema().yaml, 'application/yaml; charset=utf-8')
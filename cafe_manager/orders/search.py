@@ -0,0 +1,47 @@
+"""
+Поиск заказов по номеру стола и названию блюда.
+
+Все условия построены так, чтобы использовать индексы:
+- 🔹 номер стола — точное совпадение или диапазон (`5`, `5-10`) по индексу `(table_number, id)`,
+  без приведения `IntegerField` к тексту;
+- 🔹 название блюда — поиск по префиксу в нормализованной колонке `OrderItem.name_search`
+  (`LOWER(name)`, индекс с `varchar_pattern_ops`), заказ подбирается через `EXISTS`.
+"""
+from django.db.models import Exists, OuterRef, QuerySet
+
+from .models import Order, OrderItem
+
+
+def parse_table_query(value: str) -> tuple[int, int]:
+    """
+    🔹 Разбирает номер стола (`"5"`) или диапазон (`"5-10"`) в пару `(от, до)` включительно.
+
+    Бросает `ValueError`, если значение не число и не диапазон чисел.
+    """
+    low, sep, high = value.strip().partition('-')
+    start = int(low)
+    end = int(high) if sep else start
+    if start > end:
+        raise ValueError(f"Некорректный диапазон столов: {value}")
+    return start, end
+
+
+def normalize_dish_name(value: str) -> str:
+    """Приводит название блюда к виду колонки `OrderItem.name_search`."""
+    return value.strip().lower()
+
+
+def filter_by_table(queryset: QuerySet[Order], value: str) -> QuerySet[Order]:
+    """Фильтрует заказы по номеру стола или диапазону номеров."""
+    start, end = parse_table_query(value)
+    if start == end:
+        return queryset.filter(table_number=start)
+    return queryset.filter(table_number__gte=start, table_number__lte=end)
+
+
+def filter_by_dish(queryset: QuerySet[Order], value: str) -> QuerySet[Order]:
+    """Оставляет заказы, в которых есть блюдо, название которого начинается с `value` (без учета регистра)."""
+    prefix = normalize_dish_name(value)
+    if not prefix:
+        return queryset
+    return queryset.filter(Exists(OrderItem.objects.filter(order=OuterRef('pk'), name_search__startswith=prefix)))
@@ -1,5 +1,11 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Order, OrderItem
+from . import menu
+from .models import Order, OrderItem, RevenueRollup
+from .signals import order_changed
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -8,19 +14,25 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
     Поля:
     - 🔹 `id` (int) — уникальный идентификатор блюда (необязателен при создании).
+    - 🔹 `menu_item` (int | None) — ID блюда из меню (название и цена берутся из меню, если не переданы).
     - 🔹 `name` (str) — название блюда (необязательно для `PATCH`).
     - 🔹 `price` (Decimal) — цена блюда за единицу (может быть `None` в `PATCH`).
     - 🔹 `quantity` (int) — количество единиц блюда (по умолчанию 1).
     """
 
-    price: serializers.DecimalField = serializers.DecimalField(max_digits=10, decimal_places=2, coerce_to_string=False, required=False)
-    name: serializers.CharField = serializers.CharField(required=False)  # ✅ `name` не обязателен для PATCH
-    quantity: serializers.IntegerField = serializers.IntegerField(required=False)
+    # ✅ Границы как у колонок `OrderItem`: ошибка ловится при валидации, а не `IntegrityError` на всю пачку
+    price: serializers.DecimalField = serializers.DecimalField(
+        max_digits=6, decimal_places=2, min_value=Decimal('0'), coerce_to_string=False, required=False
+    )
+    name: serializers.CharField = serializers.CharField(max_length=100, required=False)  # ✅ `name` не обязателен для PATCH
+    quantity: serializers.IntegerField = serializers.IntegerField(min_value=1, required=False)
     id: serializers.IntegerField = serializers.IntegerField(required=False)
+    # ✅ Обычное целое поле: блюдо проверяется по снимку меню, а не запросом на каждую строку
+    menu_item: serializers.IntegerField = serializers.IntegerField(source='menu_item_id', required=False, allow_null=True)
 
     class Meta:
         model = OrderItem
-        fields = ['id', 'name', 'price', 'quantity']
+        fields = ['id', 'menu_item', 'name', 'price', 'quantity']
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -33,71 +45,204 @@ class OrderSerializer(serializers.ModelSerializer):
     - 🔹 `status` (str) — статус заказа (`pending`, `ready`, `paid`).
     - 🔹 `total_price` (Decimal) — общая стоимость заказа (пересчитывается автоматически).
     - 🔹 `items` (list) — список блюд в заказе.
+    - 🔹 `version` (int) — версия заказа (только чтение; для `If-Match` используется `ETag`).
     """
 
     items: serializers.ListField = OrderItemSerializer(many=True)  # ✅ Вложенный сериализатор
 
     class Meta:
         model = Order
-        fields = ['id', 'table_number', 'status', 'total_price', 'items']
+        fields = ['id', 'table_number', 'status', 'total_price', 'items', 'version']
 
-    def create(self, validated_data: dict) -> Order:
+    def validate(self, attrs: dict) -> dict:
         """
-        🔹 Создает заказ и добавляет к нему блюда.
+        🔹 Блюда с `menu_item` проверяются по снимку меню: блюдо должно быть в меню,
+        а недостающие `name` и `price` заполняются из меню (цена фиксируется на момент заказа).
+
+        🔹 При создании заказа у каждого блюда обязательны `name` и `price`
+        (в `PATCH` они могут отсутствовать, поэтому поля объявлены необязательными).
         """
-        items_data: list[dict] = validated_data.pop('items', [])
-        order: Order = Order.objects.create(**validated_data)
+        self._apply_menu(attrs.get('items', []))
+        if self.instance is None:
+            for item in attrs.get('items', []):
+                if not item.get('name'):
+                    raise serializers.ValidationError({"name": "Name is required for new items."})
+                if item.get('price') is None:
+                    raise serializers.ValidationError({"price": "Price is required for new items."})
+        return attrs
+
+    @staticmethod
+    def _apply_menu(items: list[dict]) -> None:
+        """Заполняет `name`/`price` блюд из снимка меню (без запросов к БД, если меню не менялось)."""
+        menu_items = [item for item in items if item.get('menu_item_id') is not None]
+        if not menu_items:
+            return
+        snapshot = menu.get_snapshot()
+        for item in menu_items:
+            entry = snapshot.get(item['menu_item_id'])
+            if entry is None:
+                raise serializers.ValidationError({
+                    "items": f"Блюдо меню {item['menu_item_id']} не найдено или недоступно."
+                })
+            item.setdefault('name', entry.name)
+            if item.get('price') is None:
+                item['price'] = entry.price
+
+    @classmethod
+    def bulk_create(cls, orders_data: list[dict]) -> list[Order]:
+        """
+        🔹 Массово создает заказы с блюдами (уже провалидированные данные).
 
-        # ✅ Создаем блюда, связанные с этим заказом
-        for item in items_data:
-            OrderItem.objects.create(order=order, **item)
+        - ✅ Сумма заказа считается в памяти, без повторного чтения блюд
+        - ✅ Все заказы и все блюда пишутся двумя `bulk_create` в одной транзакции
+        - ✅ Оплаченные заказы сразу попадают в сводку выручки по сменам
+        """
+        orders: list[Order] = []
+        items_per_order: list[list[OrderItem]] = []
+
+        for data in orders_data:
+            data = dict(data)
+            items = [
+                OrderItem(**{key: val for key, val in item.items() if key != 'id'})
+                for item in data.pop('items', [])
+            ]
+            total = sum((item.price * item.quantity for item in items), Decimal("0.00"))
+            order = Order(total_price=total, **data)
+            if order.status == 'paid':
+                order.paid_at = timezone.now()
+            orders.append(order)
+            items_per_order.append(items)
+
+        with transaction.atomic():
+            Order.objects.bulk_create(orders, batch_size=500)
+            for order, items in zip(orders, items_per_order):
+                for item in items:
+                    item.order = order
+            OrderItem.objects.bulk_create(
+                [item for items in items_per_order for item in items], batch_size=500
+            )
+            RevenueRollup.record_orders(orders)
+        order_changed.send(
+            sender=Order,
+            order_ids=[order.id for order in orders],
+            statuses={order.status for order in orders},
+            action='created',
+        )
+        return orders
 
-        order.calculate_total()  # ✅ Пересчитываем сумму
-        return order
+    def create(self, validated_data: dict) -> Order:
+        """
+        🔹 Создает заказ и добавляет к нему блюда.
+
+        Сумма считается в памяти и записывается вместе с заказом,
+        блюда вставляются одним `bulk_create` (без повторного чтения).
+        """
+        return self.bulk_create([validated_data])[0]
 
-    def update(self, instance, validated_data):
-        """Обновление заказа через PUT (полная замена) и PATCH (частичное обновление)"""
+    def update(self, instance: Order, validated_data: dict) -> Order:
+        """
+        Обновление заказа через PUT (полная замена) и PATCH (частичное обновление).
+
+        Блюда обновляются по разнице между переданным и текущим набором:
+        - ✅ одним `bulk_update` для измененных блюд
+        - ✅ одним `bulk_create` для новых блюд (без `id`)
+        - ✅ одним `DELETE` для блюд, не переданных в PUT
+        Все изменения выполняются в `transaction.atomic` с блокировкой строки заказа,
+        поэтому число запросов не зависит от количества блюд. Если строку уже заблокировал
+        условный `UPDATE` по версии (`If-Match`, контекст `row_locked`), блокировка не повторяется.
+        """
         items_data = validated_data.pop('items', None)  # ✅ Извлекаем блюда, если переданы
-        print(f"🔍 Получен заказ {instance.id} с блюдами:")
         is_full_update = self.partial is False  # `False` → значит это `PUT`
 
+        with transaction.atomic():
+            if not self.context.get('row_locked'):
+                # 🔒 Блокируем заказ, чтобы параллельные правки блюд не перемешались,
+                # и берем актуальную версию (от нее `save()` отсчитает следующую)
+                instance.version = Order.objects.select_for_update().values_list('version', flat=True).get(pk=instance.pk)
 
-        # ✅ Если PUT, очищаем список блюд
-        if is_full_update and items_data is not None:
-            instance.items.all().delete()
-
-        # ✅ Обновляем основные поля заказа (номер стола, статус)
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        if items_data is not None:
-            existing_items = {item.id: item for item in instance.items.all()}  # 🔍 Собираем существующие блюда
-
-            for item_data in items_data:
-                item_id = item_data.get("id")
-
-                if item_id:
-                    # 🔥 Если блюдо с таким `id` нет в этом заказе → ошибка!
-                    if item_id not in existing_items:
-                        raise serializers.ValidationError({
-                            "items": f"Блюдо с id {item_id} не найдено в этом заказе."
-                        })
-
-                    # ✅ Если блюдо существует → обновляем только переданные поля
-                    item = existing_items[item_id]
-                    for key, val in item_data.items():
-                        if key != "id":  # Не обновляем `id`
-                            setattr(item, key, val)
-                    item.save()
-
-                elif not item_id:
-                    # ➕ Если `id` нет, это **НОВОЕ** блюдо → `name` и `price` обязательны
-                    if "name" not in item_data or not item_data["name"]:
-                        raise serializers.ValidationError({"name": "Name is required for new items."})
-                    if "price" not in item_data:
-                        raise serializers.ValidationError({"price": "Price is required for new items."})
-                    OrderItem.objects.create(order=instance, **item_data)
-
-        instance.calculate_total()  # ✅ Пересчитываем сумму заказа после обновления
-        return instance
\ No newline at end of file
+            # ✅ Обновляем основные поля заказа (номер стола, статус)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            update_fields: list[str] = list(validated_data)
+
+            if items_data is not None:
+                self._apply_items_diff(instance, items_data, is_full_update)
+                update_fields.append('total_price')
+
+            if update_fields:
+                instance.save(update_fields=update_fields)
+        return instance
+
+    @staticmethod
+    def _apply_items_diff(instance: Order, items_data: list[dict], is_full_update: bool) -> None:
+        """
+        🔹 Применяет изменения блюд заказа набором из трех запросов и считает сумму в памяти.
+
+        - Блюдо с `id` → обновляются только переданные поля (блюдо должно принадлежать заказу)
+        - Блюдо без `id` → создается (`name` и `price` обязательны)
+        - PUT → блюда, не упомянутые в запросе, удаляются
+        """
+        existing_items: dict[int, OrderItem] = {item.id: item for item in OrderItem.objects.filter(order=instance)}
+        to_update: dict[int, OrderItem] = {}
+        to_create: list[OrderItem] = []
+        changed_fields: set[str] = set()
+
+        for item_data in items_data:
+            item_id = item_data.get("id")
+
+            if item_id:
+                # 🔥 Если блюдо с таким `id` нет в этом заказе → ошибка!
+                if item_id not in existing_items:
+                    raise serializers.ValidationError({
+                        "items": f"Блюдо с id {item_id} не найдено в этом заказе."
+                    })
+
+                # ✅ Если блюдо существует → меняем только переданные поля
+                item = existing_items[item_id]
+                for key, val in item_data.items():
+                    if key != "id" and getattr(item, key) != val:
+                        setattr(item, key, val)
+                        changed_fields.add(key)
+                        to_update[item_id] = item
+            else:
+                # ➕ Если `id` нет, это **НОВОЕ** блюдо → `name` и `price` обязательны
+                if "name" not in item_data or not item_data["name"]:
+                    raise serializers.ValidationError({"name": "Name is required for new items."})
+                if "price" not in item_data:
+                    raise serializers.ValidationError({"price": "Price is required for new items."})
+                to_create.append(OrderItem(order=instance, **item_data))
+
+        kept_items: list[OrderItem] = list(existing_items.values())
+        if is_full_update:
+            # 🗑 PUT: удаляем блюда, которых нет в запросе
+            kept_ids = {item_data["id"] for item_data in items_data if item_data.get("id")}
+            removed_ids = [item_id for item_id in existing_items if item_id not in kept_ids]
+            if removed_ids:
+                OrderItem.objects.filter(order=instance, id__in=removed_ids).delete()
+            kept_items = [item for item in kept_items if item.id in kept_ids]
+
+        if to_update:
+            OrderItem.objects.bulk_update(list(to_update.values()), fields=sorted(changed_fields))
+        if to_create:
+            OrderItem.objects.bulk_create(to_create)
+
+        instance.total_price = sum(
+            (item.price * item.quantity for item in kept_items + to_create), Decimal("0.00")
+        )
+
+
+class RevenueRollupSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор строки сводки выручки.
+
+    Поля:
+    - 🔹 `shift` (str) — код смены.
+    - 🔹 `revenue` (Decimal) — выручка за смену.
+    - 🔹 `orders_count` (int) — количество оплаченных заказов.
+    """
+
+    revenue: serializers.DecimalField = serializers.DecimalField(max_digits=14, decimal_places=2, coerce_to_string=False)
+
+    class Meta:
+        model = RevenueRollup
+        fields = ['shift', 'revenue', 'orders_count']
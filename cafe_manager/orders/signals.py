@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import cache, events, menu
+from .models import MenuItem, Order, OrderItem, OrderTombstone, RevenueRollup
+
+# 🔹 Заказы изменились. Отправляется из `post_save`/`post_delete` заказов и блюд,
+# а также из массовых путей записи (`bulk_create`, `update()`), которые не вызывают `save()`.
+# Аргументы:
+# - `order_ids` (list[int]) — ID измененных заказов
+# - `statuses` (set[str] | None) — статусы до и после изменения (`None`, если неизвестны)
+# - `action` (str) — `created`, `updated`, `deleted` или `archived`
+# - `status`, `previous_status` (str, необязательно) — новый и прежний статус одного заказа
+order_changed = Signal()
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender: type[Order], instance: Order, created: bool, **kwargs) -> None:
+    """🔹 Сообщает об изменении заказа (статус до сохранения еще хранится в `_saved_status`)."""
+    previous_status: str = getattr(instance, '_saved_status', instance.status)
+    order_changed.send(
+        sender=Order,
+        order_ids=[instance.pk],
+        statuses={instance.status, previous_status},
+        action='created' if created else 'updated',
+        status=instance.status,
+        previous_status=previous_status,
+    )
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender: type[Order], instance: Order, **kwargs) -> None:
+    """🔹 Вычитает удаленный оплаченный заказ из сводки выручки, оставляет отметку для синхронизации и сообщает об удалении."""
+    RevenueRollup.apply_change(instance.revenue_share(), None)
+    OrderTombstone.objects.bulk_create([OrderTombstone(order_id=instance.pk)], ignore_conflicts=True)
+    order_changed.send(
+        sender=Order, order_ids=[instance.pk], statuses={instance.status}, action='deleted', status=instance.status
+    )
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def order_item_changed(sender: type[OrderItem], instance: OrderItem, **kwargs) -> None:
+    """🔹 Изменение блюда — это изменение его заказа (кроме каскадного удаления вместе с заказом)."""
+    if isinstance(kwargs.get('origin'), Order):
+        return
+    order_changed.send(sender=OrderItem, order_ids=[instance.order_id], statuses=None, action='updated')
+
+
+@receiver(order_changed)
+def invalidate_order_cache(sender: type, order_ids: list[int], statuses: set[str] | None, **kwargs) -> None:
+    """
+    🔹 Точечно инвалидирует кэш чтения заказов.
+
+    Инвалидация выполняется сразу и повторно после коммита транзакции: иначе
+    параллельный запрос мог бы успеть закэшировать данные до коммита.
+    """
+    cache.invalidate_orders(order_ids, statuses)
+    transaction.on_commit(lambda: cache.invalidate_orders(order_ids, statuses))
+
+
+@receiver(order_changed)
+def publish_order_event(sender: type, order_ids: list[int], action: str, **kwargs) -> None:
+    """🔹 Публикует событие в поток кухни/официантов после коммита транзакции."""
+    status: str | None = kwargs.get('status')
+    previous_status: str | None = kwargs.get('previous_status')
+    transaction.on_commit(lambda: events.publish_order_change(order_ids, action, status, previous_status))
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+def menu_item_changed(sender: type[MenuItem], instance: MenuItem, **kwargs) -> None:
+    """🔹 Увеличивает версию меню в той же транзакции; снимок процесса сбрасывается и после коммита."""
+    menu.invalidate_menu()
+    transaction.on_commit(menu.reset_snapshot)
@@ -0,0 +1,21 @@
+import pytest
+from django.core.cache import cache
+
+from orders import menu
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш и снимок меню общие для процесса — очищаем их, чтобы тесты не видели данные друг друга."""
+    cache.clear()
+    menu.reset_snapshot()
+    yield
+    cache.clear()
+    menu.reset_snapshot()
+
+
+@pytest.fixture(autouse=True)
+def primary_only(request, settings):
+    """Без маркера `replica` все чтения идут в основную базу, даже если реплика настроена."""
+    if request.node.get_closest_marker('replica') is None:
+        settings.DATABASE_REPLICA_ALIAS = None
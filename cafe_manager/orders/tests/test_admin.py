@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+
+from orders.models import Order, OrderItem, RevenueRollup
+from orders.pagination import EstimatedCountPaginator
+
+
+@pytest.fixture
+def admin_site_client(client, django_user_model):
+    client.force_login(django_user_model.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+    return client
+
+
+# Список блюд: заказ подгружается JOIN-ом, число запросов не растет с числом строк
+@pytest.mark.django_db
+@pytest.mark.parametrize('orders_count', [5, 50])
+def test_order_item_changelist_constant_queries(admin_site_client, django_assert_max_num_queries, orders_count):
+    orders = Order.objects.bulk_create(Order(table_number=1) for _ in range(orders_count))
+    OrderItem.objects.bulk_create(OrderItem(order=o, name='Tea', price=5) for o in orders)
+
+    with django_assert_max_num_queries(8):
+        response = admin_site_client.get('/admin/orders/orderitem/')
+    assert response.status_code == 200
+
+    order = orders[0]
+    response = admin_site_client.get(f'/admin/orders/order/{order.id}/change/')
+    assert response.status_code == 200 and b'items-TOTAL_FORMS' in response.content
+
+
+# Массовые действия: один UPDATE, заказы в другом статусе пропускаются, оплата попадает в сводку
+@pytest.mark.django_db
+def test_bulk_status_actions(admin_site_client):
+    pending = Order.objects.create(table_number=1)
+    ready = Order.objects.create(table_number=2, status='ready')
+    OrderItem.objects.create(order=ready, name='Cake', price=Decimal('12.50'), quantity=2)
+    selected = [pending.id, ready.id]
+
+    admin_site_client.post('/admin/orders/order/', {'action': 'mark_paid', ACTION_CHECKBOX_NAME: selected})
+    pending.refresh_from_db()
+    ready.refresh_from_db()
+    assert (pending.status, ready.status) == ('pending', 'paid')
+    assert ready.paid_at is not None
+    assert RevenueRollup.objects.get().revenue == Decimal('25.00')
+
+    admin_site_client.post('/admin/orders/order/', {'action': 'mark_ready', ACTION_CHECKBOX_NAME: selected})
+    assert Order.objects.get(pk=pending.id).status == 'ready'
+    assert Order.objects.get(pk=ready.id).status == 'paid'
+
+
+# Оценка по статистике — только для списка без фильтров на PostgreSQL, иначе точный COUNT(*)
+@pytest.mark.django_db
+def test_estimated_count_paginator(monkeypatch):
+    Order.objects.create(table_number=1)
+    assert EstimatedCountPaginator(Order.objects.filter(status='paid').order_by('-id'), 10).estimated_count() is None
+    assert EstimatedCountPaginator(Order.objects.order_by('-id'), 10).count == 1
+
+    monkeypatch.setattr(EstimatedCountPaginator, 'estimated_count', lambda self: 2_000_000)
+    assert EstimatedCountPaginator(Order.objects.order_by('-id'), 10).count == 2_000_000
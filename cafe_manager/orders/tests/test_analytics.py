@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from orders.api_views import AnalyticsAPIView
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def paid_orders():
+    """Три оплаченных заказа 2025-03-01 (два в 10:xx, один в 12:xx) и один неоплаченный."""
+    rows = [
+        (1, datetime(2025, 3, 1, 10, 5, tzinfo=timezone.utc), [('Кофе', 5, 2), ('Пирог', 12, 1)]),
+        (2, datetime(2025, 3, 1, 10, 40, tzinfo=timezone.utc), [('Кофе', 5, 1)]),
+        (1, datetime(2025, 3, 1, 12, 15, tzinfo=timezone.utc), [('Суп', 20, 1)]),
+    ]
+    for table, paid_at, items in rows:
+        order = Order.objects.create(table_number=table)
+        for name, price, quantity in items:
+            OrderItem.objects.create(order=order, name=name, price=price, quantity=quantity)
+        Order.objects.filter(pk=order.pk).update(status='paid', paid_at=paid_at)
+    pending = Order.objects.create(table_number=3)
+    OrderItem.objects.create(order=pending, name='Кофе', price=5, quantity=10)
+
+
+@pytest.mark.django_db
+def test_revenue_analytics_by_hour(paid_orders, django_assert_num_queries):
+    with django_assert_num_queries(4):  # заказы и блюда: рабочие и архивные таблицы
+        response = APIClient().get('/api/analytics/revenue/?from=2025-03-01&to=2025-03-01&bucket=hour')
+
+    assert response.status_code == 200
+    assert [(r['bucket'].hour, r['revenue'], r['orders_count'], r['items_count']) for r in response.data['results']] == [
+        (10, 27, 2, 4),
+        (12, 20, 1, 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_table_and_dish_analytics(paid_orders):
+    client = APIClient()
+    tables = client.get('/api/analytics/tables/?from=2025-03-01&to=2025-03-02').data['results']
+    dishes = client.get('/api/analytics/dishes/?from=2025-03-01&to=2025-03-02&limit=2').data['results']
+
+    assert [(t['table_number'], t['revenue'], t['orders_count']) for t in tables] == [(1, 42, 2), (2, 5, 1)]
+    assert [(d['name'], d['quantity_sold'], d['revenue']) for d in dishes] == [('Кофе', 3, 15), ('Пирог', 1, 12)]
+
+
+@pytest.mark.django_db
+def test_analytics_validates_params():
+    client = APIClient()
+    assert client.get('/api/analytics/revenue/?bucket=year').status_code == 400
+    assert client.get('/api/analytics/dishes/?limit=0').status_code == 400
+    assert client.get('/api/analytics/tables/?from=2025-03-02&to=2025-03-01').status_code == 400
+
+
+# Отчет без `compute` не создать: базовый класс аналитики абстрактный
+def test_analytics_view_requires_compute():
+    class Incomplete(AnalyticsAPIView):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,165 @@
+import pytest
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+# Список заказов: курсорная пагинация и постоянное число запросов
+@pytest.mark.django_db
+@pytest.mark.parametrize('orders_count', [10, 1_000])
+def test_order_list_api_constant_queries(api_client, django_assert_num_queries, orders_count):
+    orders = Order.objects.bulk_create(Order(table_number=1) for _ in range(orders_count))
+    OrderItem.objects.bulk_create(OrderItem(order=o, name='Чай', price=5, quantity=2) for o in orders)
+
+    with django_assert_num_queries(2):  # заказы + блюда (prefetch)
+        response = api_client.get('/api/orders/')
+
+    assert response.status_code == 200
+    assert len(response.data['results']) == min(orders_count, 50)
+    assert response.data['results'][0]['items'][0]['name'] == 'Чай'
+
+
+@pytest.mark.django_db
+def test_order_list_api_cursor_walks_all_pages(api_client):
+    ids = [Order.objects.create(table_number=1).id for _ in range(7)]
+    seen = []
+    url = '/api/orders/?page_size=3'
+    while url:
+        response = api_client.get(url)
+        seen += [o['id'] for o in response.data['results']]
+        url = response.data['next']
+    assert seen == ids[::-1]
+
+
+@pytest.mark.django_db
+def test_order_list_api_filters(api_client):
+    first = Order.objects.create(table_number=3, status='paid')
+    Order.objects.create(table_number=3, status='pending')
+    Order.objects.create(table_number=4, status='paid')
+    last = Order.objects.create(table_number=3, status='paid')
+
+    response = api_client.get(f'/api/orders/?status=paid&table=3&id_min={first.id}&id_max={last.id - 1}')
+
+    assert [o['id'] for o in response.data['results']] == [first.id]
+
+
+@pytest.mark.django_db
+def test_order_list_api_invalid_filter(api_client):
+    assert api_client.get('/api/orders/?table=abc').status_code == 400
+    assert api_client.get('/api/orders/?status=unknown').status_code == 400
+
+
+# Массовое создание заказов
+@pytest.mark.django_db
+def test_order_bulk_create(api_client, django_assert_max_num_queries):
+    payload = [
+        {'table_number': 1, 'items': [{'name': 'Чай', 'price': '5.00', 'quantity': 2}, {'name': 'Пирог', 'price': '12.50'}]},
+        {'table_number': 2, 'status': 'paid', 'items': []},
+    ] * 50
+
+    # savepoint + заказы + блюда + сводка выручки (update, savepoint, insert, release) + release
+    with django_assert_max_num_queries(8):
+        response = api_client.post('/api/orders/bulk/', payload, format='json')
+
+    assert response.status_code == 201
+    assert response.data['errors'] == []
+    assert Order.objects.count() == 100
+    assert OrderItem.objects.count() == 100
+    first = Order.objects.get(id=response.data['created'][0]['id'])
+    assert first.total_price == 22.5
+    assert first.items.count() == 2
+
+
+@pytest.mark.django_db
+def test_order_bulk_create_reports_errors_per_order(api_client):
+    payload = [
+        {'table_number': 1, 'items': [{'name': 'Чай', 'price': '5.00'}]},
+        {'items': []},
+        {'table_number': 3, 'items': [{'name': 'Кофе'}]},
+        {'table_number': 4, 'items': [{'name': 'Суп', 'price': '5.00', 'quantity': -3}]},
+        {'table_number': 5, 'items': [{'name': 'Торт', 'price': '12345.00'}]},
+    ]
+
+    response = api_client.post('/api/orders/bulk/', payload, format='json')
+
+    assert response.status_code == 207
+    assert [c['index'] for c in response.data['created']] == [0]
+    assert [e['index'] for e in response.data['errors']] == [1, 2, 3, 4]
+    assert 'table_number' in response.data['errors'][0]['errors']
+    assert Order.objects.count() == 1
+
+
+# Обновление заказа: набор блюд применяется по разнице, число запросов не зависит от числа блюд
+@pytest.mark.django_db
+@pytest.mark.parametrize('items_count', [2, 40])
+def test_order_partial_update_constant_queries(api_client, django_assert_num_queries, items_count):
+    order = Order.objects.create(table_number=1)
+    items = OrderItem.objects.bulk_create(
+        OrderItem(order=order, name=f'Блюдо {i}', price=10, quantity=1) for i in range(items_count)
+    )
+    payload = {'items': [{'id': item.id, 'quantity': 2} for item in items] + [{'name': 'Кофе', 'price': '4.50'}]}
+
+    # заказ, savepoint, блокировка, блюда, bulk_update, bulk_create, заказ, release, блюда для ответа
+    with django_assert_num_queries(9):
+        response = api_client.patch(f'/api/orders/{order.id}/', payload, format='json')
+
+    assert response.status_code == 200
+    order.refresh_from_db()
+    assert order.total_price == items_count * 20 + 4.5
+    assert order.items.count() == items_count + 1
+
+
+@pytest.mark.django_db
+def test_order_put_replaces_item_set(api_client):
+    order = Order.objects.create(table_number=1)
+    kept = OrderItem.objects.create(order=order, name='Паста', price=45, quantity=1)
+    OrderItem.objects.create(order=order, name='Кофе', price=22, quantity=1)
+
+    response = api_client.put(f'/api/orders/{order.id}/', {
+        'table_number': 12,
+        'status': 'paid',
+        'items': [{'id': kept.id, 'price': 40}, {'name': 'Чай', 'price': 5, 'quantity': 2}],
+    }, format='json')
+
+    assert response.status_code == 200
+    order.refresh_from_db()
+    assert (order.table_number, order.status, order.total_price) == (12, 'paid', 50)
+    assert sorted(order.items.values_list('name', flat=True)) == ['Паста', 'Чай']
+
+
+@pytest.mark.django_db
+def test_order_update_unknown_item_rolls_back(api_client):
+    order = Order.objects.create(table_number=1)
+    item = OrderItem.objects.create(order=order, name='Паста', price=45, quantity=1)
+
+    response = api_client.patch(f'/api/orders/{order.id}/', {
+        'table_number': 7,
+        'items': [{'id': item.id, 'quantity': 3}, {'id': item.id + 100, 'quantity': 1}],
+    }, format='json')
+
+    assert response.status_code == 400
+    order.refresh_from_db()
+    item.refresh_from_db()
+    assert (order.table_number, item.quantity) == (1, 1)
+
+
+# Выручка по сменам из сводки
+@pytest.mark.django_db
+def test_revenue_api(api_client, django_assert_num_queries):
+    Order.objects.create(table_number=1, status='paid', total_price=100)
+    Order.objects.create(table_number=2, status='paid', total_price=50)
+    Order.objects.create(table_number=3, status='pending', total_price=70)
+
+    with django_assert_num_queries(1):
+        response = api_client.get('/api/revenue/')
+
+    assert response.status_code == 200
+    assert (response.data['total'], response.data['orders_count']) == (150, 2)
+    assert response.data['shifts'][0]['shift'] == response.data['current_shift']
+    assert api_client.get('/api/revenue/?date=2000-01-01').data['total'] == 0
+    assert api_client.get('/api/revenue/?date=вчера').status_code == 400
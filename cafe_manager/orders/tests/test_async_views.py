@@ -0,0 +1,69 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+
+
+def _json(response) -> dict:
+    return json.loads(response.content)
+
+
+@pytest.fixture
+def orders():
+    created = []
+    for table in range(1, 6):
+        order = Order.objects.create(table_number=table)
+        OrderItem.objects.create(order=order, name='Soup', price=10, quantity=table)
+        created.append(order)
+    paid_at = datetime(2025, 3, 1, 10, 5, tzinfo=timezone.utc)
+    Order.objects.filter(pk__in=[created[0].pk, created[1].pk]).update(status='paid', paid_at=paid_at)
+    return created
+
+
+# Асинхронные чтения отвечают так же, как синхронный API
+@pytest.mark.django_db
+def test_async_list_matches_sync(client, orders, django_assert_num_queries):
+    sync = APIClient().get('/api/orders/?page_size=2&table=2-5').json()
+    with django_assert_num_queries(2):
+        response = client.get('/api/async/orders/?page_size=2&table=2-5')
+
+    assert response.status_code == 200
+    page = _json(response)
+    assert page['results'] == sync['results']
+    assert [o['id'] for o in page['results']] == [orders[4].id, orders[3].id]
+    assert page['next'].endswith(f'after={orders[3].id}') and page['previous'] is None
+
+    second = _json(client.get(page['next']))
+    assert [o['id'] for o in second['results']] == [orders[2].id, orders[1].id]
+
+
+@pytest.mark.django_db
+def test_async_list_validation(client):
+    assert client.get('/api/async/orders/?status=lost').status_code == 400
+    assert client.get('/api/async/orders/?after=x').status_code == 404
+    assert client.post('/api/async/orders/').status_code == 405
+
+
+@pytest.mark.django_db
+def test_async_detail_and_revenue(client, orders, django_assert_num_queries):
+    with django_assert_num_queries(3):  # версия (кэш процесса сверяется с БД), заказ, блюда
+        response = client.get(f'/api/async/orders/{orders[2].id}/')
+    assert _json(response) == APIClient().get(f'/api/orders/{orders[2].id}/').json()
+    assert client.get('/api/async/orders/999999/').status_code == 404
+
+    assert _json(client.get('/api/async/revenue/?date=2025-03-01')) == \
+        APIClient().get('/api/revenue/?date=2025-03-01').json()
+
+
+@pytest.mark.django_db
+def test_async_analytics_match_sync(client, orders):
+    query = '?from=2025-03-01&to=2025-03-01'
+    for path in ('analytics/revenue/', 'analytics/tables/', 'analytics/dishes/'):
+        response = client.get(f'/api/async/{path}{query}')
+        assert response.status_code == 200
+        assert _json(response) == APIClient().get(f'/api/{path}{query}').json()
+    assert _json(client.get(f'/api/async/analytics/tables/{query}'))['results'][0]['table_number'] == 2
+    assert client.get('/api/async/analytics/dishes/?limit=0').status_code == 400
@@ -0,0 +1,90 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders import cache
+from orders.models import Order, OrderItem
+
+
+# Страницы списка кэшируются по фильтру и точечно сбрасываются сигналами
+@pytest.mark.django_db
+def test_order_list_cache_invalidated_by_status(client, django_assert_num_queries):
+    pending = Order.objects.create(table_number=1, status='pending')
+    Order.objects.create(table_number=2, status='paid')
+    paid_url = reverse('order_list') + '?status=paid'
+
+    client.get(reverse('order_list'))
+    client.get(paid_url)
+    with django_assert_num_queries(0):
+        client.get(reverse('order_list'))
+        client.get(paid_url)
+
+    pending.table_number = 5
+    pending.save()  # pending → pending: страница status=paid остается в кэше
+    with django_assert_num_queries(0):
+        client.get(paid_url)
+    with django_assert_num_queries(2):
+        response = client.get(reverse('order_list'))
+    assert response.context['orders'][-1].table_number == 5
+
+    pending.status = 'paid'
+    pending.save()
+    with django_assert_num_queries(2):
+        response = client.get(paid_url)
+    assert len(response.context['orders']) == 2
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Общий для процессов бэкенд кэша (файловый вместо Redis) — карточка отдается без сверки с БД."""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                   'LOCATION': str(tmp_path)}}
+
+
+@pytest.mark.django_db
+def test_order_detail_cache_invalidated_by_item_change(shared_cache, django_assert_num_queries):
+    client = APIClient()
+    order = Order.objects.create(table_number=1)
+    item = OrderItem.objects.create(order=order, name='Чай', price=5, quantity=1)
+
+    client.get(f'/api/orders/{order.id}/')
+    with django_assert_num_queries(0):
+        assert client.get(f'/api/orders/{order.id}/').data['total_price'] == '5.00'
+
+    item.quantity = 3
+    item.save()
+    response = client.get(f'/api/orders/{order.id}/')
+    assert (response.data['total_price'], response.data['items'][0]['quantity']) == ('15.00', 3)
+
+
+# Локальный кэш процесса не видит инвалидацию из других процессов: карточка сверяется с версией в БД
+@pytest.mark.django_db
+def test_order_detail_local_cache_checks_version(django_assert_num_queries):
+    client = APIClient()
+    order = Order.objects.create(table_number=1)
+    client.get(f'/api/orders/{order.id}/')
+    with django_assert_num_queries(1):
+        assert client.get(f'/api/orders/{order.id}/').data['table_number'] == 1
+
+    # Запись в другом процессе: сигналы этого процесса не срабатывают
+    Order.objects.filter(pk=order.pk).update(table_number=7, **Order.change_marks())
+    response = client.get(f'/api/orders/{order.id}/', HTTP_IF_NONE_MATCH=f'"{order.id}.1"')
+    assert (response.status_code, response.data['table_number']) == (200, 7)
+    assert response['ETag'] == f'"{order.id}.2"'
+
+    Order.objects.filter(pk=order.pk).delete()
+    assert client.get(f'/api/orders/{order.id}/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_revenue_cache_and_stats(client, django_assert_num_queries):
+    cache.reset_stats()
+    client.get(reverse('revenue'))
+    with django_assert_num_queries(0):
+        client.get(reverse('revenue'))
+
+    Order.objects.create(table_number=1, status='paid', total_price=40)
+    assert b'40' in client.get(reverse('revenue')).content
+
+    stats = APIClient().get('/api/cache/stats/').data
+    assert (stats['revenue']['hits'], stats['revenue']['misses']) == (1, 2)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+
+URL = '/api/orders/changes/'
+
+
+@pytest.fixture(autouse=True)
+def no_overlap(settings):
+    settings.ORDERS_CHANGES_OVERLAP_SECONDS = 0
+
+
+@pytest.fixture
+def api():
+    return APIClient()
+
+
+@pytest.fixture
+def synced(api):
+    """Три заказа, уже полученные планшетом; возвращает заказы и курсор."""
+    orders = [Order.objects.create(table_number=table) for table in (1, 2, 3)]
+    OrderItem.objects.create(order=orders[0], name='Soup', price=10)
+    past = timezone.now() - timedelta(minutes=1)
+    Order.objects.update(updated_at=past)
+    body = api.get(URL).json()
+    assert [o['id'] for o in body['orders']] == [o.id for o in orders] and not body['has_more']
+    return orders, body['cursor']
+
+
+# После курсора приходят только измененные заказы, в том числе после правки блюда
+@pytest.mark.django_db
+def test_changes_return_only_modified_orders(api, synced, django_assert_num_queries):
+    orders, cursor = synced
+    item = orders[0].items.get()
+    item.name = 'Borscht'  # Сумма не меняется, но заказ изменен
+    item.save()
+    created = Order.objects.create(table_number=4)
+
+    with django_assert_num_queries(3):
+        body = api.get(URL, {'since': cursor}).json()
+
+    assert [o['id'] for o in body['orders']] == [orders[0].id, created.id]
+    assert body['orders'][0]['items'][0]['name'] == 'Borscht'
+    assert body['deleted'] == []
+    assert api.get(URL, {'since': body['cursor']}).json()['orders'] == []
+
+
+# Удаленные и перенесенные в архив заказы приходят отметками
+@pytest.mark.django_db
+def test_changes_report_deleted_and_archived(api, synced):
+    orders, cursor = synced
+    deleted_id = orders[1].id
+    orders[1].delete()
+    orders[2].status = 'paid'
+    orders[2].save()
+    Order.objects.filter(pk=orders[2].pk).update(paid_at=timezone.now() - timedelta(days=40))
+    call_command('archive_orders', older_than_days=30, verbosity=0)
+
+    body = api.get(URL, {'since': cursor}).json()
+    assert sorted(body['deleted']) == [deleted_id, orders[2].id]
+    assert body['orders'] == []
+
+
+@pytest.mark.django_db
+def test_changes_paging(api, synced):
+    orders, cursor = synced
+    for order in orders:
+        order.table_number += 10
+        order.save()
+
+    first = api.get(URL, {'since': cursor, 'page_size': 2}).json()
+    assert first['has_more'] and len(first['orders']) == 2
+    second = api.get(URL, {'since': first['cursor'], 'page_size': 2}).json()
+    assert not second['has_more'] and [o['id'] for o in second['orders']] == [orders[2].id]
+
+
+@pytest.mark.django_db
+def test_changes_cursor_errors(api, settings):
+    assert api.get(URL, {'since': 'abc'}).status_code == 400
+    settings.ORDERS_TOMBSTONE_DAYS = 1
+    old = int((timezone.now() - timedelta(days=2)).timestamp()) * 1_000_000
+    assert api.get(URL, {'since': f'{old}_0'}).status_code == 410
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, RevenueRollup
+
+
+# Команда проверки и исправления сумм заказов
+@pytest.mark.django_db
+def test_check_order_totals_finds_and_fixes_drift():
+    order = Order.objects.create(table_number=1)
+    OrderItem.objects.create(order=order, name='Суп', price=12, quantity=2)
+    empty = Order.objects.create(table_number=2)
+    Order.objects.filter(pk__in=[order.pk, empty.pk]).update(total_price=99)
+
+    call_command('check_order_totals', batch_size=1)
+    assert Order.objects.get(pk=order.pk).total_price == 99
+
+    call_command('check_order_totals', fix=True, batch_size=1)
+    assert Order.objects.get(pk=order.pk).total_price == 24
+    assert Order.objects.get(pk=empty.pk).total_price == 0
+
+
+# Перестроение сводки выручки по истории заказов
+@pytest.mark.django_db
+def test_rebuild_revenue_rollups():
+    Order.objects.create(table_number=1, status='paid', total_price=10)
+    Order.objects.create(table_number=2, status='paid', total_price=15)
+    Order.objects.create(table_number=3, status='pending', total_price=99)
+    legacy = Order.objects.create(table_number=4, total_price=20)
+    Order.objects.filter(pk=legacy.pk).update(status='paid')  # оплачен до появления paid_at
+    RevenueRollup.objects.update(revenue=0, orders_count=0)
+
+    call_command('rebuild_revenue_rollups')
+
+    assert RevenueRollup.objects.aggregate(total=Sum('revenue'), count=Sum('orders_count')) == {'total': 45, 'count': 3}
+    assert Order.objects.get(pk=legacy.pk).paid_at == legacy.created_at
+
+
+# Перенос старых оплаченных заказов в архив
+@pytest.mark.django_db
+def test_archive_orders_moves_old_paid_orders():
+    old_paid_at = timezone.now() - timedelta(days=40)
+    old = []
+    for table in (1, 2, 3):
+        order = Order.objects.create(table_number=table, status='paid')
+        OrderItem.objects.create(order=order, name='Soup', price=10, quantity=table)
+        old.append(order)
+    Order.objects.filter(pk__in=[order.pk for order in old]).update(paid_at=old_paid_at)
+    recent = Order.objects.create(table_number=4, status='paid')
+    OrderItem.objects.create(order=recent, name='Tea', price=2)
+    pending = Order.objects.create(table_number=5, created_at=old_paid_at)
+    OrderItem.objects.create(order=pending, name='Tea', price=2)
+    rollups_before = list(RevenueRollup.objects.values_list('day', 'shift', 'revenue', 'orders_count'))
+
+    call_command('archive_orders', dry_run=True)
+    assert Order.objects.count() == 5
+
+    call_command('archive_orders', older_than_days=30, batch_size=2)
+
+    assert set(Order.objects.values_list('id', flat=True)) == {recent.id, pending.id}
+    assert set(ArchivedOrder.objects.values_list('id', flat=True)) == {order.id for order in old}
+    assert ArchivedOrderItem.objects.filter(order_id=old[2].id).get().quantity == 3
+    assert not OrderItem.objects.filter(order_id__in=[order.id for order in old]).exists()
+    # Выручка не меняется: архивные заказы остаются в сводке и в отчетах
+    assert list(RevenueRollup.objects.values_list('day', 'shift', 'revenue', 'orders_count')) == rollups_before
+    day = timezone.localdate(old_paid_at).isoformat()
+    response = APIClient().get(f'/api/analytics/tables/?from={day}&to={day}')
+    assert [(row['table_number'], row['revenue']) for row in response.data['results']] == [(3, 30), (2, 20), (1, 10)]
+
+    call_command('rebuild_revenue_rollups')
+    assert RevenueRollup.objects.aggregate(total=Sum('revenue'))['total'] == 62
+
+
+# Генератор нагрузки: воспроизводимые заказы с согласованными суммами и сводкой выручки
+@pytest.mark.django_db
+def test_seed_orders():
+    call_command('seed_orders', orders=120, batch_size=50, seed=7, verbosity=0)
+
+    assert Order.objects.count() == 120
+    assert OrderItem.objects.filter(menu_item__isnull=True).count() == 0
+    totals = Order.objects.annotate(items_total=Order.items_total()).values_list('total_price', 'items_total')
+    assert all(stored == actual for stored, actual in totals)
+    paid_total = Order.objects.filter(status='paid').aggregate(total=Sum('total_price'))['total']
+    assert RevenueRollup.objects.aggregate(total=Sum('revenue'))['total'] == paid_total
+    assert not Order.objects.filter(status='paid', paid_at__isnull=True).exists()
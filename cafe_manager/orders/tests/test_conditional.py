@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def api():
+    return APIClient()
+
+
+@pytest.fixture
+def order():
+    order = Order.objects.create(table_number=3)
+    OrderItem.objects.create(order=order, name='Soup', price=Decimal('10.00'))
+    return order
+
+
+# Неизмененный заказ → 304 одним запросом версии, после правки блюда ETag меняется
+@pytest.mark.django_db
+def test_detail_not_modified_until_item_changes(api, order, django_assert_num_queries):
+    url = f'/api/orders/{order.id}/'
+    response = api.get(url)
+    etag = response['ETag']
+    assert response.json()['version'] == Order.objects.get(pk=order.id).version
+
+    with django_assert_num_queries(1):
+        response = api.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304 and response['ETag'] == etag
+
+    item = order.items.get()
+    item.name = 'Borscht'
+    item.save()
+    response = api.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag and response.json()['items'][0]['name'] == 'Borscht'
+
+
+# Страница списка → 304 без загрузки блюд, новый заказ меняет ETag страницы
+@pytest.mark.django_db
+def test_list_not_modified(api, order, django_assert_num_queries):
+    etag = api.get('/api/orders/')['ETag']
+
+    with django_assert_num_queries(1):
+        response = api.get('/api/orders/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    Order.objects.create(table_number=4)
+    response = api.get('/api/orders/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200 and len(response.json()['results']) == 2
+
+
+# Правка с устаревшим If-Match отклоняется (412), с актуальным — проходит и выдает новый ETag
+@pytest.mark.django_db
+def test_if_match_rejects_stale_write(api, order):
+    url = f'/api/orders/{order.id}/'
+    etag = api.get(url)['ETag']
+
+    first = api.patch(url, {'table_number': 5}, format='json', HTTP_IF_MATCH=etag)
+    assert first.status_code == 200 and first['ETag'] != etag
+
+    stale = api.patch(url, {'table_number': 7}, format='json', HTTP_IF_MATCH=etag)
+    assert stale.status_code == 412
+    assert Order.objects.get(pk=order.id).table_number == 5
+    huge = api.patch(url, {'table_number': 7}, format='json', HTTP_IF_MATCH=f'"{order.id}.99999999999999999999999"')
+    assert huge.status_code == 412
+
+    item = order.items.get()
+    response = api.patch(
+        url, {'items': [{'id': item.id, 'price': '12.00'}]}, format='json', HTTP_IF_MATCH=first['ETag'],
+    )
+    assert response.status_code == 200
+    order.refresh_from_db()
+    assert order.total_price == Decimal('12.00')
+    assert response['ETag'] == f'"{order.id}.{order.version}"' == api.get(url)['ETag']
@@ -0,0 +1,90 @@
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders import db_router
+from orders.models import Order, RevenueRollup
+
+needs_replica = pytest.mark.skipif(
+    'replica' not in settings.DATABASES,
+    reason="Нужна вторая локальная база с алиасом `replica` (DB_REPLICA_HOST/DB_REPLICA_NAME)",
+)
+
+
+@pytest.fixture
+def split_data():
+    """Разные заказы в основной базе и на "реплике" — по ответу видно, откуда шло чтение."""
+    primary = Order.objects.create(table_number=1)
+    replica = Order.objects.using('replica').create(table_number=2)
+    return primary, replica
+
+
+# Без реплики роутер всегда отвечает основной базой
+@pytest.mark.django_db
+def test_router_without_replica_uses_default():
+    with db_router.read_from_replica():
+        assert Order.objects.all().db == 'default'
+
+
+@pytest.mark.replica
+@needs_replica
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_list_endpoints_read_from_replica(client, split_data):
+    primary, replica = split_data
+
+    api = APIClient()
+    assert [o['id'] for o in api.get('/api/orders/').json()['results']] == [replica.id]
+    assert [o.id for o in client.get(reverse('order_list')).context['orders']] == [replica.id]
+    # Заказ по ID и запись — в основной базе
+    assert api.get(f'/api/orders/{primary.id}/').status_code == 200
+    with db_router.read_from_replica():
+        assert Order.objects.all().db == 'replica'
+    assert Order.objects.all().db == 'default'
+
+
+@pytest.mark.replica
+@needs_replica
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_reports_read_from_replica(client, split_data):
+    RevenueRollup.objects.using('replica').create(day='2025-03-01', shift='morning', revenue=42, orders_count=1)
+
+    assert APIClient().get('/api/revenue/?date=2025-03-01').json()['orders_count'] == 1
+    assert client.get('/api/async/revenue/?date=2025-03-01').json()['orders_count'] == 1
+
+
+# Read-your-writes: после записи клиент читает из основной базы
+@pytest.mark.replica
+@needs_replica
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_sticky_primary_after_write(split_data):
+    primary, replica = split_data
+    api = APIClient()
+
+    response = api.post('/api/orders/', {"table_number": 3, "items": [{"name": "Tea", "price": "2.00"}]}, format='json')
+    assert response.status_code == 201
+    assert response.cookies['db_primary']['max-age'] == settings.REPLICA_STICKY_SECONDS
+
+    ids = [o['id'] for o in api.get('/api/orders/').json()['results']]
+    assert ids == [response.json()['id'], primary.id]
+
+    assert [o['id'] for o in APIClient().get('/api/orders/').json()['results']] == [replica.id]
+
+
+# Недоступная реплика временно исключается из маршрутизации
+@pytest.mark.replica
+@needs_replica
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_unavailable_replica_falls_back_to_primary(monkeypatch):
+    def broken() -> None:
+        raise OperationalError("connection refused")
+
+    monkeypatch.setattr(db_router, '_replica_down_until', 0.0)
+    with monkeypatch.context() as patch:
+        patch.setattr(connections['replica'], 'ensure_connection', broken)
+        with db_router.read_from_replica():
+            assert Order.objects.all().db == 'default'
+    # Реплика снова доступна, но исключена на REPLICA_RETRY_SECONDS
+    with db_router.read_from_replica():
+        assert Order.objects.all().db == 'default'
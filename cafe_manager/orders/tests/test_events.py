@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+from django.test import AsyncClient
+
+from orders.events import EventBroker, broker
+from orders.models import Order
+
+
+# Догоняющий курсор: только пропущенные события или reset
+def test_broker_replay_since_cursor():
+    local = EventBroker(buffer_size=2)
+    first = local.publish('order.created', {'order_ids': [1]})
+    for order_id in (2, 3, 4):
+        local.publish('order.updated', {'order_ids': [order_id]})
+
+    assert [e.data['order_ids'] for e in local.replay(f'{local.epoch}-2')] == [[3], [4]]
+    assert local.replay(f'{local.epoch}-4') == []
+    assert local.replay(f'{local.epoch}-{first.seq}')[0].type == 'reset'  # событие 2 уже вытеснено
+    assert local.replay(f'{local.epoch - 1}-4')[0].type == 'reset'  # другой процесс
+    assert local.replay('garbage')[0].type == 'reset'
+
+
+@pytest.mark.django_db
+def test_order_changes_published_after_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        order = Order.objects.create(table_number=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        order.status = 'ready'
+        order.save()
+
+    created, changed = broker.replay(f'{broker.epoch}-0')[-2:]
+    assert (created.type, created.data['order_ids']) == ('order.created', [order.id])
+    assert changed.type == 'order.status_changed'
+    assert (changed.data['previous_status'], changed.data['status']) == ('pending', 'ready')
+
+
+def test_event_stream_sends_missed_events():
+    since = f'{broker.epoch}-{broker.publish("order.updated", {"order_ids": [1]}).seq}'
+    broker.publish('order.deleted', {'order_ids': [2]})
+
+    async def read_stream() -> list[str]:
+        response = await AsyncClient().get('/api/events/', headers={'Last-Event-ID': since})
+        assert response['Content-Type'] == 'text/event-stream'
+        stream = aiter(response.streaming_content)
+        chunks = [await anext(stream), await anext(stream)]
+        live = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        broker.publish('order.created', {'order_ids': [3]})
+        chunks.append(await asyncio.wait_for(live, timeout=1))
+        await stream.aclose()
+        return [chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in chunks]
+
+    retry, missed, live = asyncio.run(read_stream())
+    assert retry.startswith('retry:')
+    assert 'event: order.deleted' in missed and '"order_ids":[2]' in missed
+    assert 'event: order.created' in live
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+
+from orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+URL = '/api/orders/export/?from=2025-03-01&to=2025-03-02'
+
+
+@pytest.fixture
+def orders():
+    day = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+    archived = ArchivedOrder.objects.create(
+        id=1000, table_number=9, total_price=4, status='paid', created_at=day, paid_at=day + timedelta(hours=1),
+    )
+    ArchivedOrderItem.objects.create(id=1000, order=archived, name='Tea', price=2, quantity=2)
+    with_items = Order.objects.create(table_number=1, created_at=day)
+    OrderItem.objects.create(order=with_items, name='Soup', price=10, quantity=1)
+    OrderItem.objects.create(order=with_items, name='Bread', price=Decimal('1.50'), quantity=2)
+    empty = Order.objects.create(table_number=2, created_at=day + timedelta(days=1))
+    Order.objects.create(table_number=3, created_at=day + timedelta(days=2))  # Вне диапазона
+    return archived, with_items, empty
+
+
+def _content(response) -> str:
+    return b''.join(response.streaming_content).decode()
+
+
+# CSV: строка на блюдо, архивные заказы первыми, заказ без блюд — одна строка
+@pytest.mark.django_db
+def test_export_csv(client, orders):
+    archived, with_items, empty = orders
+    response = client.get(URL)
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    assert response['Content-Disposition'] == 'attachment; filename="orders-2025-03-01-2025-03-02.csv"'
+    rows = list(csv.DictReader(io.StringIO(_content(response))))
+    assert [(row['order_id'], row['item_name']) for row in rows] == [
+        (str(archived.id), 'Tea'), (str(with_items.id), 'Soup'), (str(with_items.id), 'Bread'), (str(empty.id), ''),
+    ]
+    assert rows[1]['total_price'] == '13.00' and rows[2]['item_price'] == '1.50'
+    assert rows[0]['paid_at'] == '2025-03-01T13:00:00+00:00' and rows[3]['paid_at'] == ''
+
+
+# NDJSON: строка на заказ с вложенными блюдами
+@pytest.mark.django_db
+def test_export_ndjson(client, orders):
+    archived, with_items, empty = orders
+    response = client.get(URL + '&format=ndjson')
+
+    assert response['Content-Type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in _content(response).splitlines()]
+    assert [line['id'] for line in lines] == [archived.id, with_items.id, empty.id]
+    assert lines[1]['items'] == [
+        {"id": with_items.items.get(name='Soup').id, "name": "Soup", "price": "10.00", "quantity": 1},
+        {"id": with_items.items.get(name='Bread').id, "name": "Bread", "price": "1.50", "quantity": 2},
+    ]
+    assert lines[2]['items'] == [] and lines[2]['paid_at'] is None
+
+
+@pytest.mark.django_db
+def test_export_validation(client):
+    assert client.get('/api/orders/export/?format=xml').status_code == 400
+    assert client.get('/api/orders/export/?from=2025-13-01').status_code == 400
+    assert client.post('/api/orders/export/').status_code == 405
+
+
+# Длина диапазона не ограничена; без `from` выгружается вся история до `to`
+@pytest.mark.django_db
+def test_export_long_and_open_ranges(client, orders):
+    old = Order.objects.create(table_number=4, created_at=datetime(2019, 1, 5, tzinfo=timezone.utc))
+
+    response = client.get('/api/orders/export/?format=ndjson&from=2019-01-01&to=2025-03-02')
+    assert response.status_code == 200
+    assert [json.loads(line)['id'] for line in _content(response).splitlines()][-1] == old.id
+
+    response = client.get('/api/orders/export/?format=ndjson&to=2025-03-02')
+    assert response['Content-Disposition'] == 'attachment; filename="orders-all-2025-03-02.ndjson"'
+    assert len(_content(response).splitlines()) == 4
+
+
+# Под ASGI поток отдается кусками, а не собирается в память целиком
+@pytest.mark.django_db
+def test_export_streams_under_asgi(orders):
+    async def fetch() -> tuple[int, list[bytes], bool]:
+        response = await AsyncClient().get(URL + '&format=ndjson')
+        return response.status_code, [chunk async for chunk in response.streaming_content], response.is_async
+
+    status, chunks, is_async = async_to_sync(fetch)()
+    assert status == 200 and is_async
+    assert len(b''.join(chunks).decode().splitlines()) == 3
+
+
+@pytest.mark.django_db
+def test_export_orders_command(orders, tmp_path):
+    output = tmp_path / 'orders.csv'
+    stdout = io.StringIO()
+    call_command('export_orders', '--from', '2025-03-01', '--to', '2025-03-02', '--output', str(output), stdout=stdout)
+
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 5  # Заголовок + 4 строки
+    assert 'Выгружено строк: 4' in stdout.getvalue()
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command('export_orders', '--from', '2025-03-01', '--to', '2025-03-02', '--format', 'ndjson', stdout=stdout, stderr=stderr)
+    assert len(stdout.getvalue().splitlines()) == 3
+    assert 'Выгружено строк: 4' in stderr.getvalue()
@@ -0,0 +1,100 @@
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from orders.models import Order, OrderImport, OrderItem, RevenueRollup
+
+
+def _ndjson(*orders: dict) -> str:
+    return ''.join(json.dumps(order) + '\n' for order in orders)
+
+
+def _import(path, **options) -> str:
+    stdout = io.StringIO()
+    call_command('import_orders', str(path), stdout=stdout, stderr=io.StringIO(), **options)
+    return stdout.getvalue()
+
+
+PAID = {
+    "table_number": 3, "status": "paid", "created_at": "2025-03-01T09:00:00+00:00", "paid_at": "2025-03-01T10:00:00+00:00",
+    "items": [{"name": "Soup", "price": "7.50", "quantity": 2}, {"name": "Tea", "price": "2.00"}],
+}
+
+
+# Экспорт → импорт: заказы, блюда и суммы совпадают, выручка попадает в сводку
+@pytest.mark.django_db
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_import_round_trip(tmp_path, export_format):
+    day = datetime(2025, 3, 1, 9, tzinfo=timezone.utc)
+    order = Order.objects.create(table_number=1, created_at=day)
+    OrderItem.objects.create(order=order, name='Soup', price=Decimal('7.50'), quantity=2)
+    order.status = 'paid'
+    order.save()
+    Order.objects.create(table_number=2, created_at=day)
+    path = tmp_path / f'orders.{export_format}'
+    call_command('export_orders', '--from', '2025-03-01', '--to', '2025-03-01', '--format', export_format,
+                 '--output', str(path), stdout=io.StringIO())
+    Order.objects.all().delete()
+    RevenueRollup.objects.all().delete()
+
+    assert 'Импортировано заказов: 2, блюд: 1' in _import(path)
+
+    imported = list(Order.objects.order_by('table_number').values_list('table_number', 'status', 'total_price', 'created_at'))
+    assert imported == [(1, 'paid', Decimal('15.00'), day), (2, 'pending', Decimal('0.00'), day)]
+    assert RevenueRollup.objects.get(day=order.paid_at.date()).revenue == Decimal('15.00')
+
+
+# Сумма считается при разборе; сумма из файла игнорируется
+@pytest.mark.django_db
+def test_import_computes_totals(tmp_path):
+    path = tmp_path / 'journal.ndjson'
+    path.write_text(_ndjson({**PAID, "total_price": "1.00"}), encoding='utf-8')
+    _import(path)
+
+    order = Order.objects.get()
+    assert order.total_price == Decimal('17.00')
+    assert order.paid_at == datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+    assert RevenueRollup.objects.get(day=date(2025, 3, 1)).orders_count == 1
+
+
+# После ошибки загруженные пакеты остаются, а повторный запуск продолжает с места остановки
+@pytest.mark.django_db
+def test_import_resumes_after_failure(tmp_path):
+    path = tmp_path / 'journal.ndjson'
+    good = [{**PAID, "table_number": table} for table in range(1, 6)]
+    path.write_text(_ndjson(*good[:3], {**PAID, "table_number": "x"}, *good[3:]), encoding='utf-8')
+
+    with pytest.raises(CommandError, match='строка 4'):
+        _import(path, batch_size=2)
+    assert Order.objects.count() == 2
+    assert OrderImport.objects.get().orders_done == 2
+
+    path.write_text(_ndjson(*good[:3], {**PAID, "table_number": 9}, *good[3:]), encoding='utf-8')
+    _import(path, batch_size=2)
+    assert sorted(Order.objects.values_list('table_number', flat=True)) == [1, 2, 3, 4, 5, 9]
+
+    # Повторный запуск по уже загруженному файлу ничего не дублирует, по дописанному — грузит только новое
+    with path.open('a', encoding='utf-8') as file:
+        file.write(_ndjson({**PAID, "table_number": 10}))
+    _import(path, batch_size=2)
+    assert Order.objects.count() == 7
+    assert OrderImport.objects.get().finished_at is not None
+
+
+@pytest.mark.django_db
+def test_import_skip_invalid(tmp_path):
+    path = tmp_path / 'journal.ndjson'
+    path.write_text(
+        _ndjson(PAID, {**PAID, "status": "lost"}, {**PAID, "items": [{"name": "Tea", "price": "-1"}]})
+        + 'not json\n' + _ndjson({**PAID, "items": [{"name": "Tea", "price": "2.00", "quantity": 0}]}),
+        encoding='utf-8',
+    )
+    with pytest.raises(CommandError):
+        _import(path, restart=True)
+
+    assert 'пропущено некорректных: 4' in _import(path, skip_invalid=True, restart=True)
+    assert Order.objects.count() == 1
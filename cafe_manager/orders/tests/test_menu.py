@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders import menu
+from orders.models import MenuItem, MenuVersion, Order
+
+
+# Снимок меню перечитывается из БД только после изменения меню
+@pytest.mark.django_db
+def test_menu_snapshot_reloaded_only_on_change(django_assert_num_queries):
+    soup = MenuItem.objects.create(name="Soup", price=Decimal("4.50"))
+    MenuItem.objects.create(name="Old", price=Decimal("1.00"), is_active=False)
+
+    with django_assert_num_queries(2):  # версия + блюда
+        snapshot = menu.get_snapshot()
+    assert [entry.name for entry in snapshot.items.values()] == ["Soup"]
+    with django_assert_num_queries(0):
+        assert menu.get_snapshot() is snapshot
+
+    soup.price = Decimal("5.00")
+    soup.save()
+    with django_assert_num_queries(2):
+        assert menu.get_snapshot().get(soup.id).price == Decimal("5.00")
+
+
+# Изменение меню в другом процессе видно по версии в БД; ETag одинаков во всех процессах
+@pytest.mark.django_db
+def test_menu_snapshot_follows_db_version(settings, django_assert_num_queries):
+    settings.MENU_VERSION_CHECK_SECONDS = 0
+    soup = MenuItem.objects.create(name="Soup", price=Decimal("4.50"))
+    snapshot = menu.get_snapshot()
+    with django_assert_num_queries(1):  # только сверка версии
+        assert menu.get_snapshot() is snapshot
+
+    # Другой процесс: меняет меню в БД, но снимок этого процесса не сбрасывает
+    MenuItem.objects.filter(pk=soup.pk).update(price=Decimal("6.00"))
+    MenuVersion.bump()
+    fresh = menu.get_snapshot()
+    assert fresh.get(soup.id).price == Decimal("6.00")
+    assert fresh.version == MenuVersion.current()
+
+    menu.reset_snapshot()  # "новый процесс"
+    assert menu.get_snapshot().etag == fresh.etag
+
+
+# Блюдо из меню: название и цена берутся из снимка и фиксируются в заказе
+@pytest.mark.django_db
+def test_create_order_from_menu(django_assert_num_queries):
+    soup = MenuItem.objects.create(name="Soup", price=Decimal("4.50"))
+    tea = MenuItem.objects.create(name="Tea", price=Decimal("2.00"))
+    menu.get_snapshot()
+    client = APIClient()
+
+    data = {"table_number": 3, "items": [
+        {"menu_item": soup.id, "quantity": 2},
+        {"menu_item": tea.id, "price": "1.50"},
+        {"name": "Special", "price": "3.00"},
+    ]}
+    with django_assert_num_queries(5):  # транзакция, заказ, блюда, без запросов к меню
+        response = client.post("/api/orders/", data, format="json")
+    assert response.status_code == 201
+    order = Order.objects.get(id=response.data["id"])
+    assert order.total_price == Decimal("13.50")
+    assert list(order.items.order_by("id").values_list("menu_item_id", "name", "price")) == [
+        (soup.id, "Soup", Decimal("4.50")), (tea.id, "Tea", Decimal("1.50")), (None, "Special", Decimal("3.00")),
+    ]
+
+    soup.price = Decimal("9.99")
+    soup.save()
+    assert order.items.get(menu_item=soup).price == Decimal("4.50")
+
+
+@pytest.mark.django_db
+def test_create_order_with_inactive_menu_item():
+    soup = MenuItem.objects.create(name="Soup", price=Decimal("4.50"), is_active=False)
+    response = APIClient().post("/api/orders/", {"table_number": 3, "items": [{"menu_item": soup.id}]}, format="json")
+    assert response.status_code == 400
+    assert Order.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_menu_api_etag():
+    MenuItem.objects.create(name="Soup", price=Decimal("4.50"))
+    client = APIClient()
+
+    response = client.get(reverse("api-menu"))
+    assert response.status_code == 200
+    assert response.data["results"] == [{"id": MenuItem.objects.get().id, "name": "Soup", "price": "4.50"}]
+    etag = response["ETag"]
+
+    assert client.get(reverse("api-menu"), HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    MenuItem.objects.create(name="Tea", price=Decimal("2.00"))
+    response = client.get(reverse("api-menu"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert len(response.data["results"]) == 2
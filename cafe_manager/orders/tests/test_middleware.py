@@ -0,0 +1,74 @@
+import json
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from orders.middleware import RequestMetrics
+from orders.models import Order, OrderItem
+
+
+@pytest.fixture
+def request_log(caplog):
+    """Записи логгера `orders.requests` (он не передает записи корневому логгеру, поэтому handler подключается напрямую)."""
+    logger = logging.getLogger('orders.requests')
+    caplog.set_level(logging.INFO, logger='orders.requests')
+    logger.addHandler(caplog.handler)
+    yield lambda: [(record.levelno, json.loads(record.getMessage())) for record in caplog.records
+                   if record.name == 'orders.requests']
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db
+def test_server_timing_and_request_log(client, request_log):
+    Order.objects.create(table_number=1)
+    response = client.get(reverse('order_list'))
+
+    assert response['Server-Timing'].startswith('db;dur=')
+    assert 'desc="2 queries"' in response['Server-Timing']
+    [(level, record)] = request_log()
+    assert level == logging.INFO
+    assert (record['method'], record['path'], record['status'], record['queries']) == ('GET', '/orders/', 200, 2)
+    assert 'sql' not in record
+
+
+# Под ASGI представление работает в другом потоке, но его SQL тоже попадает в метрики
+@pytest.mark.django_db
+def test_metrics_count_queries_under_asgi(request_log):
+    Order.objects.create(table_number=1)
+    response = async_to_sync(AsyncClient().get)(reverse('order_list'))
+
+    assert 'desc="2 queries"' in response['Server-Timing']
+    [(_, record)] = request_log()
+    assert record['queries'] == 2
+
+
+# Медленный запрос логируется как WARNING вместе с самыми тяжелыми SQL
+@pytest.mark.django_db
+def test_slow_request_captures_sql(client, request_log, settings):
+    settings.REQUEST_SLOW_MS = 0
+    client.get('/api/orders/')
+
+    [(level, record)] = request_log()
+    assert level == logging.WARNING
+    assert record['slow'] is True
+    assert any('orders_order' in statement['sql'] for statement in record['sql'])
+
+
+# Один и тот же SQL-шаблон много раз за запрос — признак N+1
+@pytest.mark.django_db
+def test_duplicate_queries_detected():
+    order = Order.objects.create(table_number=1)
+    for name in ('Tea', 'Soup', 'Cake'):
+        OrderItem.objects.create(order=order, name=name, price=5)
+
+    metrics = RequestMetrics()
+    with metrics.capture():
+        for item in OrderItem.objects.all():
+            item.order.table_number  # noqa: B018 — намеренный N+1
+
+    assert metrics.queries == 4
+    [duplicate] = metrics.duplicates(threshold=3)
+    assert duplicate['count'] == 3 and 'orders_order' in duplicate['sql']
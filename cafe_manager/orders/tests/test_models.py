@@ -1,6 +1,6 @@
 import pytest
 
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderItem, RevenueRollup
 
 
 @pytest.mark.django_db
@@ -16,3 +16,81 @@ def test_order_total_calculation():
     order.calculate_total()
 
     assert order.total_price == 75 # 2 блюда: (1*30) + (3*5)
+
+
+# Сумма заказа поддерживается инкрементально при изменении блюд
+@pytest.mark.django_db
+def test_order_total_follows_item_changes():
+    order = Order.objects.create(table_number=5, status='pending')
+    pizza = OrderItem.objects.create(order=order, name='Пицца', price=30, quantity=2)
+    cola = OrderItem.objects.create(order=order, name='Кола', price=5, quantity=3)
+    order.refresh_from_db()
+    assert order.total_price == 75
+
+    pizza = OrderItem.objects.get(pk=pizza.pk)
+    pizza.quantity = 1
+    pizza.save()
+    order.refresh_from_db()
+    assert order.total_price == 45
+
+    cola.delete()
+    order.refresh_from_db()
+    assert order.total_price == 30
+
+
+@pytest.mark.django_db
+def test_calculate_total_writes_only_total_price(django_assert_num_queries):
+    order = Order.objects.create(table_number=5, status='pending')
+    OrderItem.objects.bulk_create([OrderItem(order=order, name='Суп', price=12, quantity=2)])
+    Order.objects.filter(pk=order.pk).update(table_number=9)
+
+    with django_assert_num_queries(2):  # UPDATE с подзапросом + чтение total_price
+        order.calculate_total()
+
+    order.refresh_from_db()
+    assert (order.total_price, order.table_number) == (24, 9)
+
+
+# Блюдо с ID существующей строки, созданное без загрузки из БД: прежняя стоимость вычитается
+@pytest.mark.django_db
+def test_unloaded_item_with_existing_pk_replaces_subtotal():
+    order = Order.objects.create(table_number=1, status='pending')
+    item = OrderItem.objects.create(order=order, name='Суп', price=10, quantity=1)
+    order.refresh_from_db()
+    order.status = 'paid'
+    order.save()
+
+    OrderItem(id=item.id, order_id=order.id, name='Суп', price=50, quantity=1).save()
+    order.refresh_from_db()
+    assert order.total_price == 50
+    assert RevenueRollup.objects.get().revenue == 50
+
+
+# Сводка выручки по сменам обновляется инкрементально
+@pytest.mark.django_db
+def test_revenue_rollup_follows_payments():
+    order = Order.objects.create(table_number=1, status='pending')
+    OrderItem.objects.create(order=order, name='Пицца', price=30, quantity=1)
+    assert not RevenueRollup.objects.exists()
+
+    order.refresh_from_db()
+    order.status = 'paid'
+    order.save()
+    rollup = RevenueRollup.objects.get()
+    assert order.paid_at is not None
+    assert (rollup.revenue, rollup.orders_count) == (30, 1)
+
+    OrderItem.objects.create(order=order, name='Кола', price=5, quantity=2)
+    rollup.refresh_from_db()
+    assert (rollup.revenue, rollup.orders_count) == (40, 1)
+
+    order.refresh_from_db()
+    order.status = 'ready'
+    order.save(update_fields=['status'])
+    rollup.refresh_from_db()
+    assert (rollup.revenue, rollup.orders_count) == (0, 0)
+    assert Order.objects.get(pk=order.pk).paid_at is None
+
+    Order.objects.create(table_number=2, status='paid', total_price=15).delete()
+    rollup.refresh_from_db()
+    assert (rollup.revenue, rollup.orders_count) == (0, 0)
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders.models import Order, OrderItem, RevenueRollup
+
+FETCH = {'HTTP_X_REQUESTED_WITH': 'fetch'}
+
+
+def make_order(items: int) -> Order:
+    order = Order.objects.create(table_number=1)
+    OrderItem.objects.bulk_create(OrderItem(order=order, name=f'Блюдо {i}', price=10, quantity=1) for i in range(items))
+    Order.objects.filter(pk=order.pk).update(total_price=10 * items)
+    order.refresh_from_db()
+    return order
+
+
+def edit_items(client, order: Order) -> list[int]:
+    """Добавляет, изменяет и удаляет блюдо через fetch; возвращает число запросов на каждую правку."""
+    item = order.items.first()
+    start = Decimal(order.total_price)
+    counts = []
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            reverse('order_item_add', args=[order.id]),
+            {'new-name': 'Чай', 'new-price': '5', 'new-quantity': '2'}, **FETCH,
+        )
+    assert response.status_code == 200
+    assert 'Чай' in response.content.decode()
+    assert Decimal(response['X-Order-Total']) == start + 10
+    counts.append(len(queries))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            reverse('order_item_update', args=[order.id, item.id]),
+            {f'item-{item.id}-name': item.name, f'item-{item.id}-price': '10', f'item-{item.id}-quantity': '3'}, **FETCH,
+        )
+    assert Decimal(response['X-Order-Total']) == start + 30
+    counts.append(len(queries))
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(reverse('order_item_delete', args=[order.id, item.id]), **FETCH)
+    assert (response.status_code, response.content) == (200, b'')
+    assert Decimal(response['X-Order-Total']) == start
+    counts.append(len(queries))
+
+    order.refresh_from_db()
+    assert order.total_price == sum(i.price * i.quantity for i in order.items.all())
+    return counts
+
+
+# Правка одного блюда возвращает фрагмент и новую сумму; число запросов не зависит от размера заказа
+@pytest.mark.django_db
+def test_item_fragments_constant_queries(client):
+    assert edit_items(client, make_order(1)) == edit_items(client, make_order(50))
+
+
+# Ошибки формы → 400 со строкой; чужое блюдо → 404; без fetch → редирект на страницу заказа
+@pytest.mark.django_db
+def test_item_fragment_errors_and_redirect(client):
+    order, other = make_order(1), make_order(1)
+    item, foreign = order.items.get(), other.items.get()
+
+    response = client.post(reverse('order_item_add', args=[order.id]), {'new-name': '', 'new-price': 'x'}, **FETCH)
+    assert response.status_code == 400
+    assert 'data-fragment="new"' in response.content.decode()
+    assert client.post(reverse('order_item_update', args=[order.id, foreign.id]), {}, **FETCH).status_code == 404
+    assert client.post(reverse('order_item_delete', args=[order.id, foreign.id]), **FETCH).status_code == 404
+
+    response = client.post(
+        reverse('order_item_update', args=[order.id, item.id]),
+        {f'item-{item.id}-name': 'Суп', f'item-{item.id}-price': '7', f'item-{item.id}-quantity': '1'},
+    )
+    assert response.status_code == 302
+    assert response['Location'] == reverse('order_update', args=[order.id])
+
+    page = client.get(reverse('order_update', args=[order.id]))
+    assert page.status_code == 200
+    assert 'Суп' in page.content.decode()
+    assert page.context['object'].total_price == 7
+
+
+# Запись блюда, сумма и сводка выручки — одна транзакция: сбой на середине не оставляет расхождений
+@pytest.mark.django_db(transaction=True)
+def test_item_fragment_is_atomic(client, monkeypatch):
+    order = make_order(1)
+    Order.objects.filter(pk=order.pk).update(status='paid', paid_at=order.created_at)
+    item = order.items.get()
+
+    def broken_record(*args, **kwargs):
+        raise RuntimeError('rollup unavailable')
+
+    monkeypatch.setattr(RevenueRollup, 'record', broken_record)
+    with pytest.raises(RuntimeError):
+        client.post(
+            reverse('order_item_update', args=[order.id, item.id]),
+            {f'item-{item.id}-name': item.name, f'item-{item.id}-price': '50', f'item-{item.id}-quantity': '1'}, **FETCH,
+        )
+    with pytest.raises(RuntimeError):
+        client.post(reverse('order_item_delete', args=[order.id, item.id]), **FETCH)
+
+    order.refresh_from_db()
+    assert order.total_price == 10
+    assert order.items.get().price == 10
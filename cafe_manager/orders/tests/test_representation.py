@@ -0,0 +1,45 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from orders import representation
+from orders.models import MenuItem, Order, OrderItem
+from orders.renderers import FastJSONRenderer
+from orders.serializers import OrderSerializer
+
+
+# Быстрое представление совпадает с OrderSerializer, в том числе в JSON-ответе API
+@pytest.mark.django_db
+def test_representation_matches_serializer():
+    tea = MenuItem.objects.create(name='Tea', price=Decimal('5.00'))
+    first = Order.objects.create(table_number=1, status='ready')
+    OrderItem.objects.create(order=first, menu_item=tea, name='Tea', price=Decimal('5.00'), quantity=3)
+    OrderItem.objects.create(order=first, name='Cake', price=Decimal('12.50'))
+    Order.objects.create(table_number=2)
+
+    orders = Order.objects.order_by('-id')
+    expected = OrderSerializer(orders.prefetch_related('items'), many=True).data
+    assert representation.with_items(representation.order_rows(orders)) == expected
+
+    response = APIClient().get('/api/orders/')
+    assert json.loads(response.content)['results'] == json.loads(JSONRenderer().render(expected))
+    detail = APIClient().get(f'/api/orders/{first.id}/')
+    assert detail.content == JSONRenderer().render(expected[1])
+    assert APIClient().get('/api/orders/0/').status_code == 404
+
+
+# orjson-рендерер выдает те же байты, что и JSONRenderer DRF
+def test_fast_renderer_matches_drf():
+    pytest.importorskip('orjson')
+    data = {
+        'price': Decimal('12.50'),
+        'when': datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        'name': 'Борщ\u2028',
+        1: [None, True, 1.5],
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(None) == b''
@@ -0,0 +1,36 @@
+import pytest
+from django.test import Client
+
+from orders import schema
+from orders.checks import api_schema_check
+
+
+@pytest.fixture
+def client():
+    schema.load_schema.cache_clear()
+    yield Client()
+    schema.load_schema.cache_clear()
+
+
+# Схема отдается из собранного файла: без построения на запрос, с ETag и Cache-Control
+def test_schema_served_from_artifact(client, monkeypatch):
+    artifact = schema.load_schema()
+    monkeypatch.setattr(schema, 'generate_schema', lambda: pytest.fail("схема не должна строиться на запрос"))
+
+    response = client.get('/api/swagger.json')
+    assert response.status_code == 200 and response.content == artifact.json
+    assert response['ETag'] == artifact.etag
+    assert 'max-age=' in response['Cache-Control'] and 'public' in response['Cache-Control']
+
+    not_modified = client.get('/api/swagger.json', HTTP_IF_NONE_MATCH=artifact.etag)
+    assert not_modified.status_code == 304 and not_modified['Cache-Control'] == response['Cache-Control']
+
+    yaml = client.get('/api/swagger.yaml')
+    assert yaml.status_code == 200 and yaml.content.startswith(b'swagger:')
+    assert b'/api/swagger.json' in client.get('/api/swagger/').content
+
+
+# Файл схемы в репозитории пересобран после изменений API (иначе: manage.py build_api_schema)
+def test_schema_artifact_is_up_to_date():
+    assert schema.stored_schema() == schema.generate_schema()
+    assert api_schema_check(None) == []
@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderItem
+from orders.search import filter_by_dish, filter_by_table
+
+
+def explain(queryset) -> str:
+    """План запроса; в PostgreSQL seq scan запрещен, чтобы на маленькой таблице проверялась применимость индекса."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.fixture
+def orders():
+    for table, dish in [(1, 'Coffee'), (5, 'Cappuccino'), (7, 'Coffee latte'), (12, 'Soup')]:
+        order = Order.objects.create(table_number=table)
+        OrderItem.objects.create(order=order, name=dish, price=10)
+
+
+# Номер стола — точное совпадение или диапазон по индексу
+@pytest.mark.django_db
+def test_table_search_exact_and_range(client, orders):
+    def tables(q):
+        return sorted(o.table_number for o in client.get(reverse('order_list'), {'q': q}).context['orders'])
+
+    assert tables('5') == [5]
+    assert tables('5-12') == [5, 7, 12]
+    assert tables('1') == [1]  # раньше icontains находил и 12
+    assert tables('стол') == []
+
+
+@pytest.mark.django_db
+def test_dish_search_by_prefix(orders):
+    client = APIClient()
+    results = client.get('/api/orders/', {'dish': 'COF'}).data['results']
+    assert sorted(o['table_number'] for o in results) == [1, 7]
+    assert client.get('/api/orders/', {'table': 'x-1'}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_table_and_status_filters_use_indexes(orders):
+    assert 'order_table_id_idx' in explain(filter_by_table(Order.objects.order_by('-id'), '5-10'))
+    assert 'order_status_id_idx' in explain(Order.objects.filter(status='paid').order_by('-id'))
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="LIKE по индексу проверяется в PostgreSQL")
+def test_dish_search_uses_index(orders):
+    assert 'orderitem_name_search_idx' in explain(OrderItem.objects.filter(name_search__startswith='cof'))
+    assert filter_by_dish(Order.objects.all(), 'Cof').count() == 2
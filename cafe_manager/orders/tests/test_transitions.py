@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+import pytest
+from rest_framework.test import APIClient
+
+from orders.events import broker
+from orders.models import Order, OrderItem, RevenueRollup
+
+
+@pytest.fixture
+def api():
+    return APIClient()
+
+
+@pytest.fixture
+def order():
+    order = Order.objects.create(table_number=2)
+    OrderItem.objects.create(order=order, name='Soup', price=Decimal('15.00'), quantity=2)
+    order.refresh_from_db()
+    return order
+
+
+# pending → ready → paid: минимальный ответ, версия, paid_at, сводка выручки и событие
+@pytest.mark.django_db
+def test_status_transitions(api, order, django_assert_num_queries, django_capture_on_commit_callbacks):
+    url = f'/api/orders/{order.id}/status/'
+    with django_assert_num_queries(4):  # UPDATE + SELECT версии; SAVEPOINT/RELEASE — из-за транзакции теста
+        ready = api.post(url, {'status': 'ready'}, format='json')
+    assert ready.status_code == 200
+    body = ready.json()
+    assert (body['status'], body['previous_status'], body['paid_at']) == ('ready', 'pending', None)
+    assert body['version'] == order.version + 1
+    assert ready['ETag'] == f'"{order.id}.{order.version + 1}"'
+
+    with django_capture_on_commit_callbacks(execute=True):
+        paid = api.post(url, {'status': 'paid'}, format='json').json()
+    order.refresh_from_db()
+    assert (order.status, order.version) == ('paid', body['version'] + 1)
+    assert order.paid_at is not None and paid['paid_at'] is not None
+    rollup = RevenueRollup.objects.get()
+    assert (rollup.revenue, rollup.orders_count) == (Decimal('30.00'), 1)
+
+    event = broker.replay(f'{broker.epoch}-0')[-1]
+    assert event.type == 'order.status_changed'
+    assert (event.data['previous_status'], event.data['status']) == ('ready', 'paid')
+
+
+# Недостижимый переход → 409 с текущим статусом, неизвестный статус → 400, нет заказа → 404
+@pytest.mark.django_db
+def test_status_transition_rejected(api, order):
+    url = f'/api/orders/{order.id}/status/'
+    conflict = api.post(url, {'status': 'paid'}, format='json')
+    assert conflict.status_code == 409 and conflict.json()['current_status'] == 'pending'
+
+    assert api.post(url, {'status': 'pending'}, format='json').status_code == 400
+    assert api.post(url, {}, format='json').status_code == 400
+    assert api.post(url, {'status': ['ready']}, format='json').status_code == 400
+    assert api.post(url, ['ready'], format='json').status_code == 400
+    assert api.post(f'/api/orders/{order.id + 100}/status/', {'status': 'ready'}, format='json').status_code == 404
+
+    order.refresh_from_db()
+    assert order.status == 'pending' and not RevenueRollup.objects.exists()
@@ -52,3 +52,62 @@ def test_order_list_view_status_filter(client):
     assert response.status_code == 200
     assert len(response.context['orders']) == 1
     assert response.context['orders'][0].status == 'paid'
+
+
+# Регрессионный тест N+1: число запросов не зависит от количества заказов
+@pytest.mark.django_db
+@pytest.mark.parametrize('orders_count', [10, 10_000])
+def test_order_list_view_constant_queries(client, django_assert_num_queries, orders_count):
+    orders = Order.objects.bulk_create(Order(table_number=i % 20 + 1) for i in range(orders_count))
+    OrderItem.objects.bulk_create(
+        OrderItem(order=order, name='Кофе', price=5, quantity=1) for order in orders
+    )
+    with django_assert_num_queries(2):  # заказы + блюда (prefetch)
+        response = client.get(reverse('order_list'))
+    assert response.status_code == 200
+    assert len(response.context['orders']) == min(orders_count, 50)
+
+
+# Тест keyset-пагинации по курсору ID
+@pytest.mark.django_db
+def test_order_list_view_keyset_pagination(client):
+    ids = [Order.objects.create(table_number=1).id for _ in range(120)]
+    first = client.get(reverse('order_list'))
+    page = first.context['page_obj']
+    assert [o.id for o in first.context['orders']] == ids[::-1][:50]
+    assert page.has_next() and not page.has_previous()
+
+    second = client.get(reverse('order_list') + f'?after={page.next_cursor}')
+    assert [o.id for o in second.context['orders']] == ids[::-1][50:100]
+
+    back = client.get(reverse('order_list') + f"?before={second.context['page_obj'].previous_cursor}")
+    assert [o.id for o in back.context['orders']] == ids[::-1][:50]
+    assert not back.context['page_obj'].has_previous()
+
+    last = client.get(reverse('order_list') + f"?after={second.context['page_obj'].next_cursor}")
+    assert [o.id for o in last.context['orders']] == ids[::-1][100:]
+    assert not last.context['page_obj'].has_next()
+
+
+# Редактирование заказа: сумма обновляется по изменившимся блюдам
+@pytest.mark.django_db
+def test_order_update_view_keeps_total(client):
+    order = Order.objects.create(table_number=1)
+    tea = OrderItem.objects.create(order=order, name='Чай', price=5, quantity=1)
+    cake = OrderItem.objects.create(order=order, name='Пирог', price=12, quantity=1)
+    data = {
+        'table_number': 3,
+        'status': 'ready',
+        'items-TOTAL_FORMS': '3',
+        'items-INITIAL_FORMS': '2',
+        'items-MIN_NUM_FORMS': '0',
+        'items-MAX_NUM_FORMS': '1000',
+        'items-0-id': tea.id, 'items-0-name': 'Чай', 'items-0-price': '5.00', 'items-0-quantity': '3',
+        'items-1-id': cake.id, 'items-1-name': 'Пирог', 'items-1-price': '12', 'items-1-quantity': '1',
+        'items-1-DELETE': 'on',
+        'items-2-name': 'Кофе', 'items-2-price': '7', 'items-2-quantity': '1',
+    }
+    response = client.post(reverse('order_update', args=[order.id]), data)
+    assert response.status_code == 302
+    order.refresh_from_db()
+    assert (order.table_number, order.status, order.total_price) == (3, 'ready', 22)
@@ -0,0 +1,137 @@
+"""
+Смена статуса заказа по конечному автомату: `pending` → `ready` → `paid`.
+
+Самая частая запись — продвижение заказа по статусам — не требует ни загрузки
+заказа с блюдами, ни вложенного сериализатора. Для каждого нового статуса есть
+ровно один допустимый предыдущий, поэтому переход выполняется одним условным
+`UPDATE ... SET status = ? WHERE id = ? AND status = ?`: если заказ уже сменил
+статус (параллельный запрос), строка не обновится и переход будет отклонен.
+
+Вместе со статусом обновляются `paid_at`, `updated_at` и `version`, оплаченный
+заказ попадает в сводку выручки, а после записи отправляется `order_changed`
+(инвалидация кэша и событие `order.status_changed`). Массовые переходы из админки
+(`change_status_many`) выполняются так же — одним `UPDATE` на все выбранные заказы.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import Order, RevenueRollup
+from .signals import order_changed
+
+# 🔹 Новый статус → единственный статус, из которого в него можно перейти
+TRANSITIONS: dict[str, str] = {
+    'ready': 'pending',
+    'paid': 'ready',
+}
+
+
+class TransitionError(ValueError):
+    """
+    Переход не выполнен.
+
+    `current` — статус заказа сейчас (`None`, если некорректен сам статус назначения).
+    """
+
+    def __init__(self, message: str, current: str | None = None) -> None:
+        super().__init__(message)
+        self.current = current
+
+
+@dataclass
+class StatusChange:
+    """
+    Результат перехода.
+
+    Атрибуты:
+    - 🔹 `order_id`, `status`, `previous_status` — заказ, новый и прежний статус.
+    - 🔹 `version` — новая версия заказа (для `ETag`).
+    - 🔹 `paid_at` — время оплаты (только после перехода в `paid`).
+    """
+
+    order_id: int
+    status: str
+    previous_status: str
+    version: int
+    paid_at: datetime | None
+
+
+def change_status(order_id: int, status: str) -> StatusChange:
+    """
+    🔹 Переводит заказ в статус `status`, если он сейчас в допустимом предыдущем статусе.
+
+    - ✅ Один условный `UPDATE` и чтение версии по первичному ключу (при оплате — и суммы для сводки выручки)
+    - ⚠️ Неизвестный или недостижимый статус, заказ в другом статусе → `TransitionError`;
+      заказа нет → `Order.DoesNotExist`
+    """
+    previous = TRANSITIONS.get(status)
+    if previous is None:
+        allowed = ', '.join(TRANSITIONS)
+        raise TransitionError(f"Недопустимый статус {status!r}: ожидается один из {allowed}.")
+
+    changes = {'status': status, **Order.change_marks()}
+    if status == 'paid':
+        changes['paid_at'] = timezone.now()
+    with transaction.atomic():
+        if not Order.objects.filter(pk=order_id, status=previous).update(**changes):
+            current = Order.objects.filter(pk=order_id).values_list('status', flat=True).first()
+            if current is None:
+                raise Order.DoesNotExist(f"Заказ {order_id} не найден.")
+            raise TransitionError(f"Заказ в статусе {current!r}, переход в {status!r} невозможен.", current=current)
+        # Строка заблокирована нашим UPDATE до коммита, сумма и версия не изменятся
+        version, total_price, paid_at = (
+            Order.objects.filter(pk=order_id).values_list('version', 'total_price', 'paid_at').get()
+        )
+        if status == 'paid':
+            RevenueRollup.apply_change(None, (paid_at, total_price))
+        order_changed.send(
+            sender=Order,
+            order_ids=[order_id],
+            statuses={previous, status},
+            action='updated',
+            status=status,
+            previous_status=previous,
+        )
+    return StatusChange(order_id, status, previous, version, paid_at)
+
+
+def change_status_many(queryset: QuerySet[Order], status: str) -> list[int]:
+    """
+    🔹 Массовый переход (действия админки): заказы из `queryset` в допустимом предыдущем статусе
+    переводятся в `status` одним `UPDATE`; возвращает ID переведенных заказов.
+
+    Строки сначала блокируются (`SELECT ... FOR UPDATE`), чтобы сумма оплаченных заказов
+    в сводке выручки совпала с тем, что обновил `UPDATE`. Заказы в других статусах пропускаются.
+    """
+    previous = TRANSITIONS.get(status)
+    if previous is None:
+        allowed = ', '.join(TRANSITIONS)
+        raise TransitionError(f"Недопустимый статус {status!r}: ожидается один из {allowed}.")
+
+    now = timezone.now()
+    changes = {'status': status, **Order.change_marks()}
+    if status == 'paid':
+        changes['paid_at'] = now
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(status=previous).order_by().select_for_update().values_list('id', 'total_price')
+        )
+        if not rows:
+            return []
+        order_ids = [order_id for order_id, _ in rows]
+        Order.objects.filter(pk__in=order_ids).update(**changes)
+        if status == 'paid':
+            RevenueRollup.record(now, sum((total for _, total in rows), Decimal("0.00")), orders=len(rows))
+        order_changed.send(
+            sender=Order,
+            order_ids=order_ids,
+            statuses={previous, status},
+            action='updated',
+            status=status,
+            previous_status=previous,
+        )
+    return order_ids
@@ -4,6 +4,8 @@ from .views import (
     OrderCreateView,
     OrderUpdateView,
     OrderDeleteView,
+    OrderItemView,
+    OrderItemDeleteView,
     RevenueView
 )
 
@@ -13,5 +15,8 @@ urlpatterns: list[path] = [
     path('create/', OrderCreateView.as_view(), name='order_create'),  # ➕ Создание заказа
     path('<int:pk>/update/', OrderUpdateView.as_view(), name='order_update'),  # ✏️ Редактирование заказа
     path('<int:pk>/delete/', OrderDeleteView.as_view(), name='order_delete'),  # ❌ Удаление заказа
+    path('<int:pk>/items/add/', OrderItemView.as_view(), name='order_item_add'),  # ➕ Блюдо в заказ
+    path('<int:pk>/items/<int:item_id>/', OrderItemView.as_view(), name='order_item_update'),  # ✏️ Одно блюдо
+    path('<int:pk>/items/<int:item_id>/delete/', OrderItemDeleteView.as_view(), name='order_item_delete'),  # ❌ Одно блюдо
     path('revenue/', RevenueView.as_view(), name='revenue'),      # 💰 Просмотр общей выручки
 ]
@@ -1,34 +1,71 @@
-from django.db.models import Q, Sum
-from django.http import HttpResponseRedirect
-from django.shortcuts import redirect
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, TemplateView
 from django.forms import BaseInlineFormSet
 
-from .forms import OrderItemFormSet, OrderForm
-from .models import Order
-
-# 🌟 Список заказов (поиск + фильтрация)
-class OrderListView(ListView):
-    """Отображает список заказов с возможностью поиска и фильтрации по статусу."""
+from . import cache, search
+from .db_router import ReplicaReadMixin
+from .forms import OrderItemForm, OrderItemFormSet, OrderForm
+from .models import Order, OrderItem, RevenueRollup
+from .pagination import KeysetPage, paginate_by_id
+
+# 🌟 Список заказов (поиск + фильтрация + keyset-пагинация)
+class OrderListView(ReplicaReadMixin, ListView):
+    """
+    Отображает список заказов с возможностью поиска и фильтрации по статусу.
+
+    Блюда подгружаются одним запросом (`prefetch_related`), а страницы
+    листаются курсором по `id` (`?after=` / `?before=`), без OFFSET и COUNT(*),
+    поэтому число запросов не зависит от количества заказов.
+    """
     model = Order
     template_name = 'orders/order_list.html'
     context_object_name = 'orders'
+    paginate_by = 50
 
     def get_queryset(self) -> list[Order]:
-        """Фильтрует заказы по номеру стола или статусу."""
-        queryset = super().get_queryset()
+        """Фильтрует заказы по номеру стола (`5` или `5-10`), названию блюда или статусу."""
+        queryset = super().get_queryset().prefetch_related('items')
         query: str | None = self.request.GET.get('q')
+        dish: str | None = self.request.GET.get('dish')
         status_filter: str | None = self.request.GET.get('status')
 
         if query:
-            queryset = queryset.filter(Q(table_number__icontains=query))
+            try:
+                queryset = search.filter_by_table(queryset, query)
+            except ValueError:
+                return queryset.none()  # Номер стола — только число или диапазон чисел
+
+        if dish:
+            queryset = search.filter_by_dish(queryset, dish)
 
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
         return queryset
 
+    def paginate_queryset(self, queryset, page_size: int) -> tuple[None, KeysetPage, list[Order], bool]:
+        """
+        Разбивает заказы на страницы по курсору `id` вместо номера страницы.
+
+        Страница кэшируется по фильтрам и курсору и инвалидируется сигналами при изменении заказов.
+        """
+        params = {key: value for key in ('q', 'dish', 'status', 'after', 'before') if (value := self.request.GET.get(key))}
+        page = cache.get_or_build('list', cache.list_key(params), lambda: paginate_by_id(
+            queryset,
+            page_size,
+            after=params.get('after'),
+            before=params.get('before'),
+        ))
+        return None, page, page.object_list, page.has_other_pages()
+
 
 # 🌟 Создание заказа
 class OrderCreateView(CreateView):
@@ -47,15 +84,15 @@ class OrderCreateView(CreateView):
         return data
 
     def form_valid(self, form: OrderForm) -> HttpResponseRedirect:
-        """Сохраняет заказ и пересчитывает его стоимость."""
+        """Сохраняет заказ и блюда (сумма заказа обновляется при сохранении каждого блюда)."""
         context = self.get_context_data()
         items: BaseInlineFormSet = context['items']
-        self.object: Order = form.save()
 
-        if items.is_valid():
-            items.instance = self.object
-            items.save()
-            self.object.calculate_total()  # Пересчитываем сумму заказа
+        with transaction.atomic():
+            self.object: Order = form.save()
+            if items.is_valid():
+                items.instance = self.object
+                items.save()
         return redirect('order_list')
 
 
@@ -69,44 +106,150 @@ class OrderDeleteView(DeleteView):
 
 # 🌟 Редактирование заказа (номер стола, блюда, статус)
 class OrderUpdateView(UpdateView):
-    """Редактирование существующего заказа."""
+    """
+    Редактирование существующего заказа.
+
+    Блюда на странице редактируются по одному (`OrderItemView`, `OrderItemDeleteView`),
+    а форма заказа сохраняет только номер стола и статус. Если в POST пришел весь
+    формсет блюд (`items-TOTAL_FORMS`), он сохраняется вместе с заказом.
+    """
     model = Order
     form_class = OrderForm
     template_name = 'orders/order_form.html'
     success_url = reverse_lazy('order_list')
+    _items_formset: BaseInlineFormSet | None = None
+
+    def get_items_formset(self) -> BaseInlineFormSet | None:
+        """Формсет блюд из POST (строится и валидируется один раз за запрос) или `None`, если его нет."""
+        if self._items_formset is None and 'items-TOTAL_FORMS' in self.request.POST:
+            self._items_formset = OrderItemFormSet(self.request.POST, instance=self.object)
+        return self._items_formset
 
     def get_context_data(self, **kwargs) -> dict:
-        """Добавляет форму для блюд в контекст шаблона."""
+        """Добавляет строки блюд (каждая со своей формой), форму нового блюда и формсет из POST."""
         context = super().get_context_data(**kwargs)
-        if self.request.POST:
-            context['items']: BaseInlineFormSet = OrderItemFormSet(self.request.POST, instance=self.object)
-        else:
-            context['items']: BaseInlineFormSet = OrderItemFormSet(instance=self.object)
+        context['item_rows'] = [
+            (item, OrderItemForm(instance=item, prefix=f'item-{item.pk}'))
+            for item in self.object.items.order_by('id')
+        ]
+        context['new_item_form'] = OrderItemForm(prefix='new')
+        context['items'] = self.get_items_formset()
         return context
 
     def form_valid(self, form: OrderForm) -> HttpResponseRedirect:
-        """Сохраняет изменения в заказе и пересчитывает его стоимость."""
-        context = self.get_context_data()
-        items_formset: BaseInlineFormSet = context['items']
+        """
+        Сохраняет номер стола и статус (и блюда, если пришел формсет).
+
+        Сумма заказа не перезаписывается формой: ее инкрементально обновляют
+        сохраненные/удаленные блюда (`OrderItem.save`/`delete`).
+        """
+        items_formset = self.get_items_formset()
+        if items_formset is not None and not items_formset.is_valid():
+            return self.form_invalid(form)
+
+        with transaction.atomic():
+            self.object: Order = form.save(commit=False)
+            self.object.save(update_fields=['table_number', 'status'])
+            if items_formset is not None:
+                items_formset.instance = self.object
+                items_formset.save()
+        return HttpResponseRedirect(self.get_success_url())
+
+
+# 🌟 Построчное редактирование блюд заказа (фрагменты страницы редактирования)
+class OrderItemView(View):
+    """
+    Добавляет (`POST /orders/<id>/items/add/`) или изменяет (`POST /orders/<id>/items/<item_id>/`) одно блюдо.
+
+    - ✅ Запрос содержит только поля этого блюда; в БД — запись блюда и `UPDATE` суммы заказа
+      на разницу (`OrderItem.save`), поэтому работа не зависит от числа блюд в заказе
+    - ✅ Запись блюда, сумма, сводка выручки и чтение новой суммы — в одной транзакции
+    - ✅ Ответ на `fetch` — HTML строки блюда и новая сумма в заголовке `X-Order-Total`;
+      ошибки формы → `400` с той же строкой и ошибками
+    - 📌 Без JavaScript (обычная отправка формы) — редирект обратно на страницу заказа
+    """
+
+    def post(self, request: HttpRequest, pk: int, item_id: int | None = None) -> HttpResponse:
+        if item_id is None:
+            get_object_or_404(Order.objects.only('id'), pk=pk)
+            item, prefix = OrderItem(order_id=pk), 'new'
+        else:
+            item = get_object_or_404(OrderItem, pk=item_id, order_id=pk)
+            prefix = f'item-{item.pk}'
+
+        form = OrderItemForm(request.POST, instance=item, prefix=prefix)
+        if not form.is_valid():
+            template = 'orders/partials/order_item_new.html' if item_id is None else 'orders/partials/order_item_row.html'
+            return HttpResponse(
+                render_to_string(template, {'order_id': pk, 'item': item, 'form': form}, request), status=400
+            )
+
+        fragment = is_fragment_request(request)
+        with transaction.atomic():
+            item = form.save()
+            total = order_total(pk) if fragment else None
+        if not fragment:
+            return redirect('order_update', pk=pk)
+        row_form = OrderItemForm(instance=item, prefix=f'item-{item.pk}')
+        html = render_to_string('orders/partials/order_item_row.html', {'order_id': pk, 'item': item, 'form': row_form}, request)
+        return fragment_response(html, total)
+
+
+class OrderItemDeleteView(View):
+    """Удаляет одно блюдо заказа (`POST /orders/<id>/items/<item_id>/delete/`); сумма уменьшается на его стоимость."""
+
+    def post(self, request: HttpRequest, pk: int, item_id: int) -> HttpResponse:
+        fragment = is_fragment_request(request)
+        with transaction.atomic():
+            get_object_or_404(OrderItem, pk=item_id, order_id=pk).delete()
+            total = order_total(pk) if fragment else None
+        if not fragment:
+            return redirect('order_update', pk=pk)
+        return fragment_response('', total)
 
-        if items_formset.is_valid():
-            self.object: Order = form.save()
-            items_formset.instance = self.object
-            items_formset.save()
-            self.object.calculate_total()  # Пересчет суммы заказа
-            return super().form_valid(form)
 
-        return self.render_to_response(self.get_context_data(form=form))
+def is_fragment_request(request: HttpRequest) -> bool:
+    """Запрос отправлен скриптом страницы (`fetch`) и ждет HTML-фрагмент, а не редирект."""
+    return request.headers.get('X-Requested-With') == 'fetch'
+
+
+def order_total(order_id: int) -> Decimal:
+    """Сумма заказа одним запросом по ID (читается в транзакции правки, вместе с записью блюда)."""
+    return Order.objects.values_list('total_price', flat=True).get(pk=order_id)
+
+
+def fragment_response(html: str, total: Decimal) -> HttpResponse:
+    """Фрагмент страницы с новой суммой заказа в заголовке `X-Order-Total`."""
+    response = HttpResponse(html)
+    response['X-Order-Total'] = str(total)
+    return response
 
 
 # 🌟 Страница с расчетом выручки за смену
-class RevenueView(TemplateView):
-    """Отображает выручку за смену (заказы со статусом "оплачено")."""
+class RevenueView(ReplicaReadMixin, TemplateView):
+    """
+    Отображает выручку за текущую смену и за день (заказы со статусом "оплачено").
+
+    Данные читаются из предварительно агрегированной сводки `RevenueRollup`
+    (не более одной строки на смену), а не суммированием всех заказов.
+    """
     template_name = 'orders/revenue.html'
 
     def get_context_data(self, **kwargs) -> dict:
-        """Подсчитывает сумму всех оплаченных заказов."""
+        """Читает строки сводки выручки за сегодня (через кэш)."""
         context = super().get_context_data(**kwargs)
-        total_revenue: int | float = Order.objects.filter(status='paid').aggregate(total=Sum('total_price'))['total'] or 0
-        context['total_revenue'] = total_revenue
+        day, shift = RevenueRollup.bucket_for(timezone.now())
+        context.update(cache.get_or_build('revenue', cache.revenue_key(day, shift), lambda: self.revenue_for(day, shift)))
         return context
+
+    @staticmethod
+    def revenue_for(day, shift: str) -> dict:
+        """Выручка и число заказов текущей смены, а также выручка за день."""
+        rollups: dict[str, RevenueRollup] = {r.shift: r for r in RevenueRollup.objects.filter(day=day)}
+        current = rollups.get(shift)
+        return {
+            'shift': shift,
+            'total_revenue': current.revenue if current else 0,
+            'orders_count': current.orders_count if current else 0,
+            'day_revenue': sum((r.revenue for r in rollups.values()), 0),
+        }